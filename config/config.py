@@ -13,14 +13,125 @@ class Config:
     IMPLICIT_WAIT = int(os.getenv('IMPLICIT_WAIT', '10'))
     EXPLICIT_WAIT = int(os.getenv('EXPLICIT_WAIT', '20'))
     PAGE_LOAD_TIMEOUT = int(os.getenv('PAGE_LOAD_TIMEOUT', '30'))
+    PROBE_TIMEOUT = float(os.getenv('PROBE_TIMEOUT', '0.5'))  # budget for optional-element checks
+    SETTLE_TIMEOUT = float(os.getenv('SETTLE_TIMEOUT', '2'))  # max wait for the DOM to settle after a change
+    
+    # Explicit waits poll on a schedule learned from previous runs
+    ADAPTIVE_WAITS = os.getenv('ADAPTIVE_WAITS', 'true').lower() == 'true'
+    WAIT_STATS_FILE = os.getenv('WAIT_STATS_FILE', os.path.join('.cache', 'wait_stats.json'))
+    
+    # Record latency, matches and timeouts of every locator lookup (opt-in)
+    PROFILE_LOCATORS = os.getenv('PROFILE_LOCATORS', 'false').lower() == 'true'
+    BROAD_LOCATOR_MATCHES = int(os.getenv('BROAD_LOCATOR_MATCHES', '100'))
+    
+    # Rewrite structural XPath locators to the equivalent CSS/ID selector at import
+    OPTIMIZE_LOCATORS = os.getenv('OPTIMIZE_LOCATORS', 'true').lower() == 'true'
+    
+    # Reuse located elements within a page object until the page changes (opt-in)
+    CACHE_ELEMENTS = os.getenv('CACHE_ELEMENTS', 'false').lower() == 'true'
+    
+    # Driver reuse
+    REUSE_DRIVERS = os.getenv('REUSE_DRIVERS', 'true').lower() == 'true'
+    DRIVER_POOL_SIZE = int(os.getenv('DRIVER_POOL_SIZE', '1'))
+    PREWARM_DRIVERS = int(os.getenv('PREWARM_DRIVERS', '0'))
+    PREWARM_STAGGER = float(os.getenv('PREWARM_STAGGER', '1.5'))
+    PREFETCH_DRIVERS = int(os.getenv('PREFETCH_DRIVERS', '0'))
+
+    # Driver teardown: quits run in the background and are killed after QUIT_TIMEOUT
+    ASYNC_QUIT = os.getenv('ASYNC_QUIT', 'true').lower() == 'true'
+    TEARDOWN_WORKERS = int(os.getenv('TEARDOWN_WORKERS', '2'))
+    QUIT_TIMEOUT = float(os.getenv('QUIT_TIMEOUT', '10'))
+    REAP_ORPHANS = os.getenv('REAP_ORPHANS', 'true').lower() == 'true'
+
+    # Route local browsers through a caching proxy that also captures HAR (opt-in)
+    CACHING_PROXY = os.getenv('CACHING_PROXY', 'false').lower() == 'true'
+    PROXY_CACHE_DIR = os.getenv('PROXY_CACHE_DIR', os.path.join('.cache', 'proxy'))
+    CAPTURE_HAR = os.getenv('CAPTURE_HAR', 'true').lower() == 'true'
+
+    # Driver resolution cache (TTL of 0 disables it)
+    DRIVER_CACHE_FILE = os.getenv('DRIVER_CACHE_FILE', os.path.join('.cache', 'driver_resolution.json'))
+    DRIVER_CACHE_TTL = int(os.getenv('DRIVER_CACHE_TTL', '86400'))
+    
+    # Remote WebDriver endpoints, comma separated (empty = start local browsers)
+    REMOTE_ENDPOINTS = [url.strip() for url in os.getenv('REMOTE_ENDPOINTS', '').split(',') if url.strip()]
+    REMOTE_MAX_SESSIONS = int(os.getenv('REMOTE_MAX_SESSIONS', '1'))
+    REMOTE_ACQUIRE_TIMEOUT = int(os.getenv('REMOTE_ACQUIRE_TIMEOUT', '60'))
+    
+    # Run-wide record of browsers that failed to launch
+    BROWSER_HEALTH_FILE = os.getenv('BROWSER_HEALTH_FILE', os.path.join('.cache', 'browser_health.json'))
+    
+    # Performance profiles: fast | faithful | debug
+    BROWSER_PROFILE = os.getenv('BROWSER_PROFILE', 'faithful')
+    TRACKER_BLOCKLIST = [
+        '*google-analytics.com*',
+        '*googletagmanager.com*',
+        '*doubleclick.net*',
+        '*facebook.net*',
+        '*connect.facebook.com*',
+        '*hotjar.com*',
+        '*segment.io*',
+        '*intercom.io*',
+    ]
+    BROWSER_PROFILES = {
+        'fast': {
+            'page_load_strategy': 'eager',
+            'block_images': True,
+            'block_fonts': True,
+            'blocked_urls': TRACKER_BLOCKLIST,
+            'browser_logs': False,
+        },
+        'faithful': {
+            'page_load_strategy': 'normal',
+            'block_images': False,
+            'block_fonts': False,
+            'blocked_urls': [],
+            'browser_logs': False,
+        },
+        'debug': {
+            'page_load_strategy': 'normal',
+            'block_images': False,
+            'block_fonts': False,
+            'blocked_urls': [],
+            'browser_logs': True,
+        },
+    }
     
     # Test data
     BASE_URL = os.getenv('BASE_URL', 'https://testmoz.com')
+    DEMO_TEST_PATH = os.getenv('DEMO_TEST_PATH', '/101555')
+    
+    # Recorded pages: RECORD_PAGES saves what page objects open as a new version,
+    # REPLAY_VERSION (a version or 'latest') serves one locally instead of BASE_URL
+    RECORDINGS_DIR = os.getenv('RECORDINGS_DIR', os.path.join('tests', 'fixtures', 'recordings'))
+    RECORD_PAGES = os.getenv('RECORD_PAGES', 'false').lower() == 'true'
+    RECORDING_VERSION = os.getenv('RECORDING_VERSION', '')  # empty = timestamp
+    REPLAY_VERSION = os.getenv('REPLAY_VERSION', '')
+    REPLAY_LATENCY = float(os.getenv('REPLAY_LATENCY', '0'))  # seconds added to each replayed response
     
     # Reports
     SCREENSHOTS_DIR = 'screenshots'
+    SCREENSHOT_MAX_WIDTH = int(os.getenv('SCREENSHOT_MAX_WIDTH', '0'))  # 0 keeps full size; needs Pillow
+    SCREENSHOT_MAX_TOTAL_MB = float(os.getenv('SCREENSHOT_MAX_TOTAL_MB', '200'))  # per run, 0 = no cap
+    SCREENSHOT_USAGE_FILE = os.getenv('SCREENSHOT_USAGE_FILE', os.path.join('.cache', 'screenshot_usage.json'))
     REPORTS_DIR = 'reports'
+    DRIVER_METRICS_DIR = os.path.join(REPORTS_DIR, 'driver_metrics')
+    LOCATOR_PROFILE_DIR = os.path.join(REPORTS_DIR, 'locator_profile')
+    LOCATOR_PROFILE_REPORT = os.path.join(REPORTS_DIR, 'locator_profile.json')
+    VISITED_URLS_DIR = os.path.join(REPORTS_DIR, 'visited_urls')
+    HAR_DIR = os.getenv('HAR_DIR', os.path.join(REPORTS_DIR, 'har'))
+    
+    # Page source saved when a test fails; repeats of a test are stored as diffs
+    DOM_SNAPSHOTS = os.getenv('DOM_SNAPSHOTS', 'true').lower() == 'true'
+    DOM_SNAPSHOTS_DIR = os.getenv('DOM_SNAPSHOTS_DIR', os.path.join(REPORTS_DIR, 'dom_snapshots'))
+    DOM_SNAPSHOT_VISIBILITY = os.getenv('DOM_SNAPSHOT_VISIBILITY', 'true').lower() == 'true'  # of recently used locators
     
     @classmethod
     def get_window_size(cls):
         return tuple(map(int, cls.WINDOW_SIZE.split(',')))
+    
+    @classmethod
+    def get_browser_profile(cls, name=None):
+        name = (name or cls.BROWSER_PROFILE).lower()
+        if name not in cls.BROWSER_PROFILES:
+            raise ValueError(f"Unknown browser profile: {name}")
+        return cls.BROWSER_PROFILES[name]
@@ -1,7 +1,19 @@
 import pytest
+import glob
 import os
-from datetime import datetime
+import time
+import uuid
 from framework.webdriver_manager import WebDriverManager
+from framework.driver_metrics import DriverMetrics, driver_metrics
+from framework.driver_reaper import OWNER_ENV
+from framework.adaptive_wait import locator_latency
+from framework.element_cache import ElementCache
+from framework.screenshot_service import close_screenshot_service, get_screenshot_service
+from framework.dom_snapshots import get_dom_snapshot_store
+from framework.locator_profiler import LocatorProfiler, locator_profiler
+from framework.page_replay import PageRecorder, ReplayServer, load_visits, write_visits
+from framework.static_backend import StaticDriver
+from config.config import Config
 
 
 def pytest_configure(config):
@@ -16,6 +28,124 @@ def pytest_configure(config):
     config.addinivalue_line("markers", "regression: mark test as regression test")
     config.addinivalue_line("markers", "unit: mark test as unit test")
     config.addinivalue_line("markers", "integration: mark test as integration test")
+    config.addinivalue_line("markers", "fresh_browser: run test in its own browser process instead of a pooled one")
+    
+    # Start a fresh browser health record and metrics once per run; xdist workers share them
+    if not hasattr(config, 'workerinput'):
+        WebDriverManager.get_browser_health().reset()
+        for path in glob.glob(os.path.join(Config.DRIVER_METRICS_DIR, '*.json')):
+            os.remove(path)
+        for path in glob.glob(os.path.join(Config.LOCATOR_PROFILE_DIR, '*.json')):
+            os.remove(path)
+        for path in glob.glob(os.path.join(Config.VISITED_URLS_DIR, '*.json')):
+            os.remove(path)
+        get_screenshot_service().reset_usage()
+        os.environ['AQA_RUN_ID'] = uuid.uuid4().hex
+    
+    # Tag every driver and browser this process starts so leftovers can be
+    # found at the end; workers inherit the run id from the controller
+    worker_id = getattr(config, 'workerinput', {}).get('workerid', 'main')
+    os.environ[OWNER_ENV] = f"{os.environ.get('AQA_RUN_ID', 'local')}:{worker_id}"
+    
+    # Serve a recorded version of the site instead of the live one; each
+    # process that runs tests gets its own replay server
+    is_xdist_controller = getattr(config.option, 'numprocesses', None) and not hasattr(config, 'workerinput')
+    if Config.REPLAY_VERSION and not is_xdist_controller:
+        try:
+            config._replay_server = ReplayServer(version=Config.REPLAY_VERSION, latency=Config.REPLAY_LATENCY)
+        except FileNotFoundError as e:
+            raise pytest.UsageError(f"REPLAY_VERSION={Config.REPLAY_VERSION}: {e}")
+        Config.BASE_URL = config._replay_server.start()
+        print(f"Replaying recording {config._replay_server.version} at {Config.BASE_URL}")
+    
+    # Pre-warm browsers while tests are being collected. With xdist only the
+    # workers run tests, so the controller process doesn't start any.
+    if not is_xdist_controller and not config.option.collectonly:
+        if Config.PREWARM_DRIVERS > 0:
+            WebDriverManager.prewarm_drivers(Config.PREWARM_DRIVERS, worker_id=worker_id)
+        WebDriverManager.start_prefetch(Config.PREFETCH_DRIVERS)
+
+
+def pytest_unconfigure(config):
+    """Quit browsers that were pre-warmed or prefetched but never used, then reap leftovers"""
+    WebDriverManager.stop_prefetch()
+    WebDriverManager.close_pool()
+    # Workers reap only their own processes; the controller sweeps the whole run
+    # after every worker has finished
+    owner = os.environ.get(OWNER_ENV, '')
+    if not hasattr(config, 'workerinput'):
+        owner = owner.rsplit(':', 1)[0] + ':'
+    WebDriverManager.shutdown_reaper(owner)
+    replay_server = getattr(config, '_replay_server', None)
+    if replay_server is not None:
+        replay_server.stop()
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """Write this worker's driver phase timings, learned wait latencies, locator profile and visited pages"""
+    locator_latency.save()
+    close_screenshot_service(timeout=30)
+    # Background quits record their timings when they finish
+    WebDriverManager.flush_quits()
+    if driver_metrics.records:
+        worker_id = getattr(session.config, 'workerinput', {}).get('workerid', 'main')
+        driver_metrics.write(Config.DRIVER_METRICS_DIR, worker_id)
+    if locator_profiler.entries:
+        worker_id = getattr(session.config, 'workerinput', {}).get('workerid', 'main')
+        locator_profiler.write(Config.LOCATOR_PROFILE_DIR, worker_id)
+    if Config.RECORD_PAGES and not Config.REPLAY_VERSION:
+        worker_id = getattr(session.config, 'workerinput', {}).get('workerid', 'main')
+        write_visits(Config.VISITED_URLS_DIR, worker_id)
+    # Workers are done by the time the controller gets here
+    if Config.PROFILE_LOCATORS and not hasattr(session.config, 'workerinput'):
+        entries = LocatorProfiler.load_all(Config.LOCATOR_PROFILE_DIR)
+        if entries:
+            report = LocatorProfiler.rank(entries, broad_matches=Config.BROAD_LOCATOR_MATCHES)
+            LocatorProfiler.write_report(report, Config.LOCATOR_PROFILE_REPORT)
+            session.config._locator_profile = report
+    if Config.RECORD_PAGES and not Config.REPLAY_VERSION and not hasattr(session.config, 'workerinput'):
+        urls = load_visits(Config.VISITED_URLS_DIR)
+        if urls:
+            PageRecorder().record(urls, Config.RECORDING_VERSION or None)
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """Report browsers that failed to launch and the fallbacks used instead"""
+    if hasattr(config, 'workerinput'):
+        return
+    lines = WebDriverManager.get_browser_health().summary_lines()
+    if lines:
+        terminalreporter.section("Browser fallbacks")
+        for line in lines:
+            terminalreporter.write_line(line)
+    
+    if WebDriverManager._dispatcher is not None:
+        terminalreporter.section("Remote endpoints")
+        for endpoint in WebDriverManager._dispatcher.summary():
+            terminalreporter.write_line(", ".join(f"{key}: {value}" for key, value in endpoint.items()))
+    
+    records = DriverMetrics.load_all(Config.DRIVER_METRICS_DIR)
+    if records:
+        terminalreporter.section("Driver timings")
+        for line in DriverMetrics.format_summary(DriverMetrics.summarize(records)):
+            terminalreporter.write_line(line)
+    
+    if ElementCache.totals['hits'] + ElementCache.totals['misses']:
+        terminalreporter.section("Element cache")
+        terminalreporter.write_line(", ".join(f"{key}: {value}" for key, value in ElementCache.totals.items())
+                                    + f", hit_rate: {ElementCache.total_hit_rate():.3f}")
+    
+    report = getattr(config, '_locator_profile', None)
+    if report:
+        terminalreporter.section("Locator profile")
+        for line in LocatorProfiler.format_report(report):
+            terminalreporter.write_line(line)
+        terminalreporter.write_line(f"Full report: {Config.LOCATOR_PROFILE_REPORT}")
+    
+    prefetch_stats = WebDriverManager.get_prefetch_stats()
+    if prefetch_stats:
+        terminalreporter.section("Driver prefetch")
+        terminalreporter.write_line(", ".join(f"{key}: {value}" for key, value in prefetch_stats.items()))
 
 
 def pytest_runtest_setup(item):
@@ -32,6 +162,23 @@ def pytest_runtest_teardown(item, nextitem):
     print(f"{'='*50}\n")
 
 
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Save the page source of a failed browser test; passing tests skip this entirely"""
+    outcome = yield
+    report = outcome.get_result()
+    if not report.failed or report.when == 'teardown' or not Config.DOM_SNAPSHOTS:
+        return
+    driver = getattr(item, 'funcargs', {}).get('driver')
+    if driver is None:
+        return
+    locators = None if Config.DOM_SNAPSHOT_VISIBILITY else []
+    path = get_dom_snapshot_store().capture(driver, item.nodeid, locators)
+    if path:
+        report.user_properties.append(('dom_snapshot', path))
+        print(f"DOM snapshot saved: {path}")
+
+
 @pytest.fixture(scope="session")
 def browser_config():
     """Browser configuration fixture"""
@@ -42,10 +189,43 @@ def browser_config():
     }
 
 
+@pytest.fixture(scope="session")
+def driver_pool():
+    """Session-wide pool of reusable browsers"""
+    pool = WebDriverManager.get_pool()
+    yield pool
+    print(f"Driver pool stats: {pool.stats}")
+    WebDriverManager.close_pool()
+
+
 @pytest.fixture(scope="function")
-def driver():
+def driver(request, driver_pool):
     """WebDriver fixture for each test"""
-    driver = WebDriverManager.create_driver()
+    fresh = not Config.REUSE_DRIVERS or request.node.get_closest_marker('fresh_browser')
+    started = time.perf_counter()
+    driver = WebDriverManager.create_fresh_driver() if fresh else driver_pool.lease()
+    browser = WebDriverManager.get_browser_name(driver)
+    driver_metrics.record(browser, 'lease', time.perf_counter() - started)
+    
+    yield driver
+    
+    # One HAR per test when the browser goes through the caching proxy
+    try:
+        WebDriverManager.save_har(driver, request.node.nodeid)
+    except Exception as e:
+        print(f"HAR not saved: {e}")
+    
+    if fresh:
+        WebDriverManager.quit_driver(driver)
+    else:
+        with driver_metrics.phase(browser, 'reset'):
+            driver_pool.release(driver)
+
+
+@pytest.fixture(scope="function")
+def static_driver():
+    """Browserless driver for page objects that only read server-rendered HTML"""
+    driver = StaticDriver()
     yield driver
     driver.quit()
 
@@ -57,10 +237,8 @@ def driver_with_screenshot(driver):
     
     # Take screenshot on test failure
     if hasattr(pytest.current_test, 'failed') and pytest.current_test.failed:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        screenshot_name = f"failed_test_{timestamp}.png"
-        driver.save_screenshot(f"screenshots/{screenshot_name}")
-        print(f"Screenshot saved: {screenshot_name}")
+        get_screenshot_service().capture(driver, "failed_test")
+        print("Screenshot queued")
 
 
 def pytest_html_report_title(report):
@@ -0,0 +1,152 @@
+"""
+Adaptive Wait - Explicit waits that poll on a schedule learned per locator
+Remembers how long each locator usually takes to appear and polls tightly
+around that time instead of at a fixed interval
+"""
+from typing import Dict, List, Optional, Tuple
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from config.config import Config
+from framework.driver_metrics import percentile
+from framework.file_lock import FileLock
+import json
+import os
+import threading
+import time
+
+
+# Newest samples kept per locator
+MAX_SAMPLES = 50
+# Samples needed before the learned schedule replaces the default one
+MIN_SAMPLES = 3
+
+MIN_INTERVAL = 0.05
+MAX_INTERVAL = 1.0
+
+
+def locator_key(locator) -> str:
+    """Stable key for a (By, value) locator"""
+    by, value = locator
+    return f"{by}={value}"
+
+
+class LocatorLatencyStats:
+    """Per-locator appearance times, persisted across runs"""
+    def __init__(self, path: str):
+        self.path = path
+        self.samples: Dict[str, List[float]] = {}
+        self.new_samples: Dict[str, List[float]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def record(self, key: str, seconds: float):
+        """Record how long a locator took to satisfy its wait"""
+        self._ensure_loaded()
+        with self._lock:
+            seconds = round(seconds, 4)
+            self.samples.setdefault(key, []).append(seconds)
+            self.samples[key] = self.samples[key][-MAX_SAMPLES:]
+            self.new_samples.setdefault(key, []).append(seconds)
+
+    def expected(self, key: str) -> Optional[Tuple[float, float]]:
+        """Typical (p50) and slow (p90) appearance time, None until enough samples"""
+        self._ensure_loaded()
+        with self._lock:
+            values = list(self.samples.get(key, []))
+        if len(values) < MIN_SAMPLES:
+            return None
+        return percentile(values, 50), percentile(values, 90)
+
+    def next_interval(self, key: str, elapsed: float) -> float:
+        """How long to sleep before the next poll"""
+        expected = self.expected(key)
+        if expected is None:
+            # Nothing learned yet: poll briskly for a second, then back off
+            return 0.1 if elapsed < 1 else min(MAX_INTERVAL, elapsed * 0.25)
+        typical, slow = expected
+        if elapsed < typical * 0.7:
+            # Too early, skip straight to just before the usual appearance time
+            return min(MAX_INTERVAL, max(MIN_INTERVAL, typical * 0.7 - elapsed))
+        if elapsed < slow:
+            return MIN_INTERVAL
+        # Later than usual: back off in proportion to how late we are
+        return min(MAX_INTERVAL, max(MIN_INTERVAL, (elapsed - slow) * 0.5))
+
+    def save(self):
+        """Merge this process's samples into the stats file"""
+        with self._lock:
+            new_samples = self.new_samples
+            self.new_samples = {}
+        if not new_samples:
+            return
+        try:
+            with FileLock(self.path):
+                state = self._read()
+                for key, values in new_samples.items():
+                    state[key] = (state.get(key, []) + values)[-MAX_SAMPLES:]
+                self._write(state)
+        except (OSError, TimeoutError) as e:
+            print(f"Could not save wait stats to {self.path}: {e}")
+
+    def _ensure_loaded(self):
+        """Read stats from previous runs on first use"""
+        if self._loaded:
+            return
+        state = self._read()
+        with self._lock:
+            if not self._loaded:
+                for key, values in state.items():
+                    self.samples[key] = (values + self.samples.get(key, []))[-MAX_SAMPLES:]
+                self._loaded = True
+
+    def _read(self) -> Dict[str, List[float]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _write(self, state: Dict[str, List[float]]):
+        """Write state atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+class AdaptiveWait:
+    """WebDriverWait replacement that polls on the locator's learned schedule"""
+    def __init__(self, driver, timeout: float, locator, stats: LocatorLatencyStats,
+                 ignored_exceptions=(NoSuchElementException,)):
+        self.driver = driver
+        self.timeout = timeout
+        self.key = locator_key(locator)
+        self.stats = stats
+        self.ignored_exceptions = tuple(ignored_exceptions)
+        self.polls = 0
+
+    def until(self, condition, message: str = ''):
+        """Poll condition(driver) until it returns something truthy"""
+        started = time.perf_counter()
+        screen = stacktrace = None
+        while True:
+            self.polls += 1
+            try:
+                value = condition(self.driver)
+                if value:
+                    self.stats.record(self.key, time.perf_counter() - started)
+                    return value
+            except self.ignored_exceptions as e:
+                screen = getattr(e, 'screen', None)
+                stacktrace = getattr(e, 'stacktrace', None)
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.timeout:
+                raise TimeoutException(message, screen, stacktrace)
+            time.sleep(min(self.stats.next_interval(self.key, elapsed), self.timeout - elapsed))
+
+
+# Global stats instance for this process
+locator_latency = LocatorLatencyStats(Config.WAIT_STATS_FILE)
@@ -3,120 +3,497 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.support.ui import Select
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from config.config import Config
-import time
+from framework.adaptive_wait import AdaptiveWait, locator_latency
+from framework.element_cache import ElementCache
+from framework.screenshot_service import get_screenshot_service
+from framework.bulk_read import BULK_READ_SCRIPT, EXPECTATIONS, BulkResult, SnapshotResult
+from framework.dom_snapshots import remember_locator
+from framework.locator_profiler import locator_profiler
+from framework.page_replay import note_visit
+from framework.static_backend import StaticWait, needs_browser
+from framework.webdriver_manager import WebDriverManager
+from contextlib import contextmanager
 import os
+import sys
+import time
+
+
+# Installs a MutationObserver once per document and returns ms since the last DOM change
+DOM_QUIET_SCRIPT = """
+if (!window.__aqaMutations) {
+    window.__aqaMutations = {last: performance.now()};
+    new MutationObserver(function() { window.__aqaMutations.last = performance.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+if (document.readyState === 'loading') { return 0; }
+return performance.now() - window.__aqaMutations.last;
+"""
+
+# Token of the current document; every new document (navigation, reload) gets its own
+DOCUMENT_TOKEN_SCRIPT = "return window.__aqaDocument || (window.__aqaDocument = String(Math.random()).slice(2));"
+
+
+def page_object_caller():
+    """Name of the page-object method (or test) that started the current lookup"""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    owner = frame.f_locals.get('self')
+    if isinstance(owner, BasePage):
+        return f"{type(owner).__name__}.{frame.f_code.co_name}"
+    return f"{os.path.basename(frame.f_code.co_filename)}::{frame.f_code.co_name}"
 
 
 class BasePage:
-    def __init__(self, driver):
+    def __init__(self, driver, cache_elements=None):
         self.driver = driver
         self.wait = WebDriverWait(driver, Config.EXPLICIT_WAIT)
         self.actions = ActionChains(driver)
+        cache_elements = Config.CACHE_ELEMENTS if cache_elements is None else cache_elements
+        self.element_cache = ElementCache() if cache_elements else None
+    
+    @property
+    def is_static(self):
+        """True on the browserless StaticDriver, whose pages never change while waiting"""
+        return getattr(self.driver, 'is_static', False) is True
+    
+    def wait_time(self, seconds):
+        """Seconds to wait for something; a static page answers at once or never"""
+        return 0 if self.is_static else seconds
+    
+    def wait_for(self, locator, timeout=None):
+        """Explicit wait for a locator, polling on its learned schedule when ADAPTIVE_WAITS is on"""
+        wait_time = timeout or Config.EXPLICIT_WAIT
+        remember_locator(self.driver, locator)
+        if self.is_static:
+            return StaticWait(self.driver)
+        if Config.ADAPTIVE_WAITS:
+            return AdaptiveWait(self.driver, wait_time, locator, locator_latency)
+        return WebDriverWait(self.driver, wait_time)
+    
+    def profiled(self, locator, lookup, waits=True):
+        """Run lookup(); with PROFILE_LOCATORS on, record its latency, matches and timeouts
+        
+        An empty list from a waiting lookup counts as a timeout.
+        """
+        if not Config.PROFILE_LOCATORS:
+            return lookup()
+        caller = page_object_caller()
+        started = time.perf_counter()
+        try:
+            result = lookup()
+        except TimeoutException:
+            locator_profiler.record(locator, time.perf_counter() - started, 0, timed_out=True, caller=caller)
+            raise
+        elapsed = time.perf_counter() - started
+        matches = len(result) if isinstance(result, list) else self.count_matches(locator)
+        timed_out = waits and isinstance(result, list) and not result
+        locator_profiler.record(locator, elapsed, matches, timed_out=timed_out, caller=caller)
+        return result
+    
+    def count_matches(self, locator):
+        """Number of elements a locator matches right now"""
+        try:
+            with self.no_implicit_wait():
+                return len(self.driver.find_elements(*locator))
+        except Exception:
+            return 1
     
     def open_url(self, url):
         """Open URL in browser"""
+        self.invalidate_cache()
+        if Config.RECORD_PAGES:
+            note_visit(url)
         self.driver.get(url)
     
+    def invalidate_cache(self, stale=False):
+        """Forget cached elements, e.g. after the document changed"""
+        if self.element_cache is not None:
+            self.element_cache.invalidate(stale=stale)
+    
+    def verify_cache(self):
+        """Drop cached elements when an action since the last check replaced the document"""
+        cache = self.element_cache
+        if cache is None or not cache.unverified:
+            return
+        if cache.elements:
+            token = self.document_token()
+            if token != cache.document:
+                self.invalidate_cache()
+            cache.document = token
+        cache.unverified = False
+    
+    def cached_element(self, locator):
+        """Cached element for a locator without counting a lookup, None when not cached"""
+        if self.element_cache is None:
+            return None
+        self.verify_cache()
+        return self.element_cache.elements.get(tuple(locator))
+    
+    def document_token(self):
+        """Token identifying the document the browser currently shows"""
+        try:
+            return self.driver.execute_script(DOCUMENT_TOKEN_SCRIPT)
+        except Exception:
+            return None
+    
     def find_element(self, locator):
         """Find single element with explicit wait"""
-        return self.wait.until(EC.presence_of_element_located(locator))
+        if self.element_cache is not None:
+            self.verify_cache()
+            element = self.element_cache.get(locator)
+            if element is not None:
+                return element
+        element = self.profiled(locator, lambda: self.wait_for(locator).until(EC.presence_of_element_located(locator)))
+        if self.element_cache is not None:
+            if self.element_cache.document is None:
+                self.element_cache.document = self.document_token()
+            self.element_cache.put(locator, element)
+        return element
+    
+    def document_may_change(self):
+        """Note that the last action (a click, typing) may have loaded another document"""
+        if self.element_cache is not None:
+            self.element_cache.unverified = True
+    
+    def with_element(self, locator, action):
+        """Run action(element), looking the element up again if the cached one went stale"""
+        element = self.find_element(locator)
+        try:
+            return action(element)
+        except StaleElementReferenceException:
+            if self.element_cache is None:
+                raise
+            self.invalidate_cache(stale=True)
+            return action(self.find_element(locator))
     
     def find_elements(self, locator):
         """Find multiple elements"""
-        return self.driver.find_elements(*locator)
+        return self.profiled(locator, lambda: self.driver.find_elements(*locator), waits=False)
     
     def click_element(self, locator):
         """Click element with explicit wait"""
-        element = self.wait.until(EC.element_to_be_clickable(locator))
-        element.click()
+        if self.element_cache is None:
+            element = self.profiled(locator, lambda: self.wait_for(locator).until(EC.element_to_be_clickable(locator)))
+            element.click()
+            return
+        self.with_element(locator, lambda element: self.wait_for(locator).until(
+            EC.element_to_be_clickable(element)).click())
+        self.document_may_change()
     
     def send_keys(self, locator, text):
         """Send keys to element"""
-        element = self.find_element(locator)
-        element.clear()
-        element.send_keys(text)
+        def type_text(element):
+            element.clear()
+            element.send_keys(text)
+        self.with_element(locator, type_text)
+        self.document_may_change()
     
     def get_text(self, locator):
         """Get text from element"""
-        element = self.find_element(locator)
-        return element.text
+        return self.with_element(locator, lambda element: element.text)
     
     def get_attribute(self, locator, attribute):
         """Get attribute value from element"""
-        element = self.find_element(locator)
-        return element.get_attribute(attribute)
+        return self.with_element(locator, lambda element: element.get_attribute(attribute))
     
     def is_element_present(self, locator):
         """Check if element is present"""
+        if self.cached_element(locator) is not None:
+            try:
+                # One cheap call proves the cached element is still attached
+                with self.no_implicit_wait():
+                    return self.with_element(locator, lambda element: element.is_enabled() or True)
+            except Exception:
+                return False
+        # The explicit wait does the polling; an implicit wait on top would
+        # stall each poll while the element is missing
         try:
-            self.find_element(locator)
+            with self.no_implicit_wait():
+                self.find_element(locator)
             return True
         except:
             return False
     
     def is_element_visible(self, locator):
         """Check if element is visible"""
+        if self.cached_element(locator) is not None:
+            try:
+                with self.no_implicit_wait():
+                    visible = self.with_element(locator, lambda element: element.is_displayed())
+                if visible:
+                    return True
+            except Exception:
+                pass
         try:
-            element = self.wait.until(EC.visibility_of_element_located(locator))
-            return element.is_displayed()
+            with self.no_implicit_wait():
+                element = self.profiled(
+                    locator, lambda: self.wait_for(locator).until(EC.visibility_of_element_located(locator)))
+                return element.is_displayed()
         except:
             return False
     
+    def bulk_read(self, locators, attributes=(), with_elements=False):
+        """Read many locators with one execute_script call
+        
+        locators is a dict of name -> locator (or a list of locators, keyed by
+        locator). Returns a BulkResult per key with count, texts, visibility
+        and the requested attributes of every match.
+        """
+        named = dict(locators) if isinstance(locators, dict) else {tuple(loc): loc for loc in locators}
+        queries = [[by, value] for by, value in named.values()]
+        started = time.perf_counter()
+        data = self.driver.execute_script(BULK_READ_SCRIPT, queries, list(attributes), with_elements) or []
+        results = {name: BulkResult(locator, data[index] if index < len(data) else {})
+                   for index, (name, locator) in enumerate(named.items())}
+        if Config.PROFILE_LOCATORS and results:
+            # One call served every locator; each gets an equal share of its time
+            share = (time.perf_counter() - started) / len(results)
+            caller = page_object_caller()
+            for result in results.values():
+                locator_profiler.record(result.locator, share, result.count, caller=caller)
+        return results
+    
+    def snapshot(self, locator_map, expect='visible', timeout=None, poll_frequency=0.1):
+        """Wait for many locators at once under one shared deadline
+        
+        locator_map is name -> locator, or name -> (locator, expectation) where
+        the expectation is 'visible', 'present', 'hidden' or 'absent'. Each
+        round reads all unsettled locators with a single script call; returns
+        a SnapshotResult per name once all are settled or the deadline passes.
+        """
+        pending = {}
+        for name, entry in locator_map.items():
+            if isinstance(entry[0], (tuple, list)):
+                pending[name] = (tuple(entry[0]), entry[1])
+            else:
+                pending[name] = (tuple(entry), expect)
+        
+        timeout = self.wait_time(timeout or Config.EXPLICIT_WAIT)
+        started = time.perf_counter()
+        results = {}
+        while True:
+            readings = self.bulk_read({name: locator for name, (locator, _) in pending.items()})
+            elapsed = time.perf_counter() - started
+            for name, (locator, expectation) in list(pending.items()):
+                if EXPECTATIONS[expectation](readings[name]):
+                    results[name] = SnapshotResult(name, locator, expectation, readings[name], True, elapsed)
+                    del pending[name]
+            if not pending or elapsed >= timeout:
+                break
+            time.sleep(min(poll_frequency, timeout - elapsed))
+        
+        for name, (locator, expectation) in pending.items():
+            results[name] = SnapshotResult(name, locator, expectation, readings[name], False, elapsed)
+        return {name: results[name] for name in locator_map}
+    
+    @contextmanager
+    def no_implicit_wait(self):
+        """Temporarily disable the driver's implicit wait
+        
+        The wait to restore comes from WebDriverManager, which recorded it when
+        the driver was configured, so a probe costs two calls instead of three.
+        """
+        previous = WebDriverManager.get_implicit_wait(self.driver)
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(previous)
+    
+    def probe(self, locator, budget=None):
+        """Find elements that may not exist, giving up after a short budget
+        
+        Returns an empty list when nothing matched within the budget instead
+        of blocking for the implicit and explicit waits.
+        """
+        budget = self.wait_time(Config.PROBE_TIMEOUT if budget is None else budget)
+        remember_locator(self.driver, locator)
+        
+        def poll():
+            deadline = time.perf_counter() + budget
+            with self.no_implicit_wait():
+                while True:
+                    elements = self.driver.find_elements(*locator)
+                    if elements or time.perf_counter() >= deadline:
+                        return elements
+                    time.sleep(min(0.05, max(0, deadline - time.perf_counter())))
+        return self.profiled(locator, poll)
+    
+    def probe_present(self, locator, budget=None):
+        """Fast check that an optional element is present"""
+        try:
+            return len(self.probe(locator, budget)) > 0
+        except Exception:
+            return False
+    
+    def probe_visible(self, locator, budget=None):
+        """Fast check that an optional element is displayed"""
+        try:
+            return any(element.is_displayed() for element in self.probe(locator, budget))
+        except Exception:
+            return False
+    
+    def probe_text(self, locator, budget=None):
+        """Text of an optional element, None when it is absent"""
+        try:
+            elements = self.probe(locator, budget)
+            return elements[0].text if elements else None
+        except Exception:
+            return None
+    
+    def probe_attribute(self, locator, attribute, budget=None):
+        """Attribute of an optional element, None when it is absent"""
+        try:
+            elements = self.probe(locator, budget)
+            return elements[0].get_attribute(attribute) if elements else None
+        except Exception:
+            return None
+    
     def wait_for_element_visible(self, locator, timeout=None):
         """Wait for element to be visible"""
-        wait_time = timeout or Config.EXPLICIT_WAIT
-        wait = WebDriverWait(self.driver, wait_time)
-        return wait.until(EC.visibility_of_element_located(locator))
+        return self.profiled(locator, lambda: self.wait_for(locator, timeout).until(
+            EC.visibility_of_element_located(locator)))
     
     def wait_for_element_clickable(self, locator, timeout=None):
         """Wait for element to be clickable"""
+        return self.profiled(locator, lambda: self.wait_for(locator, timeout).until(
+            EC.element_to_be_clickable(locator)))
+    
+    def wait_until(self, condition, timeout=None, message=''):
+        """Wait until condition(driver) returns something truthy"""
+        if self.is_static:
+            return StaticWait(self.driver).until(condition, message)
         wait_time = timeout or Config.EXPLICIT_WAIT
-        wait = WebDriverWait(self.driver, wait_time)
-        return wait.until(EC.element_to_be_clickable(locator))
+        return WebDriverWait(self.driver, wait_time, poll_frequency=0.1).until(condition, message)
+    
+    def wait_for_url_change(self, old_url, timeout=None):
+        """Wait until the browser leaves old_url"""
+        return self.wait_until(EC.url_changes(old_url), timeout, f"URL is still {old_url}")
+    
+    def wait_for_staleness(self, element, timeout=None):
+        """Wait until an element is removed from the DOM"""
+        return self.wait_until(EC.staleness_of(element), timeout, "Element did not go stale")
+    
+    def wait_for_text_change(self, locator, old_text, timeout=None):
+        """Wait until the element's text differs from old_text"""
+        def text_changed(driver):
+            try:
+                return driver.find_element(*locator).text != old_text
+            except Exception:
+                return False
+        return self.wait_until(text_changed, timeout, f"Text of {locator} is still {old_text!r}")
+    
+    def wait_for_dom_stable(self, quiet_period=0.3, timeout=None):
+        """Wait until the DOM has not changed for quiet_period seconds"""
+        return self.wait_until(
+            lambda driver: (driver.execute_script(DOM_QUIET_SCRIPT) or 0) >= quiet_period * 1000,
+            timeout, f"DOM kept changing for more than {timeout or Config.EXPLICIT_WAIT}s")
+    
+    def wait_for_change(self, action, watch=(), timeout=None):
+        """Run action and wait until it visibly takes effect
+        
+        Done when the URL changes, a watched element goes stale or its text
+        changes; then gives the DOM up to SETTLE_TIMEOUT to settle. Returns
+        False (and logs it) when nothing changed within the timeout, or when
+        nothing is watched and the DOM did not settle.
+        """
+        old_url = self.driver.current_url
+        watched = []
+        for locator in watch:
+            for element in self.driver.find_elements(*locator)[:1]:
+                watched.append((locator, element, element.text))
+        
+        action()
+        
+        def changed(driver):
+            if driver.current_url != old_url:
+                return True
+            for locator, element, text in watched:
+                try:
+                    if element.text != text:
+                        return True
+                except StaleElementReferenceException:
+                    return True
+            return False
+        
+        if watched:
+            try:
+                self.wait_until(changed, timeout)
+            except TimeoutException:
+                print(f"No visible change after {getattr(action, '__name__', 'action')} within "
+                      f"{timeout or Config.EXPLICIT_WAIT}s, watching {[locator for locator, _, _ in watched]}")
+                return False
+        try:
+            self.wait_for_dom_stable(timeout=Config.SETTLE_TIMEOUT)
+        except TimeoutException:
+            if not watched:
+                print(f"DOM did not settle within {Config.SETTLE_TIMEOUT}s after {getattr(action, '__name__', 'action')}")
+                return False
+            # The change already happened; animations or trackers may keep the DOM busy
+        return True
+    
+    def click_and_wait(self, locator, watch=(), timeout=None):
+        """Click an element and wait until the click has visibly taken effect"""
+        if self.element_cache is None:
+            element = self.profiled(locator, lambda: self.wait_for(locator).until(EC.element_to_be_clickable(locator)))
+            return self.wait_for_change(element.click, watch=watch, timeout=timeout)
+        element = self.with_element(locator, lambda element: self.wait_for(locator).until(
+            EC.element_to_be_clickable(element)))
+        try:
+            return self.wait_for_change(element.click, watch=watch, timeout=timeout)
+        finally:
+            self.document_may_change()
     
     def select_dropdown_by_text(self, locator, text):
         """Select dropdown option by visible text"""
-        element = self.find_element(locator)
-        select = Select(element)
-        select.select_by_visible_text(text)
+        self.with_element(locator, lambda element: Select(element).select_by_visible_text(text))
     
     def select_dropdown_by_value(self, locator, value):
         """Select dropdown option by value"""
-        element = self.find_element(locator)
-        select = Select(element)
-        select.select_by_value(value)
+        self.with_element(locator, lambda element: Select(element).select_by_value(value))
     
     def hover_element(self, locator):
         """Hover over element"""
-        element = self.find_element(locator)
-        self.actions.move_to_element(element).perform()
+        if self.is_static:
+            needs_browser("hover_element()")
+        self.with_element(locator, lambda element: self.actions.move_to_element(element).perform())
     
     def scroll_to_element(self, locator):
         """Scroll to element"""
-        element = self.find_element(locator)
-        self.driver.execute_script("arguments[0].scrollIntoView(true);", element)
+        self.with_element(locator, lambda element: self.driver.execute_script(
+            "arguments[0].scrollIntoView(true);", element))
     
-    def take_screenshot(self, filename=None):
-        """Take screenshot"""
-        if not filename:
-            timestamp = int(time.time())
-            filename = f"screenshot_{timestamp}.png"
+    def take_screenshot(self, filename=None, locator=None):
+        """Take a screenshot of the page, or of one element when locator is given
         
-        # Create screenshots directory if it doesn't exist
-        os.makedirs(Config.SCREENSHOTS_DIR, exist_ok=True)
-        filepath = os.path.join(Config.SCREENSHOTS_DIR, filename)
+        Returns the saved path once the file is written.
+        """
+        return self.take_screenshot_async(filename, locator).result()
+    
+    def take_screenshot_async(self, filename=None, locator=None):
+        """Capture a screenshot and write it in the background
         
-        self.driver.save_screenshot(filepath)
-        return filepath
+        Returns a Future with the saved path (see ScreenshotService.capture).
+        """
+        service = get_screenshot_service()
+        if locator is None:
+            return service.capture(self.driver, filename or 'screenshot')
+        return self.with_element(locator, lambda element: service.capture(
+            self.driver, filename or 'screenshot', element=element))
     
     def switch_to_frame(self, locator):
         """Switch to iframe"""
-        frame = self.find_element(locator)
-        self.driver.switch_to.frame(frame)
+        self.with_element(locator, self.driver.switch_to.frame)
+        self.invalidate_cache()
     
     def switch_to_default_content(self):
         """Switch back to default content"""
+        self.invalidate_cache()
         self.driver.switch_to.default_content()
     
     def get_current_url(self):
@@ -129,12 +506,15 @@ class BasePage:
     
     def refresh_page(self):
         """Refresh current page"""
+        self.invalidate_cache()
         self.driver.refresh()
     
     def go_back(self):
         """Go back in browser history"""
+        self.invalidate_cache()
         self.driver.back()
     
     def go_forward(self):
         """Go forward in browser history"""
+        self.invalidate_cache()
         self.driver.forward()
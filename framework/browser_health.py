@@ -0,0 +1,86 @@
+"""
+Browser Health - Run-wide record of browser launch failures and fallbacks
+Shared between pytest-xdist workers through a lock-protected state file
+"""
+from typing import Any, Dict, List, Set
+from framework.file_lock import FileLock
+import json
+import os
+
+
+class BrowserHealth:
+    """Tracks which browsers failed to launch during the current run"""
+    def __init__(self, path: str):
+        self.path = path
+
+    def reset(self):
+        """Start a new run with a clean record"""
+        with FileLock(self.path):
+            self._write(self._empty())
+
+    def failed_browsers(self) -> Set[str]:
+        """Browsers that failed to launch in this run"""
+        return set(self.load()['failed'])
+
+    def record_failure(self, browser: str, error: Exception):
+        """Mark a browser as broken for the rest of the run"""
+        def update(state):
+            failure = state['failed'].setdefault(browser, {'count': 0, 'error': ''})
+            failure['count'] += 1
+            message = str(error).strip()
+            failure['error'] = message.splitlines()[0][:200] if message else type(error).__name__
+        self._update(update)
+
+    def record_launch(self, requested: str, used: str):
+        """Record a successful launch and whether it was a fallback"""
+        def update(state):
+            state['launched'][used] = state['launched'].get(used, 0) + 1
+            if used != requested:
+                key = f"{requested} -> {used}"
+                state['fallbacks'][key] = state['fallbacks'].get(key, 0) + 1
+        self._update(update)
+
+    def load(self) -> Dict[str, Any]:
+        """Read the current state; writes are atomic so no lock is needed"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return self._empty()
+        for key, value in self._empty().items():
+            state.setdefault(key, value)
+        return state
+
+    def summary_lines(self) -> List[str]:
+        """Human readable summary of failures and fallbacks"""
+        state = self.load()
+        lines = []
+        for browser, failure in sorted(state['failed'].items()):
+            lines.append(f"{browser}: failed to launch {failure['count']} time(s) - {failure['error']}")
+        for route, count in sorted(state['fallbacks'].items()):
+            lines.append(f"fallback {route}: {count} driver(s)")
+        return lines
+
+    def _update(self, func):
+        """Read-modify-write the state file under the lock"""
+        try:
+            with FileLock(self.path):
+                state = self.load()
+                func(state)
+                self._write(state)
+        except (OSError, TimeoutError) as e:
+            print(f"Could not update browser health file {self.path}: {e}")
+
+    def _write(self, state: Dict[str, Any]):
+        """Write state atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {'failed': {}, 'launched': {}, 'fallbacks': {}}
@@ -0,0 +1,126 @@
+"""
+Bulk Read - Resolve many locators in the browser with a single script call
+Returns texts, attributes, visibility and counts without per-element round trips
+"""
+from typing import Any, Dict, List, Optional
+
+
+# find(by, value) and isVisible(el) for scripts that resolve Selenium locators in the page
+LOCATOR_FUNCTIONS = """
+function find(by, value) {
+    switch (by) {
+        case 'xpath':
+            var snapshot = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var nodes = [];
+            for (var i = 0; i < snapshot.snapshotLength; i++) { nodes.push(snapshot.snapshotItem(i)); }
+            return nodes;
+        case 'css selector': return Array.from(document.querySelectorAll(value));
+        case 'id': return Array.from(document.querySelectorAll('#' + CSS.escape(value)));
+        case 'name': return Array.from(document.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'class name': return Array.from(document.getElementsByClassName(value));
+        case 'tag name': return Array.from(document.getElementsByTagName(value));
+        case 'link text':
+            return Array.from(document.querySelectorAll('a')).filter(function(a) { return a.innerText.trim() === value; });
+        case 'partial link text':
+            return Array.from(document.querySelectorAll('a')).filter(function(a) { return a.innerText.indexOf(value) !== -1; });
+    }
+    throw new Error('Unsupported locator strategy: ' + by);
+}
+
+function isVisible(el) {
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none' &&
+        !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+"""
+
+# arguments[0]: [[by, value], ...], arguments[1]: attribute names, arguments[2]: return elements
+BULK_READ_SCRIPT = """
+var queries = arguments[0], attributes = arguments[1], withElements = arguments[2];
+""" + LOCATOR_FUNCTIONS + """
+return queries.map(function(query) {
+    try {
+        var elements = find(query[0], query[1]);
+        return {
+            count: elements.length,
+            texts: elements.map(function(el) { return (el.innerText || '').trim(); }),
+            visible: elements.map(isVisible),
+            attributes: elements.map(function(el) {
+                var values = {};
+                attributes.forEach(function(name) { values[name] = el.getAttribute(name); });
+                return values;
+            }),
+            elements: withElements ? elements : [],
+            error: null
+        };
+    } catch (e) {
+        return {count: 0, texts: [], visible: [], attributes: [], elements: [], error: String(e.message || e)};
+    }
+});
+"""
+
+
+class BulkResult:
+    """What one locator matched, read in the browser"""
+    def __init__(self, locator, data: Dict[str, Any]):
+        self.locator = locator
+        self.count: int = data.get('count', 0)
+        self.texts: List[str] = data.get('texts', [])
+        self.visible: List[bool] = data.get('visible', [])
+        self.attributes: List[Dict[str, Optional[str]]] = data.get('attributes', [])
+        self.elements: List = data.get('elements') or []
+        self.error: Optional[str] = data.get('error')
+
+    @property
+    def present(self) -> bool:
+        return self.count > 0
+
+    @property
+    def text(self) -> Optional[str]:
+        """Text of the first match"""
+        return self.texts[0] if self.texts else None
+
+    @property
+    def is_visible(self) -> bool:
+        """Whether any match is displayed"""
+        return any(self.visible)
+
+    def attribute(self, name: str, index: int = 0) -> Optional[str]:
+        """Attribute of the match at index"""
+        if index >= len(self.attributes):
+            return None
+        return self.attributes[index].get(name)
+
+    def __repr__(self):
+        return f"BulkResult({self.locator}, count={self.count})"
+
+
+# Snapshot expectations: when a locator counts as settled
+EXPECTATIONS = {
+    'visible': lambda result: result.is_visible,
+    'present': lambda result: result.present,
+    'hidden': lambda result: not result.is_visible,
+    'absent': lambda result: not result.present,
+}
+
+
+class SnapshotResult:
+    """Final state of one locator in a snapshot"""
+    def __init__(self, name, locator, expect: str, result: BulkResult, settled: bool, elapsed: float):
+        self.name = name
+        self.locator = locator
+        self.expect = expect
+        self.settled = settled
+        self.elapsed = elapsed
+        self.present = result.present
+        self.visible = result.is_visible
+        self.count = result.count
+        self.text = result.text
+        self.error = result.error
+
+    def __bool__(self):
+        return self.settled
+
+    def __repr__(self):
+        state = 'settled' if self.settled else 'not settled'
+        return f"SnapshotResult({self.name!r}, {self.expect} {state}, count={self.count})"
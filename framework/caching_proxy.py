@@ -0,0 +1,405 @@
+"""
+Caching Proxy - Local HTTP proxy for browser sessions
+Serves static assets from a disk cache shared by every session after their
+first fetch and records each session's requests as HAR with network timings
+
+Cached responses honour Cache-Control max-age/s-maxage and Expires, and are
+only reused for requests with the same values of the headers named in Vary.
+Assets without any freshness information are kept until PROXY_CACHE_DIR is
+deleted by hand, so clear it after the site under test changes its assets.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from http.client import HTTPConnection
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit, parse_qsl
+from config.config import Config
+import hashlib
+import json
+import os
+import re
+import select
+import socket
+import threading
+import time
+
+
+# Responses cached when the URL or content type looks static
+STATIC_EXTENSIONS = ('.css', '.js', '.mjs', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.svg', '.ico',
+                     '.woff', '.woff2', '.ttf', '.otf', '.eot', '.map')
+STATIC_TYPES = ('text/css', 'javascript', 'image/', 'font/', 'woff', 'application/vnd.ms-fontobject')
+
+# Headers that apply to one connection and are not forwarded
+HOP_BY_HOP = {'connection', 'keep-alive', 'proxy-connection', 'proxy-authenticate', 'proxy-authorization',
+              'te', 'trailer', 'trailers', 'transfer-encoding', 'upgrade'}
+
+
+def is_static(method: str, url: str, status: int, headers: List[Tuple[str, str]]) -> bool:
+    """Whether a response is a static asset that may be cached"""
+    if method != 'GET' or status != 200:
+        return False
+    values = {name.lower(): value.lower() for name, value in headers}
+    if any(word in values.get('cache-control', '') for word in ('no-store', 'no-cache', 'private')):
+        return False
+    if values.get('vary', '').strip() == '*':
+        return False
+    path = urlsplit(url).path.lower()
+    content_type = values.get('content-type', '')
+    return path.endswith(STATIC_EXTENSIONS) or any(kind in content_type for kind in STATIC_TYPES)
+
+
+def _http_date(value: str) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def expires_at(headers: List[Tuple[str, str]], now: float = None) -> Optional[float]:
+    """Epoch time a response stops being fresh, None when it gives no lifetime
+
+    s-maxage and max-age (less any Age) win over Expires, as they do for
+    shared caches; an unparseable Expires counts as already expired.
+    """
+    now = time.time() if now is None else now
+    cache_control = _header(headers, 'cache-control').lower()
+    for directive in ('s-maxage', 'max-age'):
+        match = re.search(rf'(?:^|[,\s]){directive}\s*=\s*"?(\d+)', cache_control)
+        if match:
+            age = _header(headers, 'age')
+            return now + int(match.group(1)) - (int(age) if age.isdigit() else 0)
+    expires = _header(headers, 'expires')
+    if expires:
+        expiry = _http_date(expires)
+        if expiry is None:
+            return now
+        date = _http_date(_header(headers, 'date'))
+        # Measure the lifetime against the origin's clock, not ours
+        return now + expiry - date if date is not None else expiry
+    return None
+
+
+def vary_values(response_headers: List[Tuple[str, str]],
+                request_headers: List[Tuple[str, str]]) -> Dict[str, str]:
+    """Request header values named by the response's Vary header"""
+    names = [name.strip().lower() for name in _header(response_headers, 'vary').split(',') if name.strip()]
+    return {name: _header(request_headers, name) for name in names}
+
+
+class DiskCache:
+    """Static responses on disk, keyed by URL, shared between proxies and processes"""
+    def __init__(self, directory: str = None):
+        self.directory = directory or Config.PROXY_CACHE_DIR
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'stored': 0}
+        self._lock = threading.Lock()
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode('utf-8')).hexdigest())
+
+    def get(self, url: str, request_headers: List[Tuple[str, str]] = ()
+            ) -> Optional[Tuple[int, List[Tuple[str, str]], bytes]]:
+        """(status, headers, body) of a cached URL, None on a miss
+
+        Expired entries and entries stored for other values of the Vary
+        headers are misses; the next fetch replaces them.
+        """
+        path = self._path(url)
+        try:
+            with open(f"{path}.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            expires = meta.get('expires')
+            if expires is not None and expires <= time.time():
+                raise ValueError("expired")
+            if any(_header(request_headers, name) != value for name, value in meta.get('vary', {}).items()):
+                raise ValueError("different variant")
+            with open(f"{path}.body", 'rb') as f:
+                body = f.read()
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats['misses'] += 1
+            return None
+        with self._lock:
+            self.stats['hits'] += 1
+        return meta['status'], [tuple(header) for header in meta['headers']], body
+
+    def put(self, url: str, status: int, headers: List[Tuple[str, str]], body: bytes,
+            request_headers: List[Tuple[str, str]] = ()):
+        """Store a response; the body is written before the metadata that makes it visible"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(url)
+        meta = {'url': url, 'status': status, 'headers': headers, 'expires': expires_at(headers),
+                'vary': vary_values(headers, request_headers)}
+        self._write(f"{path}.body", body)
+        self._write(f"{path}.json", json.dumps(meta).encode('utf-8'))
+        with self._lock:
+            self.stats['stored'] += 1
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def _har_headers(headers: List[Tuple[str, str]]) -> List[Dict[str, str]]:
+    return [{'name': name, 'value': value} for name, value in headers]
+
+
+def _header(headers: List[Tuple[str, str]], name: str, default: str = '') -> str:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return default
+
+
+class CachingProxy:
+    """HTTP proxy for one browser session with a shared disk cache and a HAR log
+
+    Plain HTTP is forwarded, cached and timed per request. HTTPS goes through
+    CONNECT tunnels that can't be read without intercepting TLS, so those are
+    logged once per tunnel with connect time and bytes transferred.
+    """
+    def __init__(self, cache: DiskCache = None, host: str = '127.0.0.1', port: int = 0, timeout: float = 30):
+        self.cache = cache
+        self.timeout = timeout
+        self.entries: List[Dict[str, Any]] = []
+        self.stats: Dict[str, int] = {'requests': 0, 'cached': 0, 'tunnels': 0, 'errors': 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _ProxyHandler)
+        self._server.daemon_threads = True
+        self._server.proxy = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread, return the proxy URL"""
+        # Short poll so a proxy stops quickly when its browser quits
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), name='caching-proxy',
+                                        daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def record(self, entry: Dict[str, Any]):
+        with self._lock:
+            self.entries.append(entry)
+
+    def take_entries(self) -> List[Dict[str, Any]]:
+        """HAR entries recorded so far, clearing the log"""
+        with self._lock:
+            entries, self.entries = self.entries, []
+        return entries
+
+    def write_har(self, path: str, title: str = 'session') -> Optional[str]:
+        """Write and clear the entries recorded so far as a HAR file, None when there were none"""
+        entries = self.take_entries()
+        if not entries:
+            return None
+        for entry in entries:
+            entry['pageref'] = 'page_1'
+        har = {'log': {
+            'version': '1.2',
+            'creator': {'name': 'aqa-caching-proxy', 'version': '1.0'},
+            'pages': [{'id': 'page_1', 'title': title, 'startedDateTime': entries[0]['startedDateTime'],
+                       'pageTimings': {}}],
+            'entries': entries,
+        }}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(har, f, indent=2)
+        return path
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    """Forwards absolute-form requests and tunnels CONNECT"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # Keep test output quiet
+
+    @property
+    def proxy(self) -> CachingProxy:
+        return self.server.proxy
+
+    def do_GET(self):
+        self._forward()
+
+    do_POST = do_PUT = do_PATCH = do_DELETE = do_HEAD = do_OPTIONS = do_GET
+
+    def _forward(self):
+        proxy = self.proxy
+        with proxy._lock:
+            proxy.stats['requests'] += 1
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        url = self.path
+        parts = urlsplit(url)
+        if parts.scheme != 'http' or not parts.hostname:
+            return self._fail(400, f"Not a proxy request: {url}", started_at, started)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        request_headers = [(name, value) for name, value in self.headers.items() if name.lower() not in HOP_BY_HOP]
+        timings = {'blocked': -1, 'dns': -1, 'ssl': -1, 'connect': 0, 'send': 0, 'wait': 0, 'receive': 0}
+
+        cached = proxy.cache.get(url, request_headers) if proxy.cache is not None and self.command == 'GET' else None
+        if cached is not None:
+            status, headers, content = cached
+            with proxy._lock:
+                proxy.stats['cached'] += 1
+            timings['receive'] = round((time.perf_counter() - started) * 1000, 3)
+            self._log(started_at, url, request_headers, body, status, headers, content, timings, 'disk')
+            return self._respond(status, headers, content)
+
+        target = parts.path or '/'
+        if parts.query:
+            target += f"?{parts.query}"
+        connection = HTTPConnection(parts.hostname, parts.port or 80, timeout=proxy.timeout)
+        try:
+            mark = time.perf_counter()
+            connection.connect()
+            timings['connect'] = round((time.perf_counter() - mark) * 1000, 3)
+            mark = time.perf_counter()
+            connection.putrequest(self.command, target, skip_host=True, skip_accept_encoding=True)
+            for name, value in request_headers:
+                connection.putheader(name, value)
+            connection.endheaders(body or None)
+            timings['send'] = round((time.perf_counter() - mark) * 1000, 3)
+            mark = time.perf_counter()
+            response = connection.getresponse()
+            timings['wait'] = round((time.perf_counter() - mark) * 1000, 3)
+            mark = time.perf_counter()
+            content = response.read()
+            timings['receive'] = round((time.perf_counter() - mark) * 1000, 3)
+            status = response.status
+            headers = [(name, value) for name, value in response.getheaders() if name.lower() not in HOP_BY_HOP]
+        except (OSError, ValueError) as e:
+            return self._fail(502, f"Upstream request failed: {e}", started_at, started, url, request_headers)
+        finally:
+            connection.close()
+
+        if proxy.cache is not None and is_static(self.command, url, status, headers):
+            proxy.cache.put(url, status, headers, content, request_headers)
+        # Logged before answering so the entry is there once the browser has the response
+        self._log(started_at, url, request_headers, body, status, headers, content, timings)
+        self._respond(status, headers, content)
+
+    def do_CONNECT(self):
+        proxy = self.proxy
+        with proxy._lock:
+            proxy.stats['requests'] += 1
+            proxy.stats['tunnels'] += 1
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        host, _, port = self.path.rpartition(':')
+        try:
+            upstream = socket.create_connection((host, int(port or 443)), timeout=proxy.timeout)
+        except (OSError, ValueError) as e:
+            return self._fail(502, f"Tunnel to {self.path} failed: {e}", started_at, started,
+                              f"https://{self.path}", [])
+        connect = round((time.perf_counter() - started) * 1000, 3)
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        sent = received = 0
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                readable, _, errored = select.select(sockets, [], sockets, proxy.timeout)
+                if errored or not readable:
+                    break
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        raise ConnectionResetError
+                    if sock is self.connection:
+                        upstream.sendall(data)
+                        sent += len(data)
+                    else:
+                        self.connection.sendall(data)
+                        received += len(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+            self.close_connection = True
+        tunnel = round((time.perf_counter() - started) * 1000, 3) - connect
+        timings = {'blocked': -1, 'dns': -1, 'ssl': -1, 'connect': connect, 'send': 0, 'wait': 0,
+                   'receive': round(tunnel, 3)}
+        entry = self._entry(started_at, f"https://{self.path}", [], b'', 200, [], b'', timings)
+        entry['request']['bodySize'] = sent
+        entry['response']['bodySize'] = received
+        entry['response']['content']['size'] = received
+        proxy.record(entry)
+
+    def _respond(self, status: int, headers: List[Tuple[str, str]], content: bytes):
+        self.send_response(status)
+        for name, value in headers:
+            if name.lower() != 'content-length':
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(content)
+
+    def _fail(self, status: int, message: str, started_at, started, url: str = None, request_headers=None):
+        with self.proxy._lock:
+            self.proxy.stats['errors'] += 1
+        content = message.encode('utf-8')
+        headers = [('Content-Type', 'text/plain; charset=utf-8')]
+        timings = {'blocked': -1, 'dns': -1, 'ssl': -1, 'connect': 0, 'send': 0, 'wait': 0,
+                   'receive': round((time.perf_counter() - started) * 1000, 3)}
+        self._log(started_at, url or self.path, request_headers or [], b'', status, headers, content, timings)
+        self._respond(status, headers, content)
+
+    def _log(self, started_at, url, request_headers, body, status, headers, content, timings, from_cache=None):
+        entry = self._entry(started_at, url, request_headers, body, status, headers, content, timings)
+        if from_cache:
+            entry['_fromCache'] = from_cache
+        self.proxy.record(entry)
+
+    def _entry(self, started_at, url, request_headers, body, status, headers, content, timings) -> Dict[str, Any]:
+        """One HAR 1.2 entry"""
+        return {
+            'startedDateTime': started_at.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'time': round(sum(value for value in timings.values() if value > 0), 3),
+            'request': {
+                'method': self.command, 'url': url, 'httpVersion': 'HTTP/1.1',
+                'headers': _har_headers(request_headers),
+                'queryString': [{'name': name, 'value': value}
+                                for name, value in parse_qsl(urlsplit(url).query, keep_blank_values=True)],
+                'cookies': [], 'headersSize': -1, 'bodySize': len(body),
+            },
+            'response': {
+                'status': status, 'statusText': self.responses.get(status, ('',))[0], 'httpVersion': 'HTTP/1.1',
+                'headers': _har_headers(headers), 'cookies': [],
+                'content': {'size': len(content), 'mimeType': _header(headers, 'content-type')},
+                'redirectURL': _header(headers, 'location'), 'headersSize': -1, 'bodySize': len(content),
+            },
+            'cache': {},
+            'timings': timings,
+        }
+
+
+def har_name(title: str) -> str:
+    """File name for a HAR named after a test or session"""
+    return re.sub(r'[^\w.-]+', '_', title).strip('_')[:150] + '.har'
@@ -0,0 +1,163 @@
+"""
+DOM Snapshots - Compressed page source captured when a test fails
+Each snapshot is stored as a diff against the previous one taken in the same
+worker, since failing tests of one site share most of their markup;
+reconstruct() rebuilds the full source from the chain
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from collections import deque
+from datetime import datetime
+from difflib import SequenceMatcher
+from config.config import Config
+from framework.bulk_read import BULK_READ_SCRIPT
+import gzip
+import itertools
+import json
+import os
+import re
+import threading
+import weakref
+
+
+# Locators recently waited on, per driver
+RECENT_LOCATORS = 10
+_recent = weakref.WeakKeyDictionary()
+_recent_lock = threading.Lock()
+
+# Pages with more tokens than this are stored in full instead of diffed,
+# keeping capture time bounded on huge documents
+MAX_DIFF_TOKENS = 20000
+
+# Snapshots diffed in a row before one is stored in full, keeping reconstruct() short
+MAX_CHAIN = 50
+
+
+def remember_locator(driver, locator):
+    """Note a locator a page object used with this driver"""
+    try:
+        with _recent_lock:
+            recent = _recent.setdefault(driver, deque(maxlen=RECENT_LOCATORS))
+            locator = tuple(locator)
+            if locator in recent:
+                recent.remove(locator)
+            recent.append(locator)
+    except TypeError:
+        pass  # Driver can't be weakly referenced
+
+
+def recent_locators(driver) -> List[Tuple[str, str]]:
+    """Locators used with this driver, oldest first"""
+    try:
+        with _recent_lock:
+            return list(_recent.get(driver, []))
+    except TypeError:
+        return []
+
+
+def tokenize(source: str) -> List[str]:
+    """Split markup after every tag so one-line pages still diff well"""
+    return [token for token in re.split(r'(?<=>)', source) if token]
+
+
+class DomSnapshotStore:
+    """Writes gzip-compressed JSON snapshots, diffing against the previous one"""
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.previous: Optional[Tuple[str, List[str], int]] = None  # file, tokens, chain length
+        self.stats: Dict[str, int] = {'full': 0, 'diff': 0, 'bytes': 0}
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def capture(self, driver, test_id: str, locators=None) -> Optional[str]:
+        """Save the current page source and locator visibility, return the file path"""
+        try:
+            source = driver.page_source
+            url = driver.current_url
+        except Exception as e:
+            print(f"DOM snapshot skipped: {e}")
+            return None
+        locators = recent_locators(driver) if locators is None else [tuple(loc) for loc in locators]
+        snapshot = {
+            'test': test_id,
+            'url': url,
+            'captured_at': datetime.now().isoformat(timespec='milliseconds'),
+            'locators': self._locator_states(driver, locators),
+        }
+        tokens = tokenize(source)
+
+        with self._lock:
+            filename = f"{self._safe_name(test_id)}_{datetime.now().strftime('%H%M%S_%f')}_{next(self._sequence)}.json.gz"
+            base = self.previous
+            depth = 0
+            if base is not None and base[2] < MAX_CHAIN and max(len(base[1]), len(tokens)) <= MAX_DIFF_TOKENS:
+                ops = self.diff(base[1], tokens)
+                if len(json.dumps(ops)) < len(source):
+                    snapshot.update(base=base[0], ops=ops)
+                    depth = base[2] + 1
+            if 'ops' not in snapshot:
+                snapshot['source'] = source
+            self.previous = (filename, tokens, depth)
+
+        path = os.path.join(self.directory, filename)
+        os.makedirs(self.directory, exist_ok=True)
+        data = gzip.compress(json.dumps(snapshot).encode('utf-8'))
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.stats['diff' if 'ops' in snapshot else 'full'] += 1
+            self.stats['bytes'] += len(data)
+        return path
+
+    @staticmethod
+    def diff(old: List[str], new: List[str]) -> List[List[Any]]:
+        """Edits turning old tokens into new ones: [start, end, replacement]"""
+        matcher = SequenceMatcher(None, old, new)
+        return [[i1, i2, new[j1:j2]] for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal']
+
+    @staticmethod
+    def load(path: str) -> Dict[str, Any]:
+        """Read one snapshot file"""
+        with open(path, 'rb') as f:
+            return json.loads(gzip.decompress(f.read()).decode('utf-8'))
+
+    @classmethod
+    def reconstruct(cls, path: str) -> str:
+        """Full page source of a snapshot, applying diffs down the chain"""
+        chain = [cls.load(path)]
+        while 'source' not in chain[-1]:
+            chain.append(cls.load(os.path.join(os.path.dirname(path), chain[-1]['base'])))
+        tokens = tokenize(chain.pop()['source'])
+        for snapshot in reversed(chain):
+            for start, end, replacement in reversed(snapshot['ops']):
+                tokens[start:end] = replacement
+        return ''.join(tokens)
+
+    @staticmethod
+    def _locator_states(driver, locators) -> Dict[str, Dict[str, Any]]:
+        """Match count and visibility of each locator, read in one script call"""
+        if not locators:
+            return {}
+        try:
+            results = driver.execute_script(BULK_READ_SCRIPT, [list(loc) for loc in locators], [], False)
+            return {f"{by}={value}": {'count': result.get('count', 0), 'visible': any(result.get('visible', [])),
+                                      'error': result.get('error')}
+                    for (by, value), result in zip(locators, results)}
+        except Exception as e:
+            return {'error': {'message': str(e)}}
+
+    @staticmethod
+    def _safe_name(test_id: str) -> str:
+        return re.sub(r'[^\w.-]+', '_', test_id).strip('_')[-120:]
+
+
+_store = None
+
+
+def get_dom_snapshot_store() -> DomSnapshotStore:
+    """Process-wide snapshot store configured from Config"""
+    global _store
+    if _store is None:
+        _store = DomSnapshotStore(Config.DOM_SNAPSHOTS_DIR)
+    return _store
@@ -0,0 +1,142 @@
+"""
+Driver Resolution Cache - Persistent cache of resolved driver binaries
+Remembers driver paths and browser capabilities between runs so driver
+creation does not repeat PATH lookups and webdriver-manager version probing
+"""
+from typing import Any, Dict, Optional
+from functools import lru_cache
+import json
+import os
+import platform
+import re
+import shutil
+import subprocess
+import threading
+import time
+
+
+# Executables probed for the installed browser version
+BROWSER_BINARIES = {
+    'chrome': ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser', 'chrome'],
+    'firefox': ['firefox'],
+    'edge': ['microsoft-edge', 'microsoft-edge-stable', 'msedge'],
+}
+
+# Capabilities worth keeping for reports and debugging
+CAPABILITY_KEYS = ['browserName', 'browserVersion', 'platformName', 'pageLoadStrategy']
+
+
+@lru_cache(maxsize=None)
+def detect_browser_version(browser: str) -> str:
+    """Detect installed browser version, once per process"""
+    for binary in BROWSER_BINARIES.get(browser, []):
+        path = shutil.which(binary)
+        if not path:
+            continue
+        try:
+            output = subprocess.run([path, '--version'], capture_output=True,
+                                    text=True, timeout=10).stdout
+        except Exception:
+            continue
+        match = re.search(r'(\d+(\.\d+)+)', output)
+        if match:
+            return match.group(1)
+    return 'unknown'
+
+
+class DriverResolutionCache:
+    """On-disk cache of driver paths keyed by browser, browser version and OS"""
+    def __init__(self, path: str, ttl: float = 86400):
+        self.path = path
+        self.ttl = ttl
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._loaded_mtime = None
+
+    @staticmethod
+    def make_key(browser: str, browser_version: str = None) -> str:
+        """Build cache key from browser name, browser version and OS"""
+        version = browser_version or detect_browser_version(browser)
+        return f"{browser}|{version}|{platform.system()}-{platform.machine()}"
+
+    def get(self, browser: str, browser_version: str = None) -> Optional[Dict[str, Any]]:
+        """Get a fresh cache entry, or None when missing, expired or stale"""
+        if self.ttl <= 0:
+            return None
+        key = self.make_key(browser, browser_version)
+        entry = self._load().get(key)
+        if not entry:
+            return None
+        if time.time() - entry.get('resolved_at', 0) > self.ttl:
+            self.invalidate(browser, browser_version)
+            return None
+        driver_path = entry.get('driver_path')
+        if driver_path and not os.path.exists(driver_path):
+            self.invalidate(browser, browser_version)
+            return None
+        return entry
+
+    def put(self, browser: str, driver_path: str, capabilities: Dict[str, Any] = None,
+            browser_version: str = None):
+        """Store a resolved driver path"""
+        if self.ttl <= 0:
+            return
+        entries = self._load()
+        entries[self.make_key(browser, browser_version)] = {
+            'driver_path': driver_path,
+            'capabilities': capabilities or {},
+            'resolved_at': time.time(),
+        }
+        self._save(entries)
+
+    def record_capabilities(self, browser: str, capabilities: Dict[str, Any],
+                            browser_version: str = None):
+        """Attach capabilities reported by a started driver to its entry"""
+        entries = self._load()
+        entry = entries.get(self.make_key(browser, browser_version))
+        if entry is None:
+            return
+        detected = {k: capabilities[k] for k in CAPABILITY_KEYS if k in capabilities}
+        if entry.get('capabilities') != detected:
+            entry['capabilities'] = detected
+            self._save(entries)
+
+    def invalidate(self, browser: str = None, browser_version: str = None):
+        """Drop one browser's entry, or the whole cache when no browser is given"""
+        if browser is None:
+            self._save({})
+            return
+        entries = self._load()
+        if entries.pop(self.make_key(browser, browser_version), None) is not None:
+            self._save(entries)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the cache file if it changed since the last read"""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self._entries, self._loaded_mtime = {}, None
+            return self._entries
+        if mtime != self._loaded_mtime:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+            self._loaded_mtime = mtime
+        return self._entries
+
+    def _save(self, entries: Dict[str, Dict[str, Any]]):
+        """Write the cache atomically so parallel workers never see half a file"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Background threads (prewarm, prefetch) of one process save concurrently too
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+            self._entries = entries
+            self._loaded_mtime = os.path.getmtime(self.path)
+        except OSError as e:
+            print(f"Could not write driver cache {self.path}: {e}")
@@ -0,0 +1,106 @@
+"""
+Driver Metrics - Phase-level timings for driver creation and teardown
+Each pytest worker writes its own metrics file; the controller rolls them up
+"""
+from typing import Any, Dict, List
+from contextlib import contextmanager
+import glob
+import json
+import math
+import os
+import threading
+import time
+
+
+# Phases in the order they happen during a driver's life
+PHASES = ['resolve', 'spawn', 'handshake', 'configure', 'create', 'lease', 'reset', 'quit']
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = math.ceil(pct / 100 * len(ordered))
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+class DriverMetrics:
+    """Collects (browser, phase, seconds) timings"""
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, browser: str, phase: str, seconds: float):
+        """Record one phase timing"""
+        with self._lock:
+            self.records.append({'browser': browser, 'phase': phase, 'seconds': round(seconds, 4)})
+
+    @contextmanager
+    def phase(self, browser: str, phase: str):
+        """Time the enclosed block as a phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(browser, phase, time.perf_counter() - started)
+
+    def clear(self):
+        """Drop collected timings"""
+        with self._lock:
+            self.records = []
+
+    def write(self, directory: str, worker_id: str):
+        """Write this worker's timings as JSON"""
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            records = list(self.records)
+        with open(os.path.join(directory, f"{worker_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump({'worker': worker_id, 'records': records}, f, indent=2)
+
+    @staticmethod
+    def load_all(directory: str) -> List[Dict[str, Any]]:
+        """Read timings written by every worker"""
+        records = []
+        for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    records.extend(json.load(f).get('records', []))
+            except (OSError, ValueError):
+                continue
+        return records
+
+    @staticmethod
+    def summarize(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Roll timings up to count/p50/p95/max per browser and phase"""
+        grouped: Dict[str, Dict[str, List[float]]] = {}
+        for record in records:
+            grouped.setdefault(record['browser'], {}).setdefault(record['phase'], []).append(record['seconds'])
+
+        summary = {}
+        for browser, phases in sorted(grouped.items()):
+            ordered = sorted(phases, key=lambda p: PHASES.index(p) if p in PHASES else len(PHASES))
+            summary[browser] = {
+                phase: {
+                    'count': len(phases[phase]),
+                    'p50': percentile(phases[phase], 50),
+                    'p95': percentile(phases[phase], 95),
+                    'max': max(phases[phase]),
+                }
+                for phase in ordered
+            }
+        return summary
+
+    @staticmethod
+    def format_summary(summary: Dict[str, Dict[str, Dict[str, float]]]) -> List[str]:
+        """Format a summary as table lines"""
+        lines = [f"{'browser':<10} {'phase':<10} {'count':>6} {'p50':>8} {'p95':>8} {'max':>8}"]
+        for browser, phases in summary.items():
+            for phase, stats in phases.items():
+                lines.append(f"{browser:<10} {phase:<10} {stats['count']:>6} "
+                             f"{stats['p50']:>7.3f}s {stats['p95']:>7.3f}s {stats['max']:>7.3f}s")
+        return lines
+
+
+# Global metrics instance for this process
+driver_metrics = DriverMetrics()
@@ -0,0 +1,208 @@
+"""
+Driver Pool - Session-scoped reuse of WebDriver instances
+Leases browsers to tests and resets their state between tests
+"""
+from typing import Callable, Dict, List
+from config.config import Config
+import threading
+import time
+
+# Vendor prefix of the DevTools endpoint per remote browserName
+REMOTE_CDP_PREFIXES = {'chrome': 'goog', 'MicrosoftEdge': 'ms', 'msedge': 'ms'}
+
+
+class DriverPool:
+    """Pool of reusable WebDriver instances with lease/release semantics"""
+    def __init__(self, factory: Callable, max_idle: int = 1, quitter: Callable = None):
+        self.factory = factory
+        self.quitter = quitter
+        self.max_idle = max_idle
+        self.idle: List = []
+        self.leased: List = []
+        self.stats: Dict[str, int] = {'created': 0, 'reused': 0, 'discarded': 0, 'prewarmed': 0}
+        self.pending = 0
+        self.closed = False
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def lease(self, timeout: float = None):
+        """Get a driver from the pool, creating one if none is idle"""
+        timeout = Config.PAGE_LOAD_TIMEOUT if timeout is None else timeout
+        while True:
+            with self._available:
+                # A pre-warming driver is usually closer to ready than a new spawn
+                deadline = time.time() + timeout
+                while not self.idle and self.pending > 0 and time.time() < deadline:
+                    self._available.wait(deadline - time.time())
+                driver = self.idle.pop() if self.idle else None
+            if driver is None:
+                break
+            if self.is_alive(driver):
+                with self._lock:
+                    self.leased.append(driver)
+                    self.stats['reused'] += 1
+                return driver
+            self.discard(driver)
+
+        driver = self.factory()
+        with self._lock:
+            self.leased.append(driver)
+            self.stats['created'] += 1
+        return driver
+
+    def release(self, driver):
+        """Return a leased driver to the pool after resetting its state"""
+        with self._lock:
+            if driver in self.leased:
+                self.leased.remove(driver)
+
+        try:
+            self.reset_state(driver)
+        except Exception as e:
+            print(f"Driver reset failed, discarding browser: {e}")
+            self.discard(driver)
+            return
+
+        with self._lock:
+            if len(self.idle) < self.max_idle:
+                self.idle.append(driver)
+                return
+        self.discard(driver)
+
+    def add(self, driver):
+        """Put an externally created driver into the idle list"""
+        with self._available:
+            if not self.closed and len(self.idle) < self.max_idle:
+                self.idle.append(driver)
+                self.stats['created'] += 1
+                self._available.notify()
+                return True
+        self.discard(driver)
+        return False
+
+    def prewarm(self, count: int, delay: float = 0):
+        """Start `count` drivers in background threads and keep them idle"""
+        threads = []
+        with self._lock:
+            self.pending += count
+        for index in range(count):
+            thread = threading.Thread(target=self._prewarm_one, args=(delay,),
+                                      name=f"driver-prewarm-{index}", daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _prewarm_one(self, delay: float):
+        """Spawn a single pre-warmed driver"""
+        try:
+            if delay:
+                time.sleep(delay)
+            driver = self.factory()
+            if self.add(driver):
+                with self._lock:
+                    self.stats['prewarmed'] += 1
+        except Exception as e:
+            print(f"Driver pre-warming failed: {e}")
+        finally:
+            with self._available:
+                self.pending -= 1
+                self._available.notify_all()
+
+    def discard(self, driver):
+        """Quit a driver and drop it from the pool"""
+        with self._lock:
+            if driver in self.leased:
+                self.leased.remove(driver)
+            self.stats['discarded'] += 1
+        self._quit(driver)
+
+    def close(self):
+        """Quit every driver owned by the pool"""
+        with self._lock:
+            self.closed = True
+            drivers = self.idle + self.leased
+            self.idle = []
+            self.leased = []
+        for driver in drivers:
+            self._quit(driver)
+
+    def _quit(self, driver):
+        """Quit a driver through the configured quitter"""
+        try:
+            if self.quitter:
+                self.quitter(driver)
+            else:
+                driver.quit()
+        except Exception as e:
+            print(f"Driver quit failed: {e}")
+
+    @staticmethod
+    def is_alive(driver) -> bool:
+        """Check that the browser session still responds"""
+        try:
+            return len(driver.window_handles) > 0
+        except Exception:
+            return False
+
+    @staticmethod
+    def clear_all_cookies(driver):
+        """Delete cookies for every origin, raising when the browser offers no way to"""
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Chrome and Edge: one DevTools call
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        elif hasattr(driver, 'context') and hasattr(driver, 'CONTEXT_CHROME'):
+            # Local Firefox: the cookie service of the privileged browser context
+            with driver.context(driver.CONTEXT_CHROME):
+                driver.execute_script("Services.cookies.removeAll();")
+        elif DriverPool._remote_browser(driver) in REMOTE_CDP_PREFIXES:
+            # Remote Chrome and Edge: the same DevTools call through the grid's CDP endpoint,
+            # which webdriver.Remote doesn't register by itself
+            prefix = REMOTE_CDP_PREFIXES[DriverPool._remote_browser(driver)]
+            driver.command_executor._commands.setdefault(
+                'executeCdpCommand', ('POST', f"/session/$sessionId/{prefix}/cdp/execute"))
+            driver.execute('executeCdpCommand', {'cmd': 'Network.clearBrowserCookies', 'params': {}})
+        elif DriverPool._remote_browser(driver) == 'firefox':
+            # Remote Firefox: switch to the privileged context with the raw command
+            driver.execute('SET_CONTEXT', {'context': 'chrome'})
+            try:
+                driver.execute_script("Services.cookies.removeAll();")
+            finally:
+                driver.execute('SET_CONTEXT', {'context': 'content'})
+        else:
+            raise RuntimeError(f"Can't clear cookies for every origin on {type(driver).__name__}")
+
+    @staticmethod
+    def _remote_browser(driver) -> str:
+        """browserName of a webdriver.Remote session, '' for anything else"""
+        if not hasattr(driver, 'command_executor'):
+            return ''
+        try:
+            return driver.capabilities.get('browserName', '')
+        except Exception:
+            return ''
+
+    @staticmethod
+    def reset_state(driver):
+        """Cheap reset between tests: windows, cookies, storage, blank page"""
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.switch_to.default_content()
+
+        # Cookies and storage are scoped to the current origin, so clear them
+        # before leaving the page
+        driver.delete_all_cookies()
+        try:
+            driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        except Exception:
+            pass  # Storage is not accessible on about:blank or data: pages
+
+        # delete_all_cookies() only reaches the current origin; third-party and
+        # SSO cookies would leak into the next test, so a browser whose cookie
+        # jar can't be emptied is not reused (release() discards it)
+        DriverPool.clear_all_cookies(driver)
+
+        driver.get('about:blank')
+        driver.implicitly_wait(Config.IMPLICIT_WAIT)
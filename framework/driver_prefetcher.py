@@ -0,0 +1,114 @@
+"""
+Driver Prefetcher - Background spawning of fresh WebDriver instances
+Keeps a bounded queue of ready browsers so tests that need a brand new
+browser process don't wait for it to start
+"""
+from typing import Callable, Dict
+from framework.driver_pool import DriverPool
+import queue
+import threading
+
+
+class DriverPrefetcher:
+    """Background thread keeping `depth` ready drivers queued"""
+    def __init__(self, factory: Callable, depth: int = 1, retry_delay: float = 5, quitter: Callable = None):
+        self.factory = factory
+        self.quitter = quitter
+        self.depth = max(1, depth)
+        self.retry_delay = retry_delay
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'spawned': 0, 'spawn_failures': 0, 'stale': 0}
+        self._queue = queue.Queue(maxsize=self.depth)
+        self._stopped = threading.Event()
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Start the background spawner"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="driver-prefetcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def take(self):
+        """Take a ready driver, or spawn one synchronously when the queue is empty"""
+        while True:
+            try:
+                driver = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._wakeup.set()
+            if DriverPool.is_alive(driver):
+                self._count('hits')
+                return driver
+            self._count('stale')
+            self._quit(driver)
+
+        self._count('misses')
+        self._wakeup.set()
+        return self.factory()
+
+    def stop(self, timeout: float = 30):
+        """Stop spawning and quit every queued driver"""
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._drain()
+
+    @property
+    def ready(self) -> int:
+        """Number of queued drivers"""
+        return self._queue.qsize()
+
+    def hit_rate(self) -> float:
+        """Share of takes served from the queue"""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+    def _run(self):
+        """Spawn drivers until the queue is full, then wait for a take"""
+        while not self._stopped.is_set():
+            if self._queue.full():
+                self._wakeup.wait(0.5)
+                self._wakeup.clear()
+                continue
+
+            try:
+                driver = self.factory()
+            except Exception as e:
+                self._count('spawn_failures')
+                print(f"Driver prefetch failed: {e}")
+                self._stopped.wait(self.retry_delay)
+                continue
+
+            if self._stopped.is_set():
+                self._quit(driver)
+                break
+            try:
+                self._queue.put_nowait(driver)
+                self._count('spawned')
+            except queue.Full:
+                self._quit(driver)
+
+    def _drain(self):
+        """Quit drivers left in the queue"""
+        while True:
+            try:
+                self._quit(self._queue.get_nowait())
+            except queue.Empty:
+                return
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _quit(self, driver):
+        """Quit a driver through the configured quitter"""
+        try:
+            if self.quitter:
+                self.quitter(driver)
+            else:
+                driver.quit()
+        except Exception as e:
+            print(f"Driver quit failed: {e}")
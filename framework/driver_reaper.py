@@ -0,0 +1,200 @@
+"""
+Driver Reaper - Non-blocking driver teardown and cleanup of orphaned browsers
+Hands driver.quit() to a background pool with a hard deadline, and at
+session end kills driver/browser processes left behind by this run
+"""
+from typing import Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+
+
+# Environment variable inherited by every driver and browser process we start
+OWNER_ENV = 'AQA_DRIVER_OWNER'
+
+# Process names the reaper is allowed to kill
+PROCESS_NAMES = ['chromedriver', 'geckodriver', 'msedgedriver', 'chrome', 'chromium',
+                 'google-chrome', 'firefox', 'firefox-bin', 'msedge']
+
+
+def get_children(pid: int) -> List[int]:
+    """Direct child PIDs of a process"""
+    if os.path.isdir('/proc'):
+        children = []
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/stat', 'r') as f:
+                    # The command name may contain spaces, the parent PID follows the closing paren
+                    fields = f.read().rsplit(')', 1)[1].split()
+                if int(fields[1]) == pid:
+                    children.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+        return children
+    try:
+        output = subprocess.run(['pgrep', '-P', str(pid)], capture_output=True, text=True, timeout=5).stdout
+        return [int(line) for line in output.split()]
+    except Exception:
+        return []
+
+
+def process_start_time(pid: int) -> Optional[int]:
+    """Start time of a process in clock ticks since boot, None when unknown (Linux only)"""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            # Field 22 of stat, counted from the state that follows the command name
+            return int(f.read().rsplit(')', 1)[1].split()[19])
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def kill_process_tree(pid: int):
+    """Kill a process and all of its descendants"""
+    if sys.platform.startswith('win'):
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], capture_output=True)
+        return
+
+    # Collect the whole tree first so children can't be re-parented away from us
+    tree, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        tree.append(current)
+        pending.extend(get_children(current))
+    for process in reversed(tree):
+        try:
+            os.kill(process, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def find_owned_processes(owner_prefix: str) -> List[int]:
+    """PIDs of driver/browser processes whose environment carries our owner marker (Linux only)"""
+    if not os.path.isdir('/proc'):
+        return []
+    marker = f"{OWNER_ENV}={owner_prefix}".encode()
+    owned = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit() or int(entry) == os.getpid():
+            continue
+        try:
+            with open(f'/proc/{entry}/comm', 'r') as f:
+                name = f.read().strip()
+            if not any(name.startswith(known) for known in PROCESS_NAMES):
+                continue
+            with open(f'/proc/{entry}/environ', 'rb') as f:
+                if any(var.startswith(marker) for var in f.read().split(b'\0')):
+                    owned.append(int(entry))
+        except OSError:
+            continue
+    return owned
+
+
+def get_service_pid(driver) -> Optional[int]:
+    """PID of a local driver's service process"""
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+    return pid if isinstance(pid, int) else None
+
+
+class DriverReaper:
+    """Background driver teardown with a kill deadline and an orphan sweep"""
+    def __init__(self, workers: int = 2, quit_timeout: float = 10, on_quit: Callable = None):
+        self.quit_timeout = quit_timeout
+        self.on_quit = on_quit
+        # Service PID -> its start time, so a PID reused by an unrelated process is left alone
+        self.service_pids: Dict[int, Optional[int]] = {}
+        self.stats: Dict[str, int] = {'quit': 0, 'killed': 0, 'reaped': 0}
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='driver-reaper')
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def register(self, driver):
+        """Remember a local driver's service process for the final sweep"""
+        pid = get_service_pid(driver)
+        if pid:
+            with self._lock:
+                self.service_pids[pid] = process_start_time(pid)
+
+    def quit_async(self, driver, label: str = None):
+        """Quit a driver in the background without blocking the caller"""
+        future = self._executor.submit(self._quit, driver, label)
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()] + [future]
+        return future
+
+    def flush(self, timeout: float = None):
+        """Wait for queued quits to finish"""
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def reap(self, owner_prefix: str = None) -> int:
+        """Kill registered driver trees still alive and marked orphans"""
+        targets = set()
+        with self._lock:
+            for pid, started in self.service_pids.items():
+                if self._is_running(pid) and (started is None or process_start_time(pid) == started):
+                    targets.add(pid)
+            self.service_pids.clear()
+        if owner_prefix:
+            targets.update(find_owned_processes(owner_prefix))
+
+        for pid in targets:
+            kill_process_tree(pid)
+        with self._lock:
+            self.stats['reaped'] += len(targets)
+        if targets:
+            print(f"Reaped {len(targets)} leftover driver/browser process(es)")
+        return len(targets)
+
+    def shutdown(self, owner_prefix: str = None):
+        """Finish pending quits, sweep leftovers and stop the pool"""
+        self.flush(timeout=self.quit_timeout * 2)
+        self.reap(owner_prefix)
+        self._executor.shutdown(wait=False)
+
+    def _quit(self, driver, label: str = None):
+        """Quit with a deadline; kill the process tree when quit hangs"""
+        pid = get_service_pid(driver)
+        done = threading.Event()
+
+        def quit():
+            try:
+                driver.quit()
+            except Exception as e:
+                print(f"Driver quit failed: {e}")
+            finally:
+                done.set()
+
+        started = time.perf_counter()
+        threading.Thread(target=quit, name='driver-quit', daemon=True).start()
+        if done.wait(self.quit_timeout):
+            key = 'quit'
+        else:
+            print(f"driver.quit() took longer than {self.quit_timeout}s, killing process tree {pid}")
+            if pid:
+                kill_process_tree(pid)
+            key = 'killed'
+
+        with self._lock:
+            self.stats[key] += 1
+            self.service_pids.pop(pid, None)
+        if self.on_quit:
+            self.on_quit(label, time.perf_counter() - started)
+
+    @staticmethod
+    def _is_running(pid: int) -> bool:
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return False
+        return True
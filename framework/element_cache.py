@@ -0,0 +1,57 @@
+"""
+Element Cache - Per-page cache of located elements
+Entries live until the page navigates or one of them goes stale
+"""
+from typing import Dict
+import threading
+
+
+class ElementCache:
+    """Located elements keyed by locator, for one page object"""
+    # Counters summed over every cache in this process
+    totals: Dict[str, int] = {'hits': 0, 'misses': 0, 'invalidations': 0, 'stale': 0}
+    _totals_lock = threading.Lock()
+
+    def __init__(self):
+        self.elements: Dict = {}
+        # Token of the document the entries belong to, and whether an action
+        # since the last check may have replaced that document
+        self.document = None
+        self.unverified = False
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'invalidations': 0, 'stale': 0}
+
+    def get(self, locator):
+        """Cached element for a locator, None on a miss"""
+        element = self.elements.get(tuple(locator))
+        self._count('hits' if element is not None else 'misses')
+        return element
+
+    def put(self, locator, element):
+        """Remember the element found for a locator"""
+        self.elements[tuple(locator)] = element
+
+    def invalidate(self, stale: bool = False):
+        """Drop every entry; the document they belonged to is gone"""
+        if self.elements:
+            self.elements = {}
+            self._count('invalidations')
+        self.document = None
+        self.unverified = False
+        if stale:
+            self._count('stale')
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache"""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def _count(self, key: str):
+        self.stats[key] += 1
+        with ElementCache._totals_lock:
+            ElementCache.totals[key] += 1
+
+    @classmethod
+    def total_hit_rate(cls) -> float:
+        """Hit rate over every cache in this process"""
+        lookups = cls.totals['hits'] + cls.totals['misses']
+        return cls.totals['hits'] / lookups if lookups else 0.0
@@ -0,0 +1,56 @@
+"""
+File Lock - Cross-process lock for state files shared by pytest-xdist workers
+"""
+import os
+import time
+
+
+class FileLock:
+    """Exclusive lock based on atomic creation of a .lock file"""
+    def __init__(self, path: str, timeout: float = 10, stale_after: float = 30):
+        self.lock_path = f"{path}.lock"
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self._fd = None
+
+    def acquire(self):
+        """Wait until the lock file can be created"""
+        directory = os.path.dirname(self.lock_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        deadline = time.time() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return
+            except FileExistsError:
+                self._break_if_stale()
+                if time.time() >= deadline:
+                    raise TimeoutError(f"Could not acquire lock {self.lock_path}")
+                time.sleep(0.01)
+
+    def release(self):
+        """Remove the lock file"""
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            try:
+                os.remove(self.lock_path)
+            except OSError:
+                pass
+
+    def _break_if_stale(self):
+        """Remove a lock left behind by a crashed process"""
+        try:
+            if time.time() - os.path.getmtime(self.lock_path) > self.stale_after:
+                os.remove(self.lock_path)
+        except OSError:
+            pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
@@ -0,0 +1,285 @@
+"""
+Locator Compiler - Static checks and CSS/ID translation of locator tuples
+Structural XPath (tags, attributes, child/descendant steps) is rewritten to
+the equivalent CSS selector or ID; XPath that matches on text is kept, and
+locators that can never match are reported with a suggested fix.
+"""
+from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from selenium.webdriver.common.by import By
+from config.config import Config
+import re
+import sys
+
+
+STRATEGIES = {By.ID, By.XPATH, By.LINK_TEXT, By.PARTIAL_LINK_TEXT, By.NAME, By.TAG_NAME, By.CLASS_NAME,
+              By.CSS_SELECTOR}
+
+_NAME = r'[A-Za-z_][\w-]*'
+_VALUE = r'(?P<q>[\'"])(?P<value>.*?)(?P=q)'
+_STEP = re.compile(rf'(?P<tag>\*|{_NAME})(?P<predicates>(\[.*\])*)')
+_HAS_ATTRIBUTE = re.compile(rf'@(?P<attr>{_NAME})')
+_ATTRIBUTE_EQUALS = re.compile(rf'@(?P<attr>{_NAME})\s*=\s*{_VALUE}')
+_ATTRIBUTE_FUNCTION = re.compile(rf'(?P<func>contains|starts-with)\(\s*@(?P<attr>{_NAME})\s*,\s*{_VALUE}\s*\)')
+# CSS attribute operators are multiplication and friends in XPath: the predicate is never true
+_CSS_OPERATOR = re.compile(rf'@(?P<attr>{_NAME})\s*(?P<op>[*^$~|])=\s*{_VALUE}')
+_TEXT_MATCH = re.compile(r'text\(\)|normalize-space|string\(|\.\s*[=,)]|^\.$')
+
+
+class CompiledLocator:
+    """Result of compiling one locator
+
+    status is 'ok' (already CSS, ID or link text), 'translated' (locator
+    holds the faster equivalent), 'kept' (XPath CSS can't express) or
+    'invalid' (never matches; suggestion holds the likely intent).
+    """
+    def __init__(self, original, locator, status: str, issues: List[str] = None,
+                 suggestion=None, broad: bool = False):
+        self.original = original
+        self.locator = locator
+        self.status = status
+        self.issues = issues or []
+        self.suggestion = suggestion
+        self.broad = broad
+
+    @property
+    def valid(self) -> bool:
+        return self.status != 'invalid'
+
+    def __repr__(self):
+        return f"CompiledLocator({self.original} -> {self.locator}, {self.status})"
+
+
+class _Untranslatable(Exception):
+    """XPath outside the subset that has a CSS equivalent"""
+
+
+@lru_cache(maxsize=None)
+def _compile(original: Tuple) -> CompiledLocator:
+    if len(original) != 2:
+        return CompiledLocator(original, original, 'invalid', ["expected a (strategy, value) pair"])
+    strategy, value = original
+    if strategy not in STRATEGIES:
+        return CompiledLocator(original, original, 'invalid', [f"unknown strategy {strategy!r}"])
+    if not isinstance(value, str) or not value.strip():
+        return CompiledLocator(original, original, 'invalid', ["empty selector"])
+    unbalanced = _unbalanced(value)
+    if unbalanced:
+        return CompiledLocator(original, original, 'invalid', [unbalanced])
+
+    if strategy == By.TAG_NAME:
+        return CompiledLocator(original, original, 'ok', [f"broad: matches every <{value}>"], broad=True)
+    if strategy != By.XPATH:
+        return CompiledLocator(original, original, 'ok')
+
+    try:
+        css, broad, css_operators = xpath_to_css(value)
+    except _Untranslatable as e:
+        return CompiledLocator(original, original, 'kept', [str(e)])
+
+    locator = (By.CSS_SELECTOR, css)
+    id_match = re.fullmatch(r"\[id='([^']*)'\]", css)
+    if id_match:
+        locator = (By.ID, id_match.group(1))
+    issues = [f"broad: {css} has no predicate narrowing it down"] if broad else []
+    if css_operators:
+        issues.insert(0, f"CSS attribute operator in XPath ({', '.join(css_operators)}), never matches")
+        return CompiledLocator(original, original, 'invalid', issues, suggestion=locator, broad=broad)
+    return CompiledLocator(original, locator, 'translated', issues, broad=broad)
+
+
+def compile_locator(locator) -> CompiledLocator:
+    """Validate a locator and translate it to CSS or ID when that is equivalent"""
+    try:
+        return _compile(tuple(locator))
+    except TypeError:
+        return CompiledLocator(locator, locator, 'invalid', ["not a (strategy, value) pair"])
+
+
+def xpath_to_css(xpath: str) -> Tuple[str, bool, List[str]]:
+    """CSS selector for a structural XPath, whether it is broad, and any CSS-style operators found"""
+    xpath = xpath.strip()
+    if not xpath.startswith('//'):
+        raise _Untranslatable("only paths starting with // have a CSS equivalent")
+    parts, broad, css_operators = [], True, []
+    for separator, step in _split_steps(xpath):
+        match = _STEP.fullmatch(step)
+        if not match:
+            raise _Untranslatable(f"step {step!r} uses axes, functions or positions")
+        selector = '' if match.group('tag') == '*' else match.group('tag').lower()
+        for predicate in _split_predicates(match.group('predicates')):
+            broad = False
+            for condition in _split_and(predicate):
+                selector += _condition_to_css(condition, css_operators)
+        if separator == '/':
+            parts.append('>')
+        parts.append(selector or '*')
+    return ' '.join(parts), broad, css_operators
+
+
+def _condition_to_css(condition: str, css_operators: List[str]) -> str:
+    condition = condition.strip()
+    if _TEXT_MATCH.search(condition):
+        raise _Untranslatable("matches on text, which CSS can't express")
+    match = _CSS_OPERATOR.fullmatch(condition)
+    if match:
+        css_operators.append(f"{match.group('op')}=")
+        return f"[{match.group('attr')}{match.group('op')}={_css_string(match.group('value'))}]"
+    match = _ATTRIBUTE_EQUALS.fullmatch(condition)
+    if match:
+        return f"[{match.group('attr')}={_css_string(match.group('value'))}]"
+    match = _ATTRIBUTE_FUNCTION.fullmatch(condition)
+    if match:
+        operator = '*=' if match.group('func') == 'contains' else '^='
+        return f"[{match.group('attr')}{operator}{_css_string(match.group('value'))}]"
+    match = _HAS_ATTRIBUTE.fullmatch(condition)
+    if match:
+        return f"[{match.group('attr')}]"
+    raise _Untranslatable(f"predicate {condition!r} has no CSS equivalent")
+
+
+def _css_string(value: str) -> str:
+    if "'" not in value:
+        return f"'{value}'"
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _scan(text: str):
+    """Yield (index, char, depth) outside quotes"""
+    depth, quote = 0, None
+    for i, ch in enumerate(text):
+        if quote:
+            if ch == quote:
+                quote = None
+            continue
+        if ch in '\'"':
+            quote = ch
+            continue
+        if ch in '[(':
+            depth += 1
+        elif ch in '])':
+            depth -= 1
+        yield i, ch, depth
+
+
+def _unbalanced(value: str) -> Optional[str]:
+    depth, quote = 0, None
+    for ch in value:
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in '\'"':
+            quote = ch
+        elif ch in '[(':
+            depth += 1
+        elif ch in '])':
+            depth -= 1
+            if depth < 0:
+                return "unbalanced brackets"
+    if quote:
+        return "unterminated string"
+    return "unbalanced brackets" if depth else None
+
+
+def _split_steps(xpath: str) -> List[Tuple[str, str]]:
+    """[(separator, step)] for the top-level / and // separators"""
+    steps, start, separator, skip = [], 0, None, False
+    for i, ch, depth in _scan(xpath):
+        if skip:
+            skip = False
+            continue
+        if ch == '/' and depth == 0:
+            if separator is not None:
+                steps.append((separator, xpath[start:i]))
+            separator = '//' if xpath[i + 1:i + 2] == '/' else '/'
+            skip = separator == '//'
+            start = i + len(separator)
+    steps.append((separator, xpath[start:]))
+    if any(not step for _, step in steps):
+        raise _Untranslatable("empty step")
+    return steps
+
+
+def _split_predicates(predicates: str) -> List[str]:
+    parts, start = [], 0
+    for i, ch, depth in _scan(predicates):
+        if ch == '[' and depth == 1:
+            start = i + 1
+        elif ch == ']' and depth == 0:
+            parts.append(predicates[start:i])
+    return parts
+
+
+def _split_and(predicate: str) -> List[str]:
+    if re.search(r'\bor\b|\bnot\(|\|', predicate):
+        raise _Untranslatable("'or', 'not()' and unions have no single CSS selector")
+    parts, start = [], 0
+    for i, ch, depth in _scan(predicate):
+        if depth == 0 and predicate.startswith(' and ', i):
+            parts.append(predicate[start:i])
+            start = i + len(' and ')
+    parts.append(predicate[start:])
+    if any(re.fullmatch(r'\s*\d+\s*|\s*(last|position)\(.*', part) for part in parts):
+        raise _Untranslatable("positional predicates depend on sibling order")
+    return parts
+
+
+def locator_attributes(cls) -> Dict[str, tuple]:
+    """Locator tuples defined on a locator class, by attribute name"""
+    return {name: value for name, value in vars(cls).items()
+            if name.isupper() and isinstance(value, tuple) and len(value) == 2}
+
+
+def compile_locators(cls) -> Dict[str, CompiledLocator]:
+    """Compile every locator of a locator class"""
+    return {name: compile_locator(locator) for name, locator in locator_attributes(cls).items()}
+
+
+def optimize_locators(cls):
+    """Class decorator: replace translatable locators with their CSS/ID form
+
+    The replaced ones are kept in ORIGINAL_LOCATORS. Turned off with
+    OPTIMIZE_LOCATORS=false.
+    """
+    cls.ORIGINAL_LOCATORS = {}
+    if not Config.OPTIMIZE_LOCATORS:
+        return cls
+    for name, compiled in compile_locators(cls).items():
+        if compiled.status == 'translated':
+            cls.ORIGINAL_LOCATORS[name] = compiled.original
+            setattr(cls, name, compiled.locator)
+    return cls
+
+
+def report_lines(cls) -> List[str]:
+    """One line per locator: status, translation and issues"""
+    originals = getattr(cls, 'ORIGINAL_LOCATORS', {})
+    lines = []
+    for name, locator in locator_attributes(cls).items():
+        compiled = compile_locator(originals.get(name, locator))
+        line = f"{compiled.status:<10} {cls.__name__}.{name}: {compiled.original[1]}"
+        if compiled.status == 'translated':
+            line += f" -> {compiled.locator[0]}: {compiled.locator[1]}"
+        if compiled.suggestion:
+            line += f" (use {compiled.suggestion[0]}: {compiled.suggestion[1]})"
+        if compiled.issues:
+            line += f" [{'; '.join(compiled.issues)}]"
+        lines.append(line)
+    return lines
+
+
+def main():
+    """Print the compile report for the Testmoz locators, exit 1 if any is invalid"""
+    from pages.locators.testmoz_home_locators import TestmozHomeLocators
+    from pages.locators.testmoz_demo_locators import TestmozDemoLocators
+
+    invalid = 0
+    for cls in (TestmozHomeLocators, TestmozDemoLocators):
+        for line in report_lines(cls):
+            print(line)
+            invalid += line.startswith('invalid')
+    print(f"{invalid} invalid locator(s)")
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
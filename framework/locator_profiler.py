@@ -0,0 +1,136 @@
+"""
+Locator Profiler - Latency, match counts and timeouts of every locator lookup
+Each pytest worker writes its own profile; the controller merges them into a
+ranked report of the slowest, broadest and never-found locators
+"""
+from typing import Any, Dict, List
+from framework.driver_metrics import percentile
+import glob
+import json
+import os
+import threading
+
+
+MAX_SAMPLES = 200
+
+
+def _empty_entry(locator) -> Dict[str, Any]:
+    return {'locator': list(locator), 'lookups': 0, 'timeouts': 0, 'total_seconds': 0.0, 'max_seconds': 0.0,
+            'samples': [], 'max_matches': 0, 'total_matches': 0, 'callers': {}}
+
+
+class LocatorProfiler:
+    """Per-locator lookup statistics for this process"""
+    def __init__(self):
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, locator, seconds: float, matches: int, timed_out: bool = False, caller: str = '?'):
+        """Record one lookup"""
+        key = f"{locator[0]}={locator[1]}"
+        with self._lock:
+            entry = self.entries.setdefault(key, _empty_entry(locator))
+            entry['lookups'] += 1
+            entry['timeouts'] += int(timed_out)
+            entry['total_seconds'] = round(entry['total_seconds'] + seconds, 4)
+            entry['max_seconds'] = round(max(entry['max_seconds'], seconds), 4)
+            if not timed_out:
+                entry['samples'] = (entry['samples'] + [round(seconds, 4)])[-MAX_SAMPLES:]
+            entry['max_matches'] = max(entry['max_matches'], matches)
+            entry['total_matches'] += matches
+            entry['callers'][caller] = entry['callers'].get(caller, 0) + 1
+
+    def clear(self):
+        """Drop collected statistics"""
+        with self._lock:
+            self.entries = {}
+
+    def write(self, directory: str, worker_id: str):
+        """Write this worker's profile as JSON"""
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            entries = json.loads(json.dumps(self.entries))
+        with open(os.path.join(directory, f"{worker_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump({'worker': worker_id, 'entries': entries}, f, indent=2)
+
+    @staticmethod
+    def load_all(directory: str) -> Dict[str, Dict[str, Any]]:
+        """Merge the profiles written by every worker"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f).get('entries', {})
+            except (OSError, ValueError):
+                continue
+            for key, entry in entries.items():
+                total = merged.setdefault(key, _empty_entry(entry['locator']))
+                for field in ('lookups', 'timeouts', 'total_seconds', 'total_matches'):
+                    total[field] += entry.get(field, 0)
+                for field in ('max_seconds', 'max_matches'):
+                    total[field] = max(total[field], entry.get(field, 0))
+                total['samples'] = (total['samples'] + entry.get('samples', []))[-MAX_SAMPLES:]
+                for caller, count in entry.get('callers', {}).items():
+                    total['callers'][caller] = total['callers'].get(caller, 0) + count
+        return merged
+
+    @staticmethod
+    def rank(entries: Dict[str, Dict[str, Any]], limit: int = 10,
+             broad_matches: int = 100) -> Dict[str, List[Dict[str, Any]]]:
+        """Slowest locators by total time, broad ones by matches, and ones that were never found"""
+        rows = []
+        for key, entry in entries.items():
+            callers = sorted(entry['callers'].items(), key=lambda item: -item[1])
+            rows.append({
+                'locator': key,
+                'lookups': entry['lookups'],
+                'timeouts': entry['timeouts'],
+                'total_seconds': round(entry['total_seconds'], 3),
+                'p50': percentile(entry['samples'], 50),
+                'p95': percentile(entry['samples'], 95),
+                'max_seconds': entry['max_seconds'],
+                'max_matches': entry['max_matches'],
+                'avg_matches': round(entry['total_matches'] / entry['lookups'], 1) if entry['lookups'] else 0,
+                'callers': [caller for caller, _ in callers],
+            })
+        found = [row for row in rows if row['timeouts'] < row['lookups']]
+        return {
+            'slowest': sorted(found, key=lambda row: (-row['total_seconds'], -row['p95']))[:limit],
+            'broad': sorted([row for row in rows if row['max_matches'] >= broad_matches],
+                            key=lambda row: -row['max_matches'])[:limit],
+            'never_found': sorted([row for row in rows if row['lookups'] and row['timeouts'] == row['lookups']],
+                                  key=lambda row: -row['total_seconds'])[:limit],
+        }
+
+    @staticmethod
+    def write_report(report: Dict[str, List[Dict[str, Any]]], path: str):
+        """Write a ranked report as JSON"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    @staticmethod
+    def format_report(report: Dict[str, List[Dict[str, Any]]], limit: int = 5) -> List[str]:
+        """Format the top of each ranking as lines"""
+        lines = []
+        if report['slowest']:
+            lines.append("Slowest (total time, p95, lookups, caller):")
+            for row in report['slowest'][:limit]:
+                lines.append(f"  {row['total_seconds']:>7.3f}s {row['p95']:>7.3f}s {row['lookups']:>5}  "
+                             f"{row['locator']}  [{row['callers'][0]}]")
+        if report['broad']:
+            lines.append("Broad (max matches, caller):")
+            for row in report['broad'][:limit]:
+                lines.append(f"  {row['max_matches']:>7}  {row['locator']}  [{row['callers'][0]}]")
+        if report['never_found']:
+            lines.append("Never found (timeouts, time spent, caller):")
+            for row in report['never_found'][:limit]:
+                lines.append(f"  {row['timeouts']:>7} {row['total_seconds']:>7.3f}s  {row['locator']}  "
+                             f"[{row['callers'][0]}]")
+        return lines
+
+
+# Global profiler instance for this process
+locator_profiler = LocatorProfiler()
@@ -0,0 +1,364 @@
+"""
+Page Replay - Record Testmoz pages and assets, serve them back locally
+Recordings are versioned manifests over content-addressed bodies; the replay
+server answers from one version with optional latency so UI runs work offline
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.error import HTTPError, URLError
+from urllib.parse import urljoin, urlsplit
+from urllib.request import Request, urlopen
+from datetime import datetime
+from config.config import Config
+import glob
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+
+
+USER_AGENT = ('Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) '
+              'Chrome/120.0 Safari/537.36')
+
+# Tags whose src/href is loaded with the page, and the link rels that load something
+ASSET_TAG = re.compile(r'<(script|img|source|link|video|audio)\b[^>]*>', re.IGNORECASE)
+ASSET_ATTRIBUTE = re.compile(r'\b(?:src|href|poster)\s*=\s*["\']([^"\']+)["\']', re.IGNORECASE)
+LINK_REL = re.compile(r'\brel\s*=\s*["\']?([^"\'>]+)', re.IGNORECASE)
+LOADED_RELS = ('stylesheet', 'icon', 'preload', 'modulepreload', 'manifest')
+CSS_URL = re.compile(r'url\(\s*["\']?([^"\')]+)["\']?\s*\)|@import\s+["\']([^"\']+)["\']', re.IGNORECASE)
+
+# Bodies of these types have recorded origins rewritten to the replay server
+TEXT_TYPES = ('text/', 'javascript', 'json', 'xml', 'svg')
+
+# Replay path prefix for assets recorded from other origins: /__origin/<host>/<path>
+ORIGIN_PREFIX = '/__origin/'
+
+
+def page_object_urls(base_url: str) -> List[str]:
+    """URLs TestmozHomePage and TestmozDemoPage open"""
+    base = base_url.rstrip('/')
+    return [f"{base}/", f"{base}{Config.DEMO_TEST_PATH}"]
+
+
+def find_assets(body: str, url: str, content_type: str = 'text/html') -> List[str]:
+    """Absolute URLs of the scripts, styles, images and fonts a page or stylesheet loads"""
+    refs = []
+    if 'css' in content_type:
+        refs = [match.group(1) or match.group(2) for match in CSS_URL.finditer(body)]
+    else:
+        for tag in ASSET_TAG.finditer(body):
+            if tag.group(1).lower() == 'link':
+                rel = LINK_REL.search(tag.group(0))
+                if not rel or not any(name in rel.group(1).lower() for name in LOADED_RELS):
+                    continue
+            refs.extend(ASSET_ATTRIBUTE.findall(tag.group(0)))
+        refs.extend(match.group(1) or match.group(2) for match in CSS_URL.finditer(body))
+
+    assets = []
+    for ref in refs:
+        ref = ref.strip()
+        if not ref or ref.startswith(('data:', 'javascript:', 'mailto:', 'blob:', '#')):
+            continue
+        absolute = urljoin(url, ref).split('#')[0]
+        if absolute.startswith(('http://', 'https://')) and absolute not in assets:
+            assets.append(absolute)
+    return assets
+
+
+def fetch(url: str, timeout: float = 30) -> Tuple[int, str, bytes]:
+    """(status, content type, body) of a GET, error pages included"""
+    request = Request(url, headers={'User-Agent': USER_AGENT})
+    try:
+        with urlopen(request, timeout=timeout) as response:
+            return response.status, response.headers.get('Content-Type', ''), response.read()
+    except HTTPError as e:
+        return e.code, e.headers.get('Content-Type', '') if e.headers else '', e.read() or b''
+
+
+class FixtureStore:
+    """Versioned recordings: <root>/<version>/manifest.json over shared <root>/bodies/<sha256>"""
+    def __init__(self, root: str = None):
+        self.root = root or Config.RECORDINGS_DIR
+
+    def versions(self) -> List[str]:
+        """Recorded versions, oldest first"""
+        manifests = []
+        for path in glob.glob(os.path.join(self.root, '*', 'manifest.json')):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifests.append((json.load(f).get('recorded_at', ''), os.path.basename(os.path.dirname(path))))
+            except (OSError, ValueError):
+                continue
+        return [version for _, version in sorted(manifests)]
+
+    def resolve(self, version: str = 'latest') -> str:
+        """Version name for 'latest' or a given name; FileNotFoundError if not recorded"""
+        versions = self.versions()
+        if version in ('', 'latest'):
+            if not versions:
+                raise FileNotFoundError(f"No recordings in {self.root}")
+            return versions[-1]
+        if version not in versions:
+            raise FileNotFoundError(f"Recording {version!r} not found in {self.root}")
+        return version
+
+    def load(self, version: str = 'latest') -> Dict[str, Any]:
+        """Manifest of a version"""
+        version = self.resolve(version)
+        with open(os.path.join(self.root, version, 'manifest.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def body(self, entry: Dict[str, Any]) -> bytes:
+        with open(os.path.join(self.root, 'bodies', entry['sha256']), 'rb') as f:
+            return f.read()
+
+    def save(self, version: str, base_url: str, responses: Dict[str, Tuple[int, str, bytes]]) -> Dict[str, Any]:
+        """Store url -> (status, content type, body) as a new version"""
+        os.makedirs(os.path.join(self.root, 'bodies'), exist_ok=True)
+        entries = {}
+        for url, (status, content_type, body) in responses.items():
+            digest = hashlib.sha256(body).hexdigest()
+            path = os.path.join(self.root, 'bodies', digest)
+            if not os.path.exists(path):
+                self._write(path, body)
+            entries[url] = {'status': status, 'content_type': content_type, 'sha256': digest, 'size': len(body)}
+        manifest = {'version': version, 'recorded_at': datetime.now().isoformat(timespec='seconds'),
+                    'base_url': base_url.rstrip('/'), 'entries': entries}
+        os.makedirs(os.path.join(self.root, version), exist_ok=True)
+        self._write(os.path.join(self.root, version, 'manifest.json'),
+                    json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+        return manifest
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+class PageRecorder:
+    """Fetches pages and the assets they load into a FixtureStore version"""
+    def __init__(self, store: FixtureStore = None, base_url: str = None, fetcher: Callable = fetch,
+                 max_assets: int = 300):
+        self.store = store or FixtureStore()
+        self.base_url = (base_url or Config.BASE_URL).rstrip('/')
+        self.fetcher = fetcher
+        self.max_assets = max_assets
+
+    def record(self, urls: Iterable[str] = None, version: str = None) -> Dict[str, Any]:
+        """Record urls (the page objects' URLs by default) and their assets as a new version"""
+        version = version or datetime.now().strftime('%Y%m%d-%H%M%S')
+        queue = list(dict.fromkeys(urls or page_object_urls(self.base_url)))
+        assets = 0
+        responses: Dict[str, Tuple[int, str, bytes]] = {}
+        while queue:
+            url = queue.pop(0)
+            if url in responses:
+                continue
+            try:
+                status, content_type, body = self.fetcher(url)
+            except (URLError, OSError) as e:
+                print(f"Could not record {url}: {e}")
+                continue
+            responses[url] = (status, content_type, body)
+            if status == 200 and ('html' in content_type or 'css' in content_type):
+                for asset in find_assets(body.decode('utf-8', 'replace'), url, content_type):
+                    if asset not in responses and asset not in queue and assets < self.max_assets:
+                        queue.append(asset)
+                        assets += 1
+        manifest = self.store.save(version, self.base_url, responses)
+        print(f"Recorded {len(responses)} responses as {version} in {self.store.root}")
+        return manifest
+
+
+class ReplayServer:
+    """Serves one recorded version over HTTP, with origins rewritten to this server"""
+    def __init__(self, store: FixtureStore = None, version: str = 'latest', latency: float = 0.0,
+                 host: str = '127.0.0.1', port: int = 0):
+        self.store = store or FixtureStore()
+        self.manifest = self.store.load(version)
+        self.version = self.manifest['version']
+        self.latency = latency
+        self.stats: Dict[str, int] = {'requests': 0, 'hits': 0, 'misses': 0}
+        self.missed: List[str] = []
+        self._lock = threading.Lock()
+        self._base_host = urlsplit(self.manifest['base_url']).netloc
+        self._index = {}
+        for url, entry in self.manifest['entries'].items():
+            parts = urlsplit(url)
+            self._index[(parts.netloc, parts.path or '/', parts.query)] = entry
+        hosts = sorted({host for host, _, _ in self._index} | {self._base_host}, key=len, reverse=True)
+        self._origin = re.compile(r'(?:https?:)?//(' + '|'.join(re.escape(host) for host in hosts) + r')(?=[/"\'\s)?#]|$)')
+        self._server = ThreadingHTTPServer((host, port), _ReplayHandler)
+        self._server.daemon_threads = True
+        self._server.replay = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread, return the base URL"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='page-replay', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def lookup(self, path: str) -> Optional[Dict[str, Any]]:
+        """Recorded entry for a request path on this server"""
+        host = self._base_host
+        if path.startswith(ORIGIN_PREFIX):
+            host, _, rest = path[len(ORIGIN_PREFIX):].partition('/')
+            path = '/' + rest
+        parts = urlsplit(path)
+        return self._index.get((host, parts.path or '/', parts.query))
+
+    def rewrite(self, body: bytes, content_type: str) -> bytes:
+        """Point recorded origins at this server in text bodies"""
+        if not any(kind in content_type for kind in TEXT_TYPES):
+            return body
+        text = body.decode('utf-8', 'replace')
+
+        def replace(match):
+            host = match.group(1)
+            return self.url if host == self._base_host else f"{self.url}{ORIGIN_PREFIX}{host}"
+        return self._origin.sub(replace, text).encode('utf-8')
+
+    def response(self, path: str) -> Tuple[int, str, bytes]:
+        """(status, content type, body) to answer a request with"""
+        with self._lock:
+            self.stats['requests'] += 1
+        entry = self.lookup(path)
+        if entry is None:
+            with self._lock:
+                self.stats['misses'] += 1
+                self.missed.append(path)
+            return 404, 'text/plain; charset=utf-8', f"Not recorded in {self.version}: {path}".encode('utf-8')
+        with self._lock:
+            self.stats['hits'] += 1
+        return entry['status'], entry['content_type'], self.rewrite(self.store.body(entry), entry['content_type'])
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    """Answers GETs from the recording"""
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # Keep test output quiet
+
+    def do_GET(self):
+        self._reply(head=False)
+
+    def do_HEAD(self):
+        self._reply(head=True)
+
+    def _reply(self, head: bool):
+        replay: ReplayServer = self.server.replay
+        if replay.latency:
+            time.sleep(replay.latency)
+        status, content_type, body = replay.response(self.path)
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+
+# URLs the page objects opened in this process, recorded at the end of a RECORD_PAGES run
+_visited: List[str] = []
+_visited_lock = threading.Lock()
+
+
+def note_visit(url: str):
+    """Remember a URL a page object opened"""
+    with _visited_lock:
+        if url not in _visited:
+            _visited.append(url)
+
+
+def write_visits(directory: str, worker_id: str):
+    """Write this worker's visited URLs as JSON"""
+    with _visited_lock:
+        urls = list(_visited)
+    if urls:
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{worker_id}.json"), 'w', encoding='utf-8') as f:
+            json.dump(urls, f, indent=2)
+
+
+def load_visits(directory: str) -> List[str]:
+    """URLs visited by every worker"""
+    urls = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.json'))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                urls.extend(url for url in json.load(f) if url not in urls)
+        except (OSError, ValueError):
+            continue
+    return urls
+
+
+def main(argv=None):
+    """Record the page objects' pages, list recordings, or serve one"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Record and replay Testmoz pages")
+    parser.add_argument("--dir", default=Config.RECORDINGS_DIR, help="Recordings directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record = commands.add_parser("record", help="Record pages and their assets as a new version")
+    record.add_argument("urls", nargs="*", help="Pages to record (default: the page objects' pages)")
+    record.add_argument("--version", help="Version name (default: a timestamp)")
+    record.add_argument("--base-url", default=Config.BASE_URL, help="Site to record")
+    commands.add_parser("list", help="List recorded versions")
+    serve = commands.add_parser("serve", help="Serve a recorded version")
+    serve.add_argument("--version", default="latest")
+    serve.add_argument("--latency", type=float, default=Config.REPLAY_LATENCY, help="Seconds added to each response")
+    serve.add_argument("--port", type=int, default=8000)
+
+    args = parser.parse_args(argv)
+    store = FixtureStore(args.dir)
+    if args.command == "record":
+        manifest = PageRecorder(store, args.base_url).record(args.urls or None, args.version)
+        failed = [url for url, entry in manifest['entries'].items() if entry['status'] >= 400]
+        for url in failed:
+            print(f"  {manifest['entries'][url]['status']} {url}")
+        return 1 if not manifest['entries'] else 0
+    if args.command == "list":
+        for version in store.versions():
+            manifest = store.load(version)
+            print(f"{version}  {manifest['recorded_at']}  {len(manifest['entries'])} responses  {manifest['base_url']}")
+        return 0
+    server = ReplayServer(store, args.version, args.latency, port=args.port)
+    print(f"Replaying {server.version} at {server.start()} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+        print(f"Replay stats: {server.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Quiz Load - Concurrent quiz sessions driven through TestmozDemoPage
+Each worker leases a pooled browser and takes the demo quiz with its own
+deterministic seed; per-step latencies roll up into throughput and percentiles
+"""
+from typing import Any, Callable, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from framework.driver_metrics import percentile
+from framework.driver_pool import DriverPool
+from pages.testmoz_demo_page import TestmozDemoPage
+import random
+import threading
+import time
+
+
+# Steps of one quiz session in the order they happen
+STEPS = ['lease', 'open', 'start', 'answer', 'next', 'submit', 'results']
+
+
+def session_seed(seed: int, worker: int, session: int) -> int:
+    """Seed for one worker's session, the same on every run"""
+    return seed * 1_000_003 + worker * 1_000 + session
+
+
+class QuizLoadRunner:
+    """Runs `sessions` quizzes on each of `drivers` concurrent browsers"""
+    def __init__(self, factory: Callable, drivers: int = 4, sessions: int = 1, seed: int = 0,
+                 strategy: str = 'random', quitter: Callable = None):
+        self.factory = factory
+        self.quitter = quitter
+        self.drivers = drivers
+        self.sessions = sessions
+        self.seed = seed
+        self.strategy = strategy
+        self.records: List[Dict[str, Any]] = []
+        self.errors: List[Dict[str, Any]] = []
+        self.completed = 0
+        self._completed_sessions = set()
+        self._lock = threading.Lock()
+
+    def run(self) -> Dict[str, Any]:
+        """Run every worker to completion and return the summary"""
+        pool = DriverPool(self.factory, max_idle=self.drivers, quitter=self.quitter)
+        started = time.perf_counter()
+        try:
+            with ThreadPoolExecutor(max_workers=self.drivers, thread_name_prefix='quiz-load') as executor:
+                list(executor.map(lambda worker: self._worker(pool, worker), range(self.drivers)))
+        finally:
+            pool.close()
+        return self.summarize(time.perf_counter() - started)
+
+    def _worker(self, pool: DriverPool, worker: int):
+        for session in range(self.sessions):
+            seed = session_seed(self.seed, worker, session)
+            steps = []
+            try:
+                lease_started = time.perf_counter()
+                driver = pool.lease()
+                steps.append(('lease', time.perf_counter() - lease_started))
+            except Exception as e:
+                self._record(worker, session, seed, steps, e)
+                return
+            try:
+                self.run_session(driver, seed, steps)
+                self._record(worker, session, seed, steps)
+            except Exception as e:
+                self._record(worker, session, seed, steps, e)
+            finally:
+                pool.release(driver)
+
+    def run_session(self, driver, seed: int, steps: List):
+        """Take the quiz once, appending (step, seconds) to steps"""
+        def timed(step, action):
+            started = time.perf_counter()
+            result = action()
+            steps.append((step, time.perf_counter() - started))
+            return result
+
+        page = TestmozDemoPage(driver)
+        rng = random.Random(seed)
+        timed('open', page.open_demo_test)
+        if not timed('start', page.click_start_test):
+            raise RuntimeError("Start did not open the first question")
+        while True:
+            question = timed('answer', lambda: page.answer_current_question(self.strategy, rng))
+            if question is None:
+                raise RuntimeError("No question on the page")
+            if question['current'] >= question['total']:
+                break
+            if not timed('next', page.click_next_question):
+                raise RuntimeError(f"Next did not leave question {question['current']}")
+        if not timed('submit', page.click_submit_test):
+            raise RuntimeError("Submit did not leave the last question")
+        score = timed('results', page.get_results_score)
+        if score is None:
+            raise RuntimeError("No score on the results page")
+        return score
+
+    def _record(self, worker: int, session: int, seed: int, steps: List, error: Exception = None):
+        with self._lock:
+            for step, seconds in steps:
+                self.records.append({'worker': worker, 'session': session, 'step': step,
+                                     'seconds': round(seconds, 4)})
+            if error is None:
+                self.completed += 1
+                self._completed_sessions.add((worker, session))
+            else:
+                self.errors.append({'worker': worker, 'session': session, 'seed': seed,
+                                    'after': steps[-1][0] if steps else None, 'error': str(error)})
+                print(f"Quiz session {worker}/{session} failed: {error}")
+
+    def summarize(self, wall_seconds: float) -> Dict[str, Any]:
+        """Throughput and p50/p95/p99/max per step"""
+        grouped: Dict[str, List[float]] = {}
+        sessions: Dict[tuple, float] = {}
+        for record in self.records:
+            grouped.setdefault(record['step'], []).append(record['seconds'])
+            key = (record['worker'], record['session'])
+            if record['step'] != 'lease' and key in self._completed_sessions:
+                sessions[key] = sessions.get(key, 0) + record['seconds']
+        steps = {
+            step: {'count': len(grouped[step]), 'p50': percentile(grouped[step], 50),
+                   'p95': percentile(grouped[step], 95), 'p99': percentile(grouped[step], 99),
+                   'max': max(grouped[step])}
+            for step in STEPS if step in grouped
+        }
+        durations = list(sessions.values())
+        return {
+            'drivers': self.drivers,
+            'completed': self.completed,
+            'failed': len(self.errors),
+            'wall_seconds': round(wall_seconds, 3),
+            'sessions_per_minute': round(self.completed / wall_seconds * 60, 2) if wall_seconds else 0.0,
+            'session': {'p50': percentile(durations, 50), 'p95': percentile(durations, 95),
+                        'max': max(durations) if durations else 0.0},
+            'steps': steps,
+            'errors': self.errors,
+        }
+
+    @staticmethod
+    def format_summary(summary: Dict[str, Any]) -> List[str]:
+        """Format a summary as lines"""
+        lines = [f"{summary['completed']} sessions on {summary['drivers']} drivers in {summary['wall_seconds']}s "
+                 f"({summary['sessions_per_minute']}/min), {summary['failed']} failed",
+                 f"session p50 {summary['session']['p50']:.3f}s p95 {summary['session']['p95']:.3f}s",
+                 f"{'step':<10} {'count':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}"]
+        for step, stats in summary['steps'].items():
+            lines.append(f"{step:<10} {stats['count']:>6} {stats['p50']:>7.3f}s {stats['p95']:>7.3f}s "
+                         f"{stats['p99']:>7.3f}s {stats['max']:>7.3f}s")
+        return lines
@@ -0,0 +1,218 @@
+"""
+Quiz Server - Local stand-in for the Testmoz demo test
+Serves a start page, one page per question and a results page with the
+markup the Testmoz locators expect, so quiz flows can run offline
+"""
+from typing import Dict, List, Optional, Tuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from html import escape
+from urllib.parse import parse_qs
+from config.config import Config
+import re
+import threading
+import time
+import uuid
+
+
+DEMO_TEST_PATH = Config.DEMO_TEST_PATH
+
+# (question, options, index of the correct option)
+DEMO_QUESTIONS: List[Tuple[str, List[str], int]] = [
+    ("What is the capital of France?", ["Berlin", "Madrid", "Paris", "Rome"], 2),
+    ("The sun is a star.", ["True", "False"], 0),
+    ("Which of these is a primary color?", ["Green", "Blue", "Orange", "Purple"], 1),
+    ("How many days are in a leap year?", ["364", "365", "366", "367"], 2),
+    ("Water boils at 100 degrees Celsius at sea level.", ["True", "False"], 0),
+]
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<div class="test-container">
+{body}
+</div>
+</body>
+</html>
+"""
+
+
+class QuizServer:
+    """Threaded HTTP server playing the demo test, one quiz per browser session"""
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, questions=None, latency: float = 0.0):
+        self.questions = questions or DEMO_QUESTIONS
+        self.latency = latency
+        self.sessions: Dict[str, Dict[int, int]] = {}
+        self.stats: Dict[str, int] = {'requests': 0, 'started': 0, 'submitted': 0}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _QuizHandler)
+        self._server.daemon_threads = True
+        self._server.quiz = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        """Serve in a background thread, return the base URL"""
+        self._thread = threading.Thread(target=self._server.serve_forever, name='quiz-server', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        """Stop serving and close the socket"""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def new_session(self) -> str:
+        session_id = uuid.uuid4().hex
+        with self._lock:
+            self.sessions[session_id] = {}
+            self.stats['started'] += 1
+        return session_id
+
+    def record_answer(self, session_id: str, number: int, answer: Optional[int]):
+        if answer is None:
+            return
+        with self._lock:
+            self.sessions.setdefault(session_id, {})[number] = answer
+
+    def score(self, session_id: str) -> Tuple[int, List[bool]]:
+        """Percentage and per-question correctness of a session's answers"""
+        with self._lock:
+            answers = dict(self.sessions.get(session_id, {}))
+        correct = [answers.get(number) == question[2] for number, question in enumerate(self.questions, 1)]
+        return round(100 * sum(correct) / len(correct)), correct
+
+    def start_page(self) -> str:
+        body = f"""<h1>Testmoz Demo</h1>
+<p>This demo test has {len(self.questions)} questions.</p>
+<form method="post" action="{DEMO_TEST_PATH}/start"><button type="submit">Start Test</button></form>"""
+        return PAGE.format(title="Demo Test - Testmoz", body=body)
+
+    def question_page(self, number: int, selected: Optional[int]) -> str:
+        text, options, _ = self.questions[number - 1]
+        total = len(self.questions)
+        labels = "\n".join(
+            f'<label class="answer"><input type="radio" name="answer" value="{index}"'
+            f'{" checked" if index == selected else ""}> {escape(option)}</label>'
+            for index, option in enumerate(options))
+        buttons = []
+        if number > 1:
+            buttons.append('<button type="submit" name="go" value="previous">Previous</button>')
+        if number < total:
+            buttons.append('<button type="submit" name="go" value="next">Next</button>')
+        else:
+            buttons.append('<button type="submit" name="go" value="submit">Submit</button>')
+        body = f"""<h1>Testmoz Demo</h1>
+<div class="progress"><div class="progress-bar" style="width: {round(100 * (number - 1) / total)}%"></div></div>
+<span class="question-counter">Question {number} of {total}</span>
+<form method="post" action="{DEMO_TEST_PATH}/q/{number}">
+<div class="question"><p>{escape(text)}</p>
+{labels}
+</div>
+<div class="navigation">{''.join(buttons)}</div>
+</form>"""
+        return PAGE.format(title=f"Question {number} - Testmoz", body=body)
+
+    def results_page(self, session_id: str) -> str:
+        percent, correct = self.score(session_id)
+        items = "\n".join(f'<li class="answer {"correct" if ok else "incorrect"}">Question {number}</li>'
+                          for number, ok in enumerate(correct, 1))
+        body = f"""<h1>Results</h1>
+<p class="results-message">You scored {sum(correct)} out of {len(correct)}.</p>
+<span class="score">{percent}%</span>
+<ul class="answers">
+{items}
+</ul>
+<form method="post" action="{DEMO_TEST_PATH}/start"><button type="submit">Retake</button></form>
+<button type="button">Share</button>"""
+        return PAGE.format(title="Results - Testmoz", body=body)
+
+
+class _QuizHandler(BaseHTTPRequestHandler):
+    """Routes for the stand-in demo test"""
+    protocol_version = 'HTTP/1.1'
+
+    @property
+    def quiz(self) -> QuizServer:
+        return self.server.quiz
+
+    def log_message(self, format, *args):
+        pass  # Keep load runs quiet
+
+    def do_GET(self):
+        self._begin()
+        path = self.path.split('?')[0].rstrip('/')
+        session_id = self._session_id()
+        if path == DEMO_TEST_PATH:
+            return self._send(200, self.quiz.start_page())
+        match = re.fullmatch(rf'{DEMO_TEST_PATH}/q/(\d+)', path)
+        if match and 1 <= int(match.group(1)) <= len(self.quiz.questions):
+            number = int(match.group(1))
+            selected = self.quiz.sessions.get(session_id, {}).get(number)
+            return self._send(200, self.quiz.question_page(number, selected))
+        if path == f"{DEMO_TEST_PATH}/results":
+            return self._send(200, self.quiz.results_page(session_id))
+        self._send(404, PAGE.format(title="Not Found", body="<h1>Page not found</h1>"))
+
+    def do_POST(self):
+        self._begin()
+        path = self.path.split('?')[0].rstrip('/')
+        length = int(self.headers.get('Content-Length') or 0)
+        form = parse_qs(self.rfile.read(length).decode('utf-8')) if length else {}
+        if path == f"{DEMO_TEST_PATH}/start":
+            session_id = self.quiz.new_session()
+            return self._redirect(f"{DEMO_TEST_PATH}/q/1", session_id)
+        match = re.fullmatch(rf'{DEMO_TEST_PATH}/q/(\d+)', path)
+        if match:
+            session_id = self._session_id()
+            number = int(match.group(1))
+            answer = form.get('answer', [None])[0]
+            self.quiz.record_answer(session_id, number, int(answer) if answer is not None else None)
+            go = form.get('go', ['next'])[0]
+            if go == 'submit':
+                with self.quiz._lock:
+                    self.quiz.stats['submitted'] += 1
+                return self._redirect(f"{DEMO_TEST_PATH}/results")
+            target = number - 1 if go == 'previous' else number + 1
+            target = max(1, min(len(self.quiz.questions), target))
+            return self._redirect(f"{DEMO_TEST_PATH}/q/{target}")
+        self._send(404, PAGE.format(title="Not Found", body="<h1>Page not found</h1>"))
+
+    def _begin(self):
+        with self.quiz._lock:
+            self.quiz.stats['requests'] += 1
+        if self.quiz.latency:
+            time.sleep(self.quiz.latency)
+
+    def _session_id(self) -> str:
+        match = re.search(r'quiz_session=(\w+)', self.headers.get('Cookie', ''))
+        return match.group(1) if match else ''
+
+    def _send(self, status: int, html: str):
+        data = html.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location: str, session_id: str = None):
+        self.send_response(303)
+        self.send_header('Location', location)
+        if session_id:
+            self.send_header('Set-Cookie', f"quiz_session={session_id}; Path=/")
+        self.send_header('Content-Length', '0')
+        self.end_headers()
@@ -0,0 +1,148 @@
+"""
+Remote Dispatcher - Spread browser sessions over several remote WebDriver endpoints
+Picks the least loaded healthy endpoint (e.g. several Selenium standalone
+servers on different ports) and retries elsewhere when one is saturated
+"""
+from typing import Any, Dict, List, Optional
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+import requests
+import threading
+import time
+
+
+class RemoteEndpoint:
+    """A remote WebDriver endpoint and its known load"""
+    def __init__(self, url: str, max_sessions: int = 1):
+        self.url = url.rstrip('/')
+        self.max_sessions = max_sessions
+        self.active = 0
+        self.remote_sessions = 0
+        self.healthy = True
+        self.unavailable_until = 0.0
+        self.last_status = 0.0
+        self.stats: Dict[str, int] = {'sessions': 0, 'saturated': 0, 'errors': 0}
+
+    @property
+    def load(self) -> float:
+        """Share of capacity in use, counting sessions started by other workers"""
+        return max(self.active, self.remote_sessions) / max(1, self.max_sessions)
+
+    def is_available(self, now: float = None) -> bool:
+        """Check the endpoint is healthy, not cooling down and has a free slot"""
+        now = time.time() if now is None else now
+        return self.healthy and now >= self.unavailable_until and self.load < 1
+
+    def __repr__(self):
+        return f"RemoteEndpoint({self.url}, {self.active}/{self.max_sessions})"
+
+
+class RemoteDispatcher:
+    """Load-balancing session dispatcher over remote WebDriver endpoints"""
+    def __init__(self, urls: List[str], max_sessions: int = 1, acquire_timeout: float = 60,
+                 saturation_cooldown: float = 2, error_cooldown: float = 30, status_ttl: float = 2):
+        self.endpoints = [RemoteEndpoint(url, max_sessions) for url in urls]
+        self.acquire_timeout = acquire_timeout
+        self.saturation_cooldown = saturation_cooldown
+        self.error_cooldown = error_cooldown
+        self.status_ttl = status_ttl
+        self._lock = threading.Lock()
+
+    def create_driver(self, options):
+        """Start a remote session on the least loaded endpoint, retrying until the deadline"""
+        deadline = time.time() + self.acquire_timeout
+        last_error = None
+        while True:
+            endpoint = self._reserve()
+            if endpoint is not None:
+                try:
+                    driver = webdriver.Remote(command_executor=endpoint.url, options=options)
+                except SessionNotCreatedException as e:
+                    # The node has no free slot; let it drain and try another endpoint
+                    self._give_back(endpoint, cooldown=self.saturation_cooldown, key='saturated')
+                    last_error = e
+                except Exception as e:
+                    print(f"Remote endpoint {endpoint.url} failed: {e}")
+                    self._give_back(endpoint, cooldown=self.error_cooldown, key='errors')
+                    last_error = e
+                else:
+                    with self._lock:
+                        endpoint.stats['sessions'] += 1
+                    self._track_quit(driver, endpoint)
+                    return driver
+
+            if time.time() >= deadline:
+                raise Exception(f"No remote WebDriver endpoint accepted a session within "
+                                f"{self.acquire_timeout}s: {last_error}")
+            time.sleep(0.2)
+
+    def release(self, endpoint: RemoteEndpoint):
+        """Mark one session on an endpoint as finished"""
+        with self._lock:
+            endpoint.active = max(0, endpoint.active - 1)
+
+    def refresh_status(self, endpoint: RemoteEndpoint):
+        """Read readiness and session count from the endpoint's /status"""
+        endpoint.last_status = time.time()
+        try:
+            value = requests.get(f"{endpoint.url}/status", timeout=2).json().get('value', {})
+        except Exception:
+            endpoint.healthy = False
+            return
+        endpoint.healthy = bool(value.get('ready', True))
+        slots, sessions = self._count_slots(value)
+        if slots:
+            endpoint.max_sessions = slots
+            endpoint.remote_sessions = sessions
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-endpoint counters"""
+        return [dict(endpoint.stats, url=endpoint.url, active=endpoint.active) for endpoint in self.endpoints]
+
+    def _reserve(self) -> Optional[RemoteEndpoint]:
+        """Pick the least loaded available endpoint and count the session against it"""
+        now = time.time()
+        for endpoint in self.endpoints:
+            if now - endpoint.last_status >= self.status_ttl:
+                self.refresh_status(endpoint)
+        with self._lock:
+            candidates = [e for e in self.endpoints if e.is_available(now)]
+            if not candidates:
+                return None
+            endpoint = min(candidates, key=lambda e: (e.load, e.active))
+            endpoint.active += 1
+            return endpoint
+
+    def _give_back(self, endpoint: RemoteEndpoint, cooldown: float, key: str):
+        """Undo a reservation after a failed session request"""
+        with self._lock:
+            endpoint.active = max(0, endpoint.active - 1)
+            endpoint.unavailable_until = time.time() + cooldown
+            endpoint.stats[key] += 1
+
+    def _track_quit(self, driver, endpoint: RemoteEndpoint):
+        """Free the endpoint slot when the driver quits"""
+        original_quit = driver.quit
+        released = threading.Event()
+
+        def quit():
+            try:
+                original_quit()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    self.release(endpoint)
+
+        driver.quit = quit
+        driver.remote_endpoint = endpoint.url
+
+    @staticmethod
+    def _count_slots(value: Dict[str, Any]):
+        """Count slots and busy slots in a Grid /status payload"""
+        slots = sessions = 0
+        for node in value.get('nodes', []):
+            for slot in node.get('slots', []):
+                slots += 1
+                if slot.get('session'):
+                    sessions += 1
+        return slots, sessions
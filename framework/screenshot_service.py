@@ -0,0 +1,183 @@
+"""
+Screenshot Service - Background processing of screenshots
+The test thread only grabs the PNG bytes; hashing, optional downscaling and
+writing happen on a worker thread. Identical frames are stored once and the
+total size written per run is capped.
+"""
+from typing import Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from config.config import Config
+from framework.file_lock import FileLock
+import hashlib
+import io
+import itertools
+import json
+import os
+import re
+import threading
+
+try:
+    from PIL import Image  # Optional, only needed for downscaling
+except ImportError:
+    Image = None
+
+
+class ScreenshotService:
+    """Captures screenshots on the caller's thread and writes them in the background"""
+    def __init__(self, directory: str, max_total_bytes: int = 0, max_width: int = 0,
+                 usage_file: Optional[str] = None):
+        self.directory = directory
+        self.max_total_bytes = max_total_bytes
+        self.max_width = max_width
+        self.usage_file = usage_file
+        self.hashes: Dict[str, str] = {}
+        self.stats: Dict[str, int] = {'captured': 0, 'written': 0, 'deduplicated': 0, 'dropped': 0, 'bytes': 0}
+        self._sequence = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='screenshots')
+        self._pending = []
+        self._lock = threading.Lock()
+        self._warned_no_pillow = False
+
+    def capture(self, driver, name: str = 'screenshot', element=None) -> Future:
+        """Grab a screenshot of the page (or one element) and queue it for writing
+
+        Returns a Future with the path of the stored file: an earlier file for
+        a duplicate frame, or None when the run's size cap was reached.
+        """
+        png = element.screenshot_as_png if element is not None else driver.get_screenshot_as_png()
+        path = os.path.join(self.directory, self.make_filename(name))
+        with self._lock:
+            self.stats['captured'] += 1
+        future = self._executor.submit(self._process, png, path)
+        with self._lock:
+            self._pending = [f for f in self._pending if not f.done()] + [future]
+        return future
+
+    def make_filename(self, name: str) -> str:
+        """Unique file name: microsecond timestamp, worker and sequence number"""
+        stem = os.path.splitext(os.path.basename(name))[0] or 'screenshot'
+        stem = re.sub(r'[^\w.-]+', '_', stem)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        worker = os.getenv('PYTEST_XDIST_WORKER', str(os.getpid()))
+        return f"{stem}_{timestamp}_{worker}_{next(self._sequence)}.png"
+
+    def flush(self, timeout: float = None):
+        """Wait until queued screenshots are written"""
+        with self._lock:
+            pending = list(self._pending)
+        if pending:
+            wait(pending, timeout=timeout)
+
+    def shutdown(self, timeout: float = None):
+        """Write what is queued and stop the worker"""
+        self.flush(timeout)
+        self._executor.shutdown(wait=False)
+
+    def reset_usage(self):
+        """Start a new run with nothing written"""
+        if self.usage_file:
+            with FileLock(self.usage_file):
+                self._write_usage(0)
+
+    def _process(self, png: bytes, path: str) -> Optional[str]:
+        """Hash, downscale and write one screenshot"""
+        digest = hashlib.sha256(png).hexdigest()
+        with self._lock:
+            if digest in self.hashes:
+                self.stats['deduplicated'] += 1
+                return self.hashes[digest]
+
+        data = self._downscale(png)
+        if not self._reserve(len(data)):
+            with self._lock:
+                self.stats['dropped'] += 1
+            print(f"Screenshot size cap reached, not saving {os.path.basename(path)}")
+            return None
+
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        with self._lock:
+            self.hashes[digest] = path
+            self.stats['written'] += 1
+            self.stats['bytes'] += len(data)
+        return path
+
+    def _downscale(self, png: bytes) -> bytes:
+        """Shrink to max_width and re-encode when Pillow is available"""
+        if not self.max_width:
+            return png
+        if Image is None:
+            if not self._warned_no_pillow:
+                print("Pillow is not installed, screenshots are saved at full size")
+                self._warned_no_pillow = True
+            return png
+        image = Image.open(io.BytesIO(png))
+        if image.width <= self.max_width:
+            return png
+        height = max(1, round(image.height * self.max_width / image.width))
+        image = image.resize((self.max_width, height), Image.LANCZOS)
+        output = io.BytesIO()
+        image.save(output, format='PNG', optimize=True)
+        return output.getvalue()
+
+    def _reserve(self, size: int) -> bool:
+        """Take size bytes from the run's budget, shared by xdist workers"""
+        if not self.max_total_bytes:
+            return True
+        if not self.usage_file:
+            with self._lock:
+                return self.stats['bytes'] + size <= self.max_total_bytes
+        try:
+            with FileLock(self.usage_file):
+                used = self._read_usage()
+                if used + size > self.max_total_bytes:
+                    return False
+                self._write_usage(used + size)
+                return True
+        except (OSError, TimeoutError) as e:
+            print(f"Could not update screenshot usage file {self.usage_file}: {e}")
+            return True
+
+    def _read_usage(self) -> int:
+        try:
+            with open(self.usage_file, 'r', encoding='utf-8') as f:
+                return int(json.load(f).get('bytes', 0))
+        except (OSError, ValueError, AttributeError):
+            return 0
+
+    def _write_usage(self, used: int):
+        directory = os.path.dirname(self.usage_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.usage_file}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'bytes': used}, f)
+        os.replace(tmp_path, self.usage_file)
+
+
+_service = None
+
+
+def get_screenshot_service() -> ScreenshotService:
+    """Process-wide screenshot service configured from Config"""
+    global _service
+    if _service is None:
+        _service = ScreenshotService(Config.SCREENSHOTS_DIR,
+                                     max_total_bytes=int(Config.SCREENSHOT_MAX_TOTAL_MB * 1024 * 1024),
+                                     max_width=Config.SCREENSHOT_MAX_WIDTH,
+                                     usage_file=Config.SCREENSHOT_USAGE_FILE)
+    return _service
+
+
+def close_screenshot_service(timeout: float = None):
+    """Write queued screenshots and stop the service"""
+    global _service
+    if _service is not None:
+        service, _service = _service, None
+        service.shutdown(timeout)
+        if service.stats['captured']:
+            print(f"Screenshot stats: {service.stats}")
@@ -0,0 +1,553 @@
+"""
+Static Backend - Browserless driver for page objects that only read HTML
+Fetches pages with requests, parses them with lxml and answers
+find_element/find_elements, text and attribute reads locally, including
+XPath, CSS and link-text locators; anything that needs a browser raises
+
+XPath is full XPath 1.0 (lxml) and CSS is translated to XPath by cssselect,
+so locators behave as in a browser, with these differences:
+
+- Pseudo-elements such as ::before and invalid selectors raise
+  InvalidSelectorException. State pseudo-classes such as :hover, :focus and
+  :visited never match, because nothing is hovered, focused or visited.
+- XPath 2.0 functions such as ends-with() and matches() are rejected, as
+  they are by browsers.
+- Visibility only sees the hidden attribute, hidden inputs and inline
+  display/visibility styles, because stylesheets are never applied.
+
+Needs lxml and cssselect (see requirements.txt).
+"""
+from typing import Dict, List, Optional
+from functools import lru_cache
+from urllib.parse import urljoin
+from selenium.common.exceptions import (InvalidSelectorException, NoSuchElementException,
+                                        TimeoutException, WebDriverException)
+from selenium.webdriver.common.by import By
+from config.config import Config
+from framework.bulk_read import BULK_READ_SCRIPT
+import re
+import threading
+
+try:
+    import lxml.html  # Optional, only needed for the static backend
+    from lxml import etree
+    from cssselect import HTMLTranslator, SelectorError
+except ImportError:
+    lxml = None
+
+
+# Never rendered, so never visible and left out of element text
+NOT_RENDERED = {'head', 'script', 'style', 'template', 'noscript', 'title', 'meta', 'link'}
+BLOCK_ELEMENTS = {'address', 'article', 'aside', 'blockquote', 'div', 'dl', 'fieldset', 'footer', 'form', 'h1', 'h2',
+                  'h3', 'h4', 'h5', 'h6', 'header', 'hr', 'main', 'nav', 'ol', 'p', 'pre', 'section', 'table', 'ul',
+                  'li', 'tr', 'br', 'option', 'dt', 'dd', 'figure', 'figcaption', 'details', 'summary', 'caption',
+                  'thead', 'tbody', 'tfoot'}
+HIDDEN_STYLE = re.compile(r'(display\s*:\s*none|visibility\s*:\s*hidden)', re.IGNORECASE)
+
+# How long DOM_QUIET_SCRIPT reports a static page has been quiet, in ms
+QUIET_FOREVER = 10 ** 9
+
+
+class StaticBackendError(WebDriverException):
+    """Something only a real browser can do was asked of the static backend"""
+
+
+def needs_browser(action: str):
+    raise StaticBackendError(f"{action} needs a browser: the static backend only reads server-rendered HTML. "
+                             f"Run this page object with a WebDriver from WebDriverManager instead.")
+
+
+class _Text:
+    """Text node, produced by text() steps in XPath"""
+    def __init__(self, value: str, parent: 'StaticElement'):
+        self.value = value
+        self.parent = parent
+
+
+class _Attribute:
+    """Attribute node, produced by @name steps in XPath"""
+    def __init__(self, name: str, value: str, parent: 'StaticElement'):
+        self.name = name
+        self.value = value
+        self.parent = parent
+
+
+class StaticElement:
+    """Parsed element with the read-only half of the WebElement API"""
+    def __init__(self, node, document: 'StaticDocument'):
+        self.node = node
+        self.document = document
+
+    # -- tree ---------------------------------------------------------------
+    @property
+    def tag_name(self) -> str:
+        return self.node.tag
+
+    @property
+    def attrs(self):
+        return self.node.attrib
+
+    @property
+    def parent(self) -> 'StaticElement':
+        parent = self.node.getparent()
+        return self.document.wrap(parent) if parent is not None else self.document
+
+    def elements(self) -> List['StaticElement']:
+        return [self.document.wrap(child) for child in self.node if isinstance(child.tag, str)]
+
+    def descendants(self):
+        for node in self.node.iterdescendants():
+            if isinstance(node.tag, str):
+                yield self.document.wrap(node)
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    @property
+    def text_content(self) -> str:
+        """All descendant text, like DOM textContent"""
+        return self.node.text_content()
+
+    # -- WebElement API -----------------------------------------------------
+    @property
+    def text(self) -> str:
+        """Rendered text: hidden and non-rendered elements left out, whitespace collapsed per line"""
+        if not self.is_displayed():
+            return ''
+        pieces: List[str] = []
+        _render(self.node, pieces)
+        lines = (re.sub(r'\s+', ' ', line).strip() for line in ''.join(pieces).split('\n'))
+        return '\n'.join(line for line in lines if line)
+
+    def is_displayed(self) -> bool:
+        """False when the element or an ancestor is not rendered or hidden inline; stylesheets are not applied"""
+        return not any(_hidden_itself(node) for node in self.node.iterancestors()) and not _hidden_itself(self.node)
+
+    def is_enabled(self) -> bool:
+        return 'disabled' not in self.attrs
+
+    def is_selected(self) -> bool:
+        return 'checked' in self.attrs or 'selected' in self.attrs
+
+    def get_dom_attribute(self, name: str) -> Optional[str]:
+        return self.attrs.get(name.lower())
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        """Attribute value; href/src resolved against the page URL like the DOM properties"""
+        name = name.lower()
+        if name in ('textcontent', 'innertext'):
+            return self.text_content if name == 'textcontent' else self.text
+        if name in ('href', 'src') and name in self.attrs:
+            return urljoin(self.document.url, self.attrs[name])
+        if name in ('checked', 'selected', 'disabled', 'hidden', 'required', 'readonly', 'multiple'):
+            return 'true' if name in self.attrs else None
+        return self.attrs.get(name)
+
+    def get_property(self, name: str):
+        return self.get_attribute(name)
+
+    def value_of_css_property(self, name: str) -> str:
+        match = re.search(rf'(?:^|;)\s*{re.escape(name)}\s*:\s*([^;]+)', self.attrs.get('style', ''), re.IGNORECASE)
+        return match.group(1).strip() if match else ''
+
+    def find_element(self, by=By.ID, value=None) -> 'StaticElement':
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None) -> List['StaticElement']:
+        return find_all(self, by, value)
+
+    def click(self):
+        needs_browser("click()")
+
+    def send_keys(self, *value):
+        needs_browser("send_keys()")
+
+    def clear(self):
+        needs_browser("clear()")
+
+    def submit(self):
+        needs_browser("submit()")
+
+    def screenshot(self, filename):
+        needs_browser("screenshot()")
+
+    @property
+    def location(self):
+        return needs_browser("location")
+
+    @property
+    def size(self):
+        return needs_browser("size")
+
+    @property
+    def rect(self):
+        return needs_browser("rect")
+
+    def __repr__(self):
+        return f"StaticElement(<{self.tag_name}>)"
+
+
+class StaticDocument(StaticElement):
+    """Root of a parsed page; hands out one StaticElement per node"""
+    def __init__(self, url: str, html: str, status: int = 200):
+        if lxml is None:
+            raise StaticBackendError("The static backend needs lxml and cssselect: pip install lxml cssselect")
+        super().__init__(None, self)
+        self.url = url
+        self.html = html
+        self.status = status
+        self.tree = _parse(html).getroottree()
+        self._wrappers = {}
+
+    def wrap(self, node) -> StaticElement:
+        # Holding the node keeps lxml handing out the same proxy for it
+        element = self._wrappers.get(node)
+        if element is None:
+            element = self._wrappers[node] = StaticElement(node, self)
+        return element
+
+    @property
+    def tag_name(self) -> str:
+        return '#document'
+
+    @property
+    def attrs(self):
+        return {}
+
+    @property
+    def parent(self):
+        return None
+
+    def elements(self) -> List[StaticElement]:
+        return [self.wrap(self.tree.getroot())]
+
+    def descendants(self):
+        for node in self.tree.getroot().iter():
+            if isinstance(node.tag, str):
+                yield self.wrap(node)
+
+    @property
+    def text_content(self) -> str:
+        return self.tree.getroot().text_content()
+
+    @property
+    def text(self) -> str:
+        return self.wrap(self.tree.getroot()).text
+
+    @property
+    def title(self) -> str:
+        title = self.tree.find('.//title')
+        return ' '.join(title.text_content().split()) if title is not None else ''
+
+    def is_displayed(self) -> bool:
+        return True
+
+
+def _parse(html: str):
+    """lxml tree of a page, with the html/head/body a browser would add"""
+    parser = lxml.html.HTMLParser(encoding='utf-8')
+    try:
+        return lxml.html.document_fromstring(html.encode('utf-8'), parser=parser)
+    except etree.ParserError:
+        return lxml.html.document_fromstring(b'<html><body></body></html>', parser=parser)
+
+
+def _hidden_itself(node) -> bool:
+    attrs = node.attrib
+    if node.tag in NOT_RENDERED or 'hidden' in attrs:
+        return True
+    if node.tag == 'input' and attrs.get('type', '').lower() == 'hidden':
+        return True
+    return bool(HIDDEN_STYLE.search(attrs.get('style', '')))
+
+
+def _render(node, pieces: List[str]):
+    if node.text:
+        pieces.append(node.text.replace('\n', ' '))
+    for child in node:
+        # Comments and processing instructions have no string tag but keep their tail
+        if isinstance(child.tag, str) and not _hidden_itself(child):
+            block = child.tag in BLOCK_ELEMENTS
+            if block:
+                pieces.append('\n')
+            _render(child, pieces)
+            if block:
+                pieces.append('\n')
+        if child.tail:
+            pieces.append(child.tail.replace('\n', ' '))
+
+
+def find_all(root: StaticElement, by: str, value: str) -> List[StaticElement]:
+    """Elements under root matching a Selenium locator, in document order"""
+    if by == By.XPATH:
+        result = XPath(value).evaluate(root)
+        if not isinstance(result, list) or any(not isinstance(node, StaticElement) for node in result):
+            raise InvalidSelectorException(f"XPath {value!r} does not select elements")
+        return result
+    if by == By.CSS_SELECTOR:
+        return select(root, value)
+    if by == By.ID:
+        return [element for element in root.descendants() if element.attrs.get('id') == value]
+    if by == By.NAME:
+        return [element for element in root.descendants() if element.attrs.get('name') == value]
+    if by == By.CLASS_NAME:
+        return [element for element in root.descendants() if value in element.attrs.get('class', '').split()]
+    if by == By.TAG_NAME:
+        return [element for element in root.descendants() if element.tag_name == value.lower()]
+    if by == By.LINK_TEXT:
+        return [element for element in root.descendants() if element.tag_name == 'a' and element.text == value]
+    if by == By.PARTIAL_LINK_TEXT:
+        return [element for element in root.descendants() if element.tag_name == 'a' and value in element.text]
+    raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+
+
+@lru_cache(maxsize=1024)
+def _css_to_xpath(selector: str) -> str:
+    try:
+        # descendant:: rather than descendant-or-self:: so an element never matches its own scoped lookup
+        return HTMLTranslator().css_to_xpath(selector, prefix='descendant::')
+    except SelectorError as e:
+        raise InvalidSelectorException(f"Invalid CSS selector {selector!r}: {e}")
+
+
+def select(root: StaticElement, selector: str) -> List[StaticElement]:
+    """Elements under root matching a CSS selector"""
+    return XPath(_css_to_xpath(selector)).evaluate(root)
+
+
+@lru_cache(maxsize=1024)
+def _compile_xpath(expression: str):
+    try:
+        return etree.XPath(expression, smart_strings=True)
+    except etree.XPathSyntaxError as e:
+        raise InvalidSelectorException(f"Invalid XPath {expression!r}: {e}")
+
+
+class XPath:
+    """XPath 1.0 expression evaluated by lxml, with results as StaticElement, _Attribute and _Text nodes"""
+    def __init__(self, expression: str):
+        self.expression = expression
+        self._compiled = _compile_xpath(expression)
+
+    def evaluate(self, context: StaticElement):
+        document = context.document
+        try:
+            result = self._compiled(document.tree if context is document else context.node)
+        except etree.XPathError as e:
+            raise InvalidSelectorException(f"Invalid XPath {self.expression!r}: {e}")
+        if not isinstance(result, list):
+            return result
+        return [self._node(document, item) for item in result]
+
+    @staticmethod
+    def _node(document: 'StaticDocument', item):
+        if isinstance(getattr(item, 'tag', None), str):
+            return document.wrap(item)
+        parent = item.getparent() if hasattr(item, 'getparent') else None
+        owner = document.wrap(parent) if parent is not None else None
+        if getattr(item, 'is_attribute', False):
+            return _Attribute(item.attrname, str(item), owner)
+        if getattr(item, 'is_text', False) or getattr(item, 'is_tail', False):
+            return _Text(str(item), owner)
+        return item
+
+
+# -- driver --------------------------------------------------------------------
+
+class StaticWait:
+    """WebDriverWait stand-in that checks its condition once, without sleeping
+
+    A static page cannot change, so a condition that fails now fails forever.
+    """
+    def __init__(self, driver, timeout=0, *args, **kwargs):
+        self.driver = driver
+
+    def until(self, method, message: str = ''):
+        try:
+            value = method(self.driver)
+        except NoSuchElementException as e:
+            raise TimeoutException(message or str(e.msg))
+        if not value:
+            raise TimeoutException(message)
+        return value
+
+    def until_not(self, method, message: str = ''):
+        try:
+            value = method(self.driver)
+        except NoSuchElementException:
+            return True
+        if value:
+            raise TimeoutException(message)
+        return value
+
+
+class _Timeouts:
+    implicit_wait = 0
+    page_load = 0
+    script = 0
+
+
+class _SwitchTo:
+    def __getattr__(self, name):
+        needs_browser(f"switch_to.{name}")
+
+
+class StaticDriver:
+    """WebDriver stand-in that serves page objects from fetched HTML
+
+    Every get(), refresh(), back() and forward() fetches and parses the page
+    again, as a browser would load it; load_html() registers a page that is
+    served from a string instead of being fetched. Lookups,
+    text, attributes, bulk_read and visibility from inline styles work;
+    clicks, typing, scripts and screenshots raise StaticBackendError.
+    """
+    is_static = True
+    # Pages registered with load_html(), served instead of fetching
+    documents: Dict[str, StaticDocument] = {}
+    _documents_lock = threading.Lock()
+
+    def __init__(self, session=None):
+        self.session = session
+        self.document: Optional[StaticDocument] = None
+        self.history: List[str] = []
+        self.index = -1
+        self.timeouts = _Timeouts()
+        self.switch_to = _SwitchTo()
+        self.session_id = 'static'
+        self.capabilities = {'browserName': 'static'}
+        self.fetches = 0
+
+    @classmethod
+    def load_html(cls, url: str, html: str, status: int = 200) -> StaticDocument:
+        """Serve html as the page at url in every StaticDriver, replacing an earlier one"""
+        document = StaticDocument(url, html, status)
+        with cls._documents_lock:
+            cls.documents[url] = document
+        return document
+
+    @classmethod
+    def clear_cache(cls):
+        """Forget pages registered with load_html()"""
+        with cls._documents_lock:
+            cls.documents = {}
+
+    def _load(self, url: str) -> StaticDocument:
+        with self._documents_lock:
+            document = self.documents.get(url)
+        if document is not None:
+            return document
+        import requests
+        response = (self.session or requests).get(url, timeout=Config.PAGE_LOAD_TIMEOUT,
+                                                    headers={'User-Agent': 'Mozilla/5.0 (static backend)'})
+        self.fetches += 1
+        return StaticDocument(response.url, response.text, response.status_code)
+
+    def get(self, url: str):
+        self.document = self._load(url)
+        del self.history[self.index + 1:]
+        self.history.append(url)
+        self.index = len(self.history) - 1
+
+    def _page(self) -> StaticDocument:
+        if self.document is None:
+            raise StaticBackendError("No page loaded: call get(url) first")
+        return self.document
+
+    @property
+    def current_url(self) -> str:
+        return self.document.url if self.document is not None else 'about:blank'
+
+    @property
+    def title(self) -> str:
+        return self.document.title if self.document is not None else ''
+
+    @property
+    def page_source(self) -> str:
+        return self._page().html
+
+    @property
+    def window_handles(self):
+        return ['static']
+
+    def find_element(self, by=By.ID, value=None) -> StaticElement:
+        return self._page().find_element(by, value)
+
+    def find_elements(self, by=By.ID, value=None) -> List[StaticElement]:
+        return self._page().find_elements(by, value)
+
+    def execute_script(self, script: str, *args):
+        """Runs BulkRead, DOM-quiet and document-token checks in Python; other JavaScript raises"""
+        if script == BULK_READ_SCRIPT:
+            return self._bulk_read(*args)
+        if 'window.__aqaMutations' in script:
+            return QUIET_FOREVER
+        if 'window.__aqaDocument' in script:
+            return str(id(self.document))
+        needs_browser("execute_script()")
+
+    def _bulk_read(self, queries, attributes=(), with_elements=False):
+        results = []
+        for by, value in queries:
+            try:
+                elements = self.find_elements(by, value)
+            except (InvalidSelectorException, StaticBackendError) as e:
+                results.append({'count': 0, 'texts': [], 'visible': [], 'attributes': [], 'elements': [],
+                                'error': str(e.msg if hasattr(e, 'msg') else e)})
+                continue
+            results.append({
+                'count': len(elements),
+                'texts': [element.text for element in elements],
+                'visible': [element.is_displayed() for element in elements],
+                'attributes': [{name: element.attrs.get(name) for name in attributes} for element in elements],
+                'elements': elements if with_elements else [],
+                'error': None,
+            })
+        return results
+
+    def refresh(self):
+        """Fetch the current page again"""
+        self._page()
+        self.document = self._load(self.history[self.index])
+
+    def back(self):
+        if self.index > 0:
+            self.index -= 1
+            self.document = self._load(self.history[self.index])
+
+    def forward(self):
+        if self.index < len(self.history) - 1:
+            self.index += 1
+            self.document = self._load(self.history[self.index])
+
+    def implicitly_wait(self, seconds):
+        self.timeouts.implicit_wait = seconds
+
+    def set_page_load_timeout(self, seconds):
+        self.timeouts.page_load = seconds
+
+    def delete_all_cookies(self):
+        pass
+
+    def execute(self, command, params=None):
+        needs_browser(f"WebDriver command {command!r}")
+
+    def save_screenshot(self, filename):
+        needs_browser("save_screenshot()")
+
+    def get_screenshot_as_png(self):
+        needs_browser("get_screenshot_as_png()")
+
+    def get_screenshot_as_file(self, filename):
+        needs_browser("get_screenshot_as_file()")
+
+    def close(self):
+        self.document = None
+
+    def quit(self):
+        self.document = None
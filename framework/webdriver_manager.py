@@ -8,108 +8,459 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from webdriver_manager.chrome import ChromeDriverManager
 from webdriver_manager.firefox import GeckoDriverManager
 from config.config import Config
+from framework.driver_pool import DriverPool
+from framework.driver_prefetcher import DriverPrefetcher
+from framework.driver_cache import DriverResolutionCache
+from framework.browser_health import BrowserHealth
+from framework.remote_dispatcher import RemoteDispatcher
+from framework.driver_metrics import driver_metrics
+from framework.driver_reaper import DriverReaper
+from framework.caching_proxy import CachingProxy, DiskCache, har_name
 import os
 import platform
 import shutil
+import time
+import weakref
+
+
+DRIVER_BINARIES = {
+    'chrome': 'chromedriver',
+    'firefox': 'geckodriver',
+    'edge': 'msedgedriver',
+}
+
+DRIVER_INSTALLERS = {
+    'chrome': ChromeDriverManager,
+    'firefox': GeckoDriverManager,
+}
+
+# Web fonts blocked by profiles with block_fonts
+FONT_URL_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*fonts.googleapis.com*', '*fonts.gstatic.com*']
+
+# Browsers tried in order when the configured one fails to launch
+FALLBACK_CHAINS = {
+    'chrome': ['chrome', 'firefox'],
+    'firefox': ['firefox', 'chrome'],
+    'edge': ['edge', 'firefox', 'chrome'],
+}
 
 
 class WebDriverManager:
+    _pool = None
+    _prefetcher = None
+    _resolution_cache = None
+    _browser_health = None
+    _dispatcher = None
+    _reaper = None
+    _proxy_cache = None
+    _proxies = {}
+    _implicit_waits = weakref.WeakKeyDictionary()
+    _https_proxy_warned = False
+    
+    @classmethod
+    def get_pool(cls):
+        """Get the session-wide driver pool, creating it on first use"""
+        if cls._pool is None:
+            max_idle = max(Config.DRIVER_POOL_SIZE, Config.PREWARM_DRIVERS)
+            cls._pool = DriverPool(cls.create_driver, max_idle=max_idle, quitter=cls.quit_driver)
+        return cls._pool
+    
+    @classmethod
+    def set_implicit_wait(cls, driver, seconds):
+        """Set a driver's implicit wait and remember it, so it can be restored without asking the browser"""
+        driver.implicitly_wait(seconds)
+        try:
+            cls._implicit_waits[driver] = seconds
+        except TypeError:
+            pass  # Driver can't be weakly referenced
+    
+    @classmethod
+    def get_implicit_wait(cls, driver):
+        """Implicit wait last set with set_implicit_wait(), IMPLICIT_WAIT for other drivers"""
+        try:
+            return cls._implicit_waits.get(driver, Config.IMPLICIT_WAIT)
+        except TypeError:
+            return Config.IMPLICIT_WAIT
+    
+    @classmethod
+    def get_reaper(cls):
+        """Get the background teardown pool"""
+        if cls._reaper is None:
+            cls._reaper = DriverReaper(workers=Config.TEARDOWN_WORKERS, quit_timeout=Config.QUIT_TIMEOUT,
+                                       on_quit=lambda browser, seconds: driver_metrics.record(browser, 'quit', seconds))
+        return cls._reaper
+    
+    @classmethod
+    def quit_driver(cls, driver):
+        """Quit a driver, in the background unless ASYNC_QUIT is off"""
+        browser = cls.get_browser_name(driver)
+        cls.stop_proxy(driver)
+        if Config.ASYNC_QUIT:
+            return cls.get_reaper().quit_async(driver, browser)
+        with driver_metrics.phase(browser, 'quit'):
+            driver.quit()
+    
+    @classmethod
+    def get_proxy_cache(cls):
+        """Disk cache shared by every proxy in this process"""
+        if cls._proxy_cache is None:
+            cls._proxy_cache = DiskCache(Config.PROXY_CACHE_DIR)
+        return cls._proxy_cache
+    
+    @classmethod
+    def start_proxy(cls):
+        """Start a caching proxy for one browser session"""
+        if Config.BASE_URL.lower().startswith('https:') and not cls._https_proxy_warned:
+            cls._https_proxy_warned = True
+            print(f"WARNING: CACHING_PROXY is on but BASE_URL {Config.BASE_URL} is HTTPS. HTTPS is tunnelled "
+                  f"without TLS interception, so nothing from it is cached and HAR files only show one CONNECT "
+                  f"entry per connection. Use REPLAY_VERSION or an http:// BASE_URL to cache and time requests.")
+        proxy = CachingProxy(cls.get_proxy_cache())
+        proxy.start()
+        return proxy
+    
+    @classmethod
+    def get_proxy(cls, driver):
+        """Caching proxy a driver's traffic goes through, None without one"""
+        return cls._proxies.get(driver)
+    
+    @classmethod
+    def save_har(cls, driver, title):
+        """Write the requests made through a driver's proxy since the last save as HAR"""
+        proxy = cls.get_proxy(driver)
+        if proxy is None:
+            return None
+        if not Config.CAPTURE_HAR:
+            proxy.take_entries()
+            return None
+        return proxy.write_har(os.path.join(Config.HAR_DIR, har_name(title)), title)
+    
+    @classmethod
+    def stop_proxy(cls, driver):
+        """Save what's left of a driver's HAR and stop its proxy"""
+        if driver not in cls._proxies:
+            return
+        try:
+            cls.save_har(driver, f"session_{getattr(driver, 'session_id', None) or id(driver)}")
+        except Exception as e:
+            print(f"HAR not saved: {e}")
+        proxy = cls._proxies.pop(driver)
+        proxy.stop()
+        print(f"Caching proxy stats: {proxy.stats}")
+    
+    @classmethod
+    def flush_quits(cls):
+        """Wait for background quits queued so far"""
+        if cls._reaper is not None:
+            cls._reaper.flush(timeout=Config.QUIT_TIMEOUT * 2)
+    
+    @classmethod
+    def shutdown_reaper(cls, owner_prefix=None):
+        """Wait for background quits and kill processes this run left behind"""
+        reaper = cls._reaper or DriverReaper()
+        cls._reaper = None
+        reaper.shutdown(owner_prefix if Config.REAP_ORPHANS else None)
+        if any(reaper.stats.values()):
+            print(f"Driver teardown stats: {reaper.stats}")
+    
+    @classmethod
+    def prewarm_drivers(cls, count=None, worker_id=None):
+        """Start drivers in the background so the first test gets a warm browser"""
+        count = Config.PREWARM_DRIVERS if count is None else count
+        if count <= 0:
+            return []
+        # Stagger xdist workers so they don't all spawn browsers at once
+        delay = cls.get_worker_index(worker_id) * Config.PREWARM_STAGGER
+        print(f"Pre-warming {count} driver(s) after {delay}s")
+        return cls.get_pool().prewarm(count, delay=delay)
+    
+    @classmethod
+    def record_capabilities(cls, browser, driver):
+        """Store capabilities reported by a started driver in the resolution cache"""
+        try:
+            cls.get_resolution_cache().record_capabilities(browser, dict(driver.capabilities))
+        except Exception as e:
+            print(f"Could not record capabilities: {e}")
+    
+    @classmethod
+    def start_prefetch(cls, depth=None):
+        """Keep `depth` fresh drivers spawning in the background"""
+        depth = Config.PREFETCH_DRIVERS if depth is None else depth
+        if depth <= 0:
+            return None
+        if cls._prefetcher is None:
+            cls._prefetcher = DriverPrefetcher(cls.create_driver, depth=depth, quitter=cls.quit_driver).start()
+        return cls._prefetcher
+    
+    @classmethod
+    def stop_prefetch(cls):
+        """Stop background spawning and quit queued drivers"""
+        if cls._prefetcher is not None:
+            prefetcher = cls._prefetcher
+            cls._prefetcher = None
+            prefetcher.stop()
+            print(f"Driver prefetch stats: {prefetcher.stats}")
+    
+    @classmethod
+    def get_prefetch_stats(cls):
+        """Queue hit/miss counters of the running prefetcher, None when disabled"""
+        if cls._prefetcher is None:
+            return None
+        return dict(cls._prefetcher.stats, hit_rate=round(cls._prefetcher.hit_rate(), 3))
+    
+    @classmethod
+    def create_fresh_driver(cls):
+        """Get a driver no other test has used, from the prefetch queue when running"""
+        if cls._prefetcher is not None:
+            return cls._prefetcher.take()
+        return cls.create_driver()
+    
+    @staticmethod
+    def get_browser_name(driver):
+        """Short name of a running driver's browser (chrome, firefox, edge)"""
+        try:
+            name = str(driver.capabilities.get('browserName', '')).lower()
+        except Exception:
+            name = ''
+        if 'edge' in name:
+            return 'edge'
+        return name or Config.BROWSER.lower()
+    
+    @staticmethod
+    def get_worker_index(worker_id=None):
+        """Get the pytest-xdist worker number (gw3 -> 3), 0 when not distributed"""
+        worker_id = worker_id or os.getenv('PYTEST_XDIST_WORKER', '')
+        digits = ''.join(ch for ch in worker_id if ch.isdigit())
+        return int(digits) if digits else 0
+    
+    @classmethod
+    def close_pool(cls):
+        """Quit all pooled drivers"""
+        if cls._pool is not None:
+            cls._pool.close()
+            cls._pool = None
+    
     @staticmethod
     def find_driver_in_path(driver_name):
         """Find driver in system PATH"""
         return shutil.which(driver_name)
     
+    @classmethod
+    def get_resolution_cache(cls):
+        """Get the persistent driver resolution cache"""
+        if cls._resolution_cache is None:
+            cls._resolution_cache = DriverResolutionCache(Config.DRIVER_CACHE_FILE, ttl=Config.DRIVER_CACHE_TTL)
+        return cls._resolution_cache
+    
+    @classmethod
+    def resolve_driver_path(cls, browser):
+        """Resolve driver binary: cache first, then PATH, then webdriver-manager"""
+        cache = cls.get_resolution_cache()
+        entry = cache.get(browser)
+        if entry:
+            return entry['driver_path']
+        
+        driver_path = cls.find_driver_in_path(DRIVER_BINARIES[browser])
+        if not driver_path and browser in DRIVER_INSTALLERS:
+            try:
+                driver_path = DRIVER_INSTALLERS[browser]().install()
+                print(f"Using {DRIVER_BINARIES[browser]} from webdriver-manager: {driver_path}")
+            except Exception as e:
+                print(f"WebDriver Manager failed: {e}")
+                driver_path = None
+        
+        if driver_path:
+            cache.put(browser, driver_path)
+        return driver_path
+    
+    @classmethod
+    def get_browser_health(cls):
+        """Get the run-wide browser health record"""
+        if cls._browser_health is None:
+            cls._browser_health = BrowserHealth(Config.BROWSER_HEALTH_FILE)
+        return cls._browser_health
+    
+    @classmethod
+    def get_dispatcher(cls):
+        """Get the dispatcher for REMOTE_ENDPOINTS"""
+        if cls._dispatcher is None:
+            cls._dispatcher = RemoteDispatcher(Config.REMOTE_ENDPOINTS,
+                                               max_sessions=Config.REMOTE_MAX_SESSIONS,
+                                               acquire_timeout=Config.REMOTE_ACQUIRE_TIMEOUT)
+        return cls._dispatcher
+    
+    @classmethod
+    def invalidate_driver_cache(cls, browser=None):
+        """Forget cached driver resolution for one browser or all of them"""
+        cls.get_resolution_cache().invalidate(browser)
+    
     @staticmethod
-    def create_driver():
+    def create_driver(profile=None):
         """Create and configure WebDriver instance"""
         browser = Config.BROWSER.lower()
+        if browser not in FALLBACK_CHAINS:
+            raise ValueError(f"Unsupported browser: {browser}")
+        profile = Config.get_browser_profile(profile)
         
-        if browser == 'chrome':
-            options = ChromeOptions()
-            if Config.HEADLESS:
-                options.add_argument('--headless')
-            options.add_argument(f'--window-size={Config.WINDOW_SIZE}')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-web-security')
-            options.add_argument('--allow-running-insecure-content')
-            options.add_argument('--disable-blink-features=AutomationControlled')
-            options.add_argument('--disable-background-timer-throttling')
-            options.add_argument('--disable-backgrounding-occluded-windows')
-            options.add_argument('--disable-renderer-backgrounding')
-            options.add_argument('--disable-features=TranslateUI')
-            options.add_argument('--disable-ipc-flooding-protection')
-            options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            options.add_experimental_option('useAutomationExtension', False)
-            
-            # Try to find chromedriver in PATH first
-            driver_path = WebDriverManager.find_driver_in_path('chromedriver')
-            if driver_path:
-                service = ChromeService(driver_path)
-            else:
-                # Use webdriver-manager as fallback
-                try:
-                    # Try to get compatible ChromeDriver version
-                    driver_path = ChromeDriverManager().install()
-                    service = ChromeService(driver_path)
-                    print(f"Using ChromeDriver from webdriver-manager: {driver_path}")
-                except Exception as e:
-                    print(f"WebDriver Manager failed: {e}")
-                    # Try without service as last resort
-                    service = None
-            
+        # Go straight to browsers that still work in this run; only walk the
+        # whole chain again when every one of them has already failed
+        health = WebDriverManager.get_browser_health()
+        failed = health.failed_browsers()
+        chain = FALLBACK_CHAINS[browser]
+        candidates = [b for b in chain if b not in failed] or chain
+        
+        # Remote browsers can't reach a proxy on this machine
+        proxy = None
+        if Config.CACHING_PROXY and not Config.REMOTE_ENDPOINTS:
+            proxy = WebDriverManager.start_proxy()
+        
+        last_error = None
+        for candidate in candidates:
+            started = time.perf_counter()
             try:
-                if service:
-                    driver = webdriver.Chrome(service=service, options=options)
+                if Config.REMOTE_ENDPOINTS:
+                    options = BROWSER_OPTIONS[candidate](profile)
+                    with driver_metrics.phase(candidate, 'handshake'):
+                        driver = WebDriverManager.get_dispatcher().create_driver(options)
                 else:
-                    driver = webdriver.Chrome(options=options)
-                print("Chrome driver created successfully")
+                    driver = BROWSER_LAUNCHERS[candidate](profile, proxy.url if proxy else None)
             except Exception as e:
-                print(f"Chrome failed: {e}")
-                print("Attempting fallback to Firefox...")
-                # Fallback to Firefox
-                return WebDriverManager._create_firefox_driver()
-            
-        elif browser == 'firefox':
-            return WebDriverManager._create_firefox_driver()
-            
-        elif browser == 'edge':
-            options = EdgeOptions()
-            if Config.HEADLESS:
-                options.add_argument('--headless')
-            options.add_argument(f'--window-size={Config.WINDOW_SIZE}')
-            
-            # Try to find edgedriver in PATH first
-            driver_path = WebDriverManager.find_driver_in_path('msedgedriver')
-            if driver_path:
-                service = EdgeService(driver_path)
-            else:
-                service = None
+                if Config.REMOTE_ENDPOINTS:
+                    # A saturated or cooling-down grid says nothing about the browser
+                    # itself, and the dispatcher already retried until its deadline
+                    print(f"Remote {candidate} session not created: {e}")
+                    raise
+                print(f"{candidate.capitalize()} failed: {e}")
+                WebDriverManager.invalidate_driver_cache(candidate)
+                health.record_failure(candidate, e)
+                last_error = e
+                continue
             
+            if candidate != browser:
+                print(f"Using {candidate.capitalize()} as fallback for {browser.capitalize()}")
+            WebDriverManager.get_reaper().register(driver)
+            if proxy is not None:
+                WebDriverManager._proxies[driver] = proxy
             try:
-                if service:
-                    driver = webdriver.Edge(service=service, options=options)
-                else:
-                    driver = webdriver.Edge(options=options)
+                with driver_metrics.phase(candidate, 'configure'):
+                    health.record_launch(browser, candidate)
+                    WebDriverManager.record_capabilities(candidate, driver)
+                    WebDriverManager.apply_url_blocking(driver, profile)
+                    
+                    # Configure timeouts
+                    WebDriverManager.set_implicit_wait(driver, Config.IMPLICIT_WAIT)
+                    driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
             except Exception as e:
-                print(f"Edge failed: {e}")
-                # Fallback to Firefox
-                return WebDriverManager._create_firefox_driver()
+                # The browser is already running; don't leave it behind
+                print(f"Configuring {candidate} failed: {e}")
+                WebDriverManager.quit_driver(driver)
+                raise
             
-        else:
-            raise ValueError(f"Unsupported browser: {browser}")
+            driver_metrics.record(candidate, 'create', time.perf_counter() - started)
+            return driver
+        
+        if proxy is not None:
+            proxy.stop()
+        print(f"All browsers failed. Last error: {last_error}")
+        raise Exception("No working browser found. Please install Chrome, Firefox, or Edge with their respective drivers.")
+    
+    @staticmethod
+    def _start_local_driver(browser, driver_class, driver_path, service_class, options):
+        """Start a local driver, timing process spawn and session handshake separately"""
+        if not driver_path:
+            # Selenium spawns its own service here, so the phases can't be split
+            with driver_metrics.phase(browser, 'handshake'):
+                return driver_class(options=options)
+        
+        service = service_class(driver_path)
+        spawn = {'seconds': 0.0}
+        original_start = service.start
         
-        # Configure timeouts
-        driver.implicitly_wait(Config.IMPLICIT_WAIT)
-        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
+        def timed_start():
+            spawn_started = time.perf_counter()
+            try:
+                original_start()
+            finally:
+                spawn['seconds'] = time.perf_counter() - spawn_started
         
+        service.start = timed_start
+        started = time.perf_counter()
+        driver = driver_class(service=service, options=options)
+        driver_metrics.record(browser, 'spawn', spawn['seconds'])
+        driver_metrics.record(browser, 'handshake', time.perf_counter() - started - spawn['seconds'])
         return driver
     
     @staticmethod
-    def _create_firefox_driver():
-        """Create Firefox driver with fallback options"""
+    def apply_url_blocking(driver, profile):
+        """Block fonts and tracker URLs through DevTools on Chromium browsers"""
+        patterns = list(profile['blocked_urls'])
+        if profile['block_fonts']:
+            patterns += FONT_URL_PATTERNS
+        if not patterns or not hasattr(driver, 'execute_cdp_cmd'):
+            return
+        try:
+            driver.execute_cdp_cmd('Network.enable', {})
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+        except Exception as e:
+            print(f"URL blocking not applied: {e}")
+    
+    @staticmethod
+    def _apply_chromium_profile(options, profile):
+        """Apply performance profile to Chrome/Edge options"""
+        options.page_load_strategy = profile['page_load_strategy']
+        if profile['block_images']:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        if profile['browser_logs']:
+            options.set_capability('goog:loggingPrefs', {'browser': 'ALL', 'performance': 'ALL'})
+    
+    @staticmethod
+    def _apply_chromium_proxy(options, proxy_url):
+        """Send all Chrome/Edge traffic, localhost included, through proxy_url"""
+        if proxy_url:
+            options.add_argument(f'--proxy-server={proxy_url}')
+            options.add_argument('--proxy-bypass-list=<-loopback>')
+    
+    @staticmethod
+    def _chrome_options(profile, proxy_url=None):
+        """Build Chrome options"""
+        options = ChromeOptions()
+        if Config.HEADLESS:
+            options.add_argument('--headless')
+        options.add_argument(f'--window-size={Config.WINDOW_SIZE}')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--disable-extensions')
+        options.add_argument('--disable-web-security')
+        options.add_argument('--allow-running-insecure-content')
+        options.add_argument('--disable-blink-features=AutomationControlled')
+        options.add_argument('--disable-background-timer-throttling')
+        options.add_argument('--disable-backgrounding-occluded-windows')
+        options.add_argument('--disable-renderer-backgrounding')
+        options.add_argument('--disable-features=TranslateUI')
+        options.add_argument('--disable-ipc-flooding-protection')
+        options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        options.add_experimental_option('useAutomationExtension', False)
+        WebDriverManager._apply_chromium_profile(options, profile)
+        WebDriverManager._apply_chromium_proxy(options, proxy_url)
+        return options
+    
+    @staticmethod
+    def _create_chrome_driver(profile, proxy_url=None):
+        """Create Chrome driver"""
+        options = WebDriverManager._chrome_options(profile, proxy_url)
+        
+        # Cached path, then PATH, then webdriver-manager; no service as last resort
+        with driver_metrics.phase('chrome', 'resolve'):
+            driver_path = WebDriverManager.resolve_driver_path('chrome')
+        driver = WebDriverManager._start_local_driver('chrome', webdriver.Chrome, driver_path, ChromeService, options)
+        print("Chrome driver created successfully")
+        return driver
+    
+    @staticmethod
+    def _firefox_options(profile, proxy_url=None):
+        """Build Firefox options"""
         options = FirefoxOptions()
         if Config.HEADLESS:
             options.add_argument('--headless')
@@ -126,42 +477,73 @@ class WebDriverManager:
         options.add_argument(f'--width={Config.get_window_size()[0]}')
         options.add_argument(f'--height={Config.get_window_size()[1]}')
         
-        # Try to find geckodriver in PATH first
-        driver_path = WebDriverManager.find_driver_in_path('geckodriver')
+        # Performance profile; Firefox can't block arbitrary URLs without an
+        # extension, so its built-in tracking protection stands in for the blocklist
+        options.page_load_strategy = profile['page_load_strategy']
+        if profile['block_images']:
+            options.set_preference('permissions.default.image', 2)
+        if profile['block_fonts']:
+            options.set_preference('gfx.downloadable_fonts.enabled', False)
+        if profile['blocked_urls']:
+            options.set_preference('privacy.trackingprotection.enabled', True)
+        if profile['browser_logs']:
+            options.log.level = 'trace'
         
-        if not driver_path:
-            # Use webdriver-manager as fallback
-            try:
-                driver_path = GeckoDriverManager().install()
-            except Exception as e:
-                print(f"WebDriver Manager failed: {e}")
-                driver_path = None
+        # Manual proxy for HTTP and HTTPS, localhost included
+        if proxy_url:
+            host, port = proxy_url.split('//')[-1].rsplit(':', 1)
+            options.set_preference('network.proxy.type', 1)
+            for scheme in ('http', 'ssl'):
+                options.set_preference(f'network.proxy.{scheme}', host)
+                options.set_preference(f'network.proxy.{scheme}_port', int(port))
+            options.set_preference('network.proxy.no_proxies_on', '')
+            options.set_preference('network.proxy.allow_hijacking_localhost', True)
         
-        try:
-            if driver_path:
-                service = FirefoxService(driver_path)
-                driver = webdriver.Firefox(service=service, options=options)
-            else:
-                # Try without service (use system geckodriver)
-                driver = webdriver.Firefox(options=options)
-        except Exception as e:
-            print(f"Firefox failed: {e}")
-            # Last resort - try Chrome without service
-            try:
-                chrome_options = ChromeOptions()
-                if Config.HEADLESS:
-                    chrome_options.add_argument('--headless')
-                chrome_options.add_argument(f'--window-size={Config.WINDOW_SIZE}')
-                chrome_options.add_argument('--no-sandbox')
-                chrome_options.add_argument('--disable-dev-shm-usage')
-                driver = webdriver.Chrome(options=chrome_options)
-                print("Using Chrome as fallback")
-            except Exception as chrome_e:
-                print(f"All browsers failed. Chrome error: {chrome_e}")
-                raise Exception("No working browser found. Please install Chrome, Firefox, or Edge with their respective drivers.")
-        
-        # Configure timeouts
-        driver.implicitly_wait(Config.IMPLICIT_WAIT)
-        driver.set_page_load_timeout(Config.PAGE_LOAD_TIMEOUT)
-        
-        return driver
\ No newline at end of file
+        # Pooled browsers clear every origin's cookies from the privileged
+        # context, which newer Firefox only opens with this flag
+        if Config.REUSE_DRIVERS:
+            options.add_argument('--remote-allow-system-access')
+        return options
+    
+    @staticmethod
+    def _create_firefox_driver(profile, proxy_url=None):
+        """Create Firefox driver"""
+        options = WebDriverManager._firefox_options(profile, proxy_url)
+        
+        with driver_metrics.phase('firefox', 'resolve'):
+            driver_path = WebDriverManager.resolve_driver_path('firefox')
+        # Without a path Selenium falls back to the system geckodriver
+        return WebDriverManager._start_local_driver('firefox', webdriver.Firefox, driver_path, FirefoxService, options)
+    
+    @staticmethod
+    def _edge_options(profile, proxy_url=None):
+        """Build Edge options"""
+        options = EdgeOptions()
+        if Config.HEADLESS:
+            options.add_argument('--headless')
+        options.add_argument(f'--window-size={Config.WINDOW_SIZE}')
+        WebDriverManager._apply_chromium_profile(options, profile)
+        WebDriverManager._apply_chromium_proxy(options, proxy_url)
+        return options
+    
+    @staticmethod
+    def _create_edge_driver(profile, proxy_url=None):
+        """Create Edge driver"""
+        options = WebDriverManager._edge_options(profile, proxy_url)
+        
+        with driver_metrics.phase('edge', 'resolve'):
+            driver_path = WebDriverManager.resolve_driver_path('edge')
+        return WebDriverManager._start_local_driver('edge', webdriver.Edge, driver_path, EdgeService, options)
+
+
+BROWSER_LAUNCHERS = {
+    'chrome': WebDriverManager._create_chrome_driver,
+    'firefox': WebDriverManager._create_firefox_driver,
+    'edge': WebDriverManager._create_edge_driver,
+}
+
+BROWSER_OPTIONS = {
+    'chrome': WebDriverManager._chrome_options,
+    'firefox': WebDriverManager._firefox_options,
+    'edge': WebDriverManager._edge_options,
+}
@@ -3,8 +3,10 @@ Locators for Testmoz Demo Test Page
 Contains selectors for test interface, questions, answers, and results
 """
 from selenium.webdriver.common.by import By
+from framework.locator_compiler import optimize_locators
 
 
+@optimize_locators
 class TestmozDemoLocators:
     """Locators for Testmoz Demo Test Page"""
     
@@ -26,17 +28,21 @@ class TestmozDemoLocators:
     SHARE_BUTTON = (By.XPATH, "//button[contains(text(), 'Share')]")
     
     # Progress indicators
-    PROGRESS_BAR = (By.XPATH, "//div[@class*='progress-bar']")
-    PROGRESS_TEXT = (By.XPATH, "//span[@class*='progress-text']")
+    PROGRESS_BAR = (By.CSS_SELECTOR, "div[class*='progress-bar']")
+    PROGRESS_TEXT = (By.CSS_SELECTOR, "span[class*='progress-text']")
     
     # Results page
     RESULTS_PAGE_INDICATOR = (By.XPATH, "//h1[contains(text(), 'Results')]")
-    SCORE_DISPLAY = (By.XPATH, "//span[@class*='score']")
-    RESULTS_MESSAGE = (By.XPATH, "//p[@class*='message']")
-    CORRECT_ANSWERS = (By.XPATH, "//li[@class*='correct']")
-    INCORRECT_ANSWERS = (By.XPATH, "//li[@class*='incorrect']")
+    SCORE_DISPLAY = (By.CSS_SELECTOR, "span[class*='score']")
+    RESULTS_MESSAGE = (By.CSS_SELECTOR, "p[class*='message']")
+    CORRECT_ANSWERS = (By.CSS_SELECTOR, "li[class*='correct']")
+    INCORRECT_ANSWERS = (By.CSS_SELECTOR, "li[class*='incorrect']")
     RESULTS_TITLE = (By.XPATH, "//h1[contains(text(), 'Results')]")
     
+    # Error pages
+    PAGE_TITLE = (By.TAG_NAME, "title")
+    ERROR_MESSAGE = (By.CSS_SELECTOR, "[class*='error'], [class*='alert-danger']")
+    
     # Demo specific selectors (for Testmoz demo test)
     DEMO_TITLE = (By.XPATH, "//h1")
     START_BUTTON = (By.XPATH, "//button[contains(text(), 'Start')]")
@@ -1,6 +1,8 @@
 from selenium.webdriver.common.by import By
+from framework.locator_compiler import optimize_locators
 
 
+@optimize_locators
 class TestmozHomeLocators:
     """Locators for Testmoz Homepage"""
     
@@ -2,50 +2,183 @@
 Page Object for Testmoz Demo Test Page
 Handles test interaction, answering questions, and viewing results
 """
+from config.config import Config
 from framework.base_page import BasePage
+from framework.bulk_read import LOCATOR_FUNCTIONS
 from pages.locators.testmoz_demo_locators import TestmozDemoLocators
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+import random
+import re
 import time
 
 
+# Elements that are replaced or updated when the quiz moves to another question
+QUESTION_WATCH = (TestmozDemoLocators.QUESTION_COUNTER, TestmozDemoLocators.QUESTION_TEXT)
+
+# How answer_current_question picks an option
+ANSWER_STRATEGIES = ('random', 'first', 'last')
+
+# arguments: counter locator, answer option locator, strategy, random number in [0, 1)
+# Reads the question counter and options and returns the chosen option element;
+# the caller clicks it natively so WebDriver's visibility and overlap checks apply
+ANSWER_QUESTION_SCRIPT = """
+var counterLocator = arguments[0], optionLocator = arguments[1], strategy = arguments[2], r = arguments[3];
+""" + LOCATOR_FUNCTIONS + """
+var counter = find(counterLocator[0], counterLocator[1])[0];
+var counterText = counter ? (counter.innerText || '').trim() : null;
+if (!counterText || !/(\\d+)\\s+of\\s+(\\d+)/.test(counterText)) {
+    return {counter: counterText, options: [], index: -1};
+}
+var options = find(optionLocator[0], optionLocator[1]);
+var texts = options.map(function(el) { return (el.innerText || '').trim(); });
+var index = -1;
+if (options.length) {
+    if (strategy === 'first') { index = 0; }
+    else if (strategy === 'last') { index = options.length - 1; }
+    else { index = Math.min(options.length - 1, Math.floor(r * options.length)); }
+}
+return {counter: counterText, options: texts, index: index, element: index >= 0 ? options[index] : null};
+"""
+
+
+def parse_question_counter(text):
+    """{'current': 1, 'total': 5} from text like "Question 1 of 5", None otherwise"""
+    match = re.search(r'(\d+)\s+of\s+(\d+)', text or '')
+    if match:
+        return {'current': int(match.group(1)), 'total': int(match.group(2))}
+    return None
+
+
+# States detect_state tells apart, in the order they are checked
+PAGE_STATES = ('error', 'results', 'question', 'start', 'unknown')
+
+# What detect_state reads in its single script call
+STATE_LOCATORS = {
+    'title': TestmozDemoLocators.PAGE_TITLE,
+    'heading': TestmozDemoLocators.TEST_TITLE,
+    'error': TestmozDemoLocators.ERROR_MESSAGE,
+    'results': TestmozDemoLocators.RESULTS_PAGE_INDICATOR,
+    'counter': TestmozDemoLocators.QUESTION_COUNTER,
+    'start': TestmozDemoLocators.START_BUTTON,
+}
+
+# Titles and headings of server and browser error pages
+ERROR_TEXT = re.compile(r'\b(not found|404|500|502|503|server error|bad gateway|unavailable|'
+                        r'can.t be reached|unable to connect|problem loading page)\b', re.IGNORECASE)
+
+
+class DemoPageState:
+    """Where the demo test is: a name from PAGE_STATES, plus k of n on a question"""
+    def __init__(self, name, current=None, total=None, detail=None):
+        self.name = name
+        self.current = current
+        self.total = total
+        self.detail = detail
+    
+    def matches(self, names, current=None):
+        """Whether this is one of names (a name or tuple of names), on question current if given"""
+        names = (names,) if isinstance(names, str) else tuple(names)
+        return self.name in names and (current is None or self.current == current)
+    
+    def __eq__(self, other):
+        if isinstance(other, str):
+            return self.name == other
+        if isinstance(other, DemoPageState):
+            return (self.name, self.current, self.total) == (other.name, other.current, other.total)
+        return NotImplemented
+    
+    def __hash__(self):
+        return hash((self.name, self.current, self.total))
+    
+    def __repr__(self):
+        if self.name == 'question':
+            return f"DemoPageState('question', {self.current} of {self.total})"
+        return f"DemoPageState({self.name!r})"
+
+
+def classify_state(readings):
+    """DemoPageState from a bulk_read of STATE_LOCATORS"""
+    for name in ('title', 'heading'):
+        text = readings[name].text
+        if text and ERROR_TEXT.search(text):
+            return DemoPageState('error', detail=text)
+    if readings['error'].is_visible:
+        return DemoPageState('error', detail=readings['error'].text)
+    if readings['results'].is_visible:
+        return DemoPageState('results')
+    question = parse_question_counter(readings['counter'].text)
+    if question:
+        return DemoPageState('question', question['current'], question['total'])
+    if readings['start'].is_visible:
+        return DemoPageState('start')
+    return DemoPageState('unknown', detail=readings['heading'].text)
+
+
 class TestmozDemoPage(BasePage):
+    __test__ = False  # Named like a test class, so keep pytest from collecting it
     
-    def __init__(self, driver):
-        super().__init__(driver)
+    def __init__(self, driver, cache_elements=None):
+        super().__init__(driver, cache_elements=cache_elements)
     
     def open_demo_test(self):
         """Open demo test page"""
-        self.open_url("https://testmoz.com/101555")
+        self.open_url(f"{Config.BASE_URL.rstrip('/')}{Config.DEMO_TEST_PATH}")
     
     def get_test_title(self):
         """Get test title"""
         return self.get_text(TestmozDemoLocators.TEST_TITLE)
     
+    def detect_state(self):
+        """Classify the current page with one DOM read, without waiting
+        
+        Returns a DemoPageState named 'start', 'question' (with current and
+        total), 'results', 'error' or 'unknown' while the page is in between.
+        """
+        return classify_state(self.bulk_read(STATE_LOCATORS))
+    
+    def wait_for_state(self, names, current=None, timeout=None, poll_frequency=0.1):
+        """Wait until the page reaches one of names, all under a single deadline
+        
+        names is a state name or a tuple of them; current also requires that
+        question number. Raises TimeoutException with the last state seen, or
+        RuntimeError as soon as an error page shows up unless 'error' is awaited.
+        """
+        names = (names,) if isinstance(names, str) else tuple(names)
+        unknown = [name for name in names if name not in PAGE_STATES]
+        if unknown:
+            raise ValueError(f"Unknown page state: {', '.join(unknown)}")
+        timeout = self.wait_time(timeout or Config.EXPLICIT_WAIT)
+        deadline = time.perf_counter() + timeout
+        while True:
+            state = self.detect_state()
+            if state.matches(names, current):
+                return state
+            if state.name == 'error' and 'error' not in names:
+                raise RuntimeError(f"Demo test shows an error page: {state.detail}")
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                wanted = ' or '.join(names) + (f" {current}" if current is not None else '')
+                raise TimeoutException(f"Demo test did not reach {wanted} within {timeout}s, last state {state}")
+            time.sleep(min(poll_frequency, remaining))
+    
     def get_question_text(self):
         """Get current question text"""
         return self.get_text(TestmozDemoLocators.QUESTION_TEXT)
     
     def get_question_number(self):
         """Get current question number"""
-        try:
-            text = self.get_text(TestmozDemoLocators.QUESTION_COUNTER)
-            # Extract number from text like "Question 1 of 5"
-            import re
-            match = re.search(r'(\d+)\s+of\s+(\d+)', text)
-            if match:
-                return {'current': int(match.group(1)), 'total': int(match.group(2))}
-        except:
-            return None
+        return parse_question_counter(self.probe_text(TestmozDemoLocators.QUESTION_COUNTER))
     
     def get_all_answer_options(self):
         """Get all available answer options"""
-        options = self.find_elements(TestmozDemoLocators.ANSWER_OPTION)
-        return [opt.text for opt in options]
+        return self.bulk_read({'options': TestmozDemoLocators.ANSWER_OPTION})['options'].texts
     
     def select_answer(self, answer_text):
         """Select an answer by text"""
-        options = self.find_elements(TestmozDemoLocators.ANSWER_OPTION)
-        for option in options:
-            if answer_text in option.text:
+        options = self.bulk_read({'options': TestmozDemoLocators.ANSWER_OPTION}, with_elements=True)['options']
+        for text, option in zip(options.texts, options.elements):
+            if answer_text in text:
                 option.click()
                 return True
         return False
@@ -58,47 +191,46 @@ class TestmozDemoPage(BasePage):
             return True
         return False
     
+    def click_start_test(self):
+        """Click start test button; False when the click had no visible effect"""
+        return self.click_and_wait(TestmozDemoLocators.START_BUTTON, watch=(TestmozDemoLocators.START_BUTTON,))
+    
     def click_next_question(self):
-        """Click next question button"""
-        self.click_element(TestmozDemoLocators.NEXT_BUTTON)
-        time.sleep(1)  # Wait for page to load
+        """Click next question button; False when the click had no visible effect"""
+        return self.click_and_wait(TestmozDemoLocators.NEXT_BUTTON, watch=QUESTION_WATCH)
     
     def click_previous_question(self):
-        """Click previous question button"""
-        self.click_element(TestmozDemoLocators.PREV_BUTTON)
-        time.sleep(1)
+        """Click previous question button; False when the click had no visible effect"""
+        return self.click_and_wait(TestmozDemoLocators.PREV_BUTTON, watch=QUESTION_WATCH)
     
     def click_finish_test(self):
-        """Click finish test button"""
-        self.click_element(TestmozDemoLocators.FINISH_BUTTON)
-        time.sleep(2)  # Wait for results to load
+        """Click finish test button; False when the click had no visible effect"""
+        return self.click_and_wait(TestmozDemoLocators.FINISH_BUTTON, watch=QUESTION_WATCH)
     
     def click_submit_test(self):
-        """Click submit test button"""
-        self.click_element(TestmozDemoLocators.SUBMIT_BUTTON)
-        time.sleep(2)
+        """Click submit test button; False when the click had no visible effect"""
+        return self.click_and_wait(TestmozDemoLocators.SUBMIT_BUTTON, watch=QUESTION_WATCH)
     
     def is_answer_selected(self, answer_index):
         """Check if an answer is selected"""
         try:
-            options = self.find_elements(TestmozDemoLocators.ANSWER_OPTION)
-            if 0 <= answer_index < len(options):
-                return 'selected' in options[answer_index].get_attribute('class').lower()
+            options = self.bulk_read({'options': TestmozDemoLocators.ANSWER_OPTION}, attributes=['class'])['options']
+            if 0 <= answer_index < options.count:
+                return 'selected' in (options.attribute('class', answer_index) or '').lower()
         except:
             pass
         return False
     
     def get_results_score(self):
         """Get test results score"""
-        try:
-            score_text = self.get_text(TestmozDemoLocators.SCORE_DISPLAY)
-            # Extract score (e.g., "Your score: 80%")
-            import re
-            match = re.search(r'(\d+)', score_text)
-            if match:
-                return int(match.group(1))
-        except:
+        score_text = self.probe_text(TestmozDemoLocators.SCORE_DISPLAY)
+        if not score_text:
             return None
+        # Extract score (e.g., "Your score: 80%")
+        match = re.search(r'(\d+)', score_text)
+        if match:
+            return int(match.group(1))
+        return None
     
     def get_results_message(self):
         """Get results message"""
@@ -106,12 +238,11 @@ class TestmozDemoPage(BasePage):
     
     def is_on_results_page(self):
         """Check if on results page"""
-        return self.is_element_visible(TestmozDemoLocators.RESULTS_PAGE_INDICATOR)
+        return self.probe_visible(TestmozDemoLocators.RESULTS_PAGE_INDICATOR)
     
     def click_retake_test(self):
-        """Click retake test button"""
-        self.click_element(TestmozDemoLocators.RETAKE_BUTTON)
-        time.sleep(1)
+        """Click retake test button; False when the click had no visible effect"""
+        return self.click_and_wait(TestmozDemoLocators.RETAKE_BUTTON, watch=(TestmozDemoLocators.RESULTS_PAGE_INDICATOR,))
     
     def click_share_test(self):
         """Click share results button"""
@@ -119,55 +250,85 @@ class TestmozDemoPage(BasePage):
     
     def get_progress_percentage(self):
         """Get test progress percentage"""
-        try:
-            progress = self.get_attribute(TestmozDemoLocators.PROGRESS_BAR, 'style')
-            # Extract percentage from "width: 50%"
-            import re
-            match = re.search(r'(\d+)', progress)
-            if match:
-                return int(match.group(1))
-        except:
+        progress = self.probe_attribute(TestmozDemoLocators.PROGRESS_BAR, 'style')
+        if not progress:
             return 0
+        # Extract percentage from "width: 50%"
+        match = re.search(r'(\d+)', progress)
+        if match:
+            return int(match.group(1))
+        return None
     
     def is_next_button_enabled(self):
         """Check if next button is enabled"""
-        try:
-            return 'disabled' not in self.find_element(TestmozDemoLocators.NEXT_BUTTON).get_attribute('class').lower()
-        except:
-            return False
+        css_class = self.probe_attribute(TestmozDemoLocators.NEXT_BUTTON, 'class')
+        return css_class is not None and 'disabled' not in css_class.lower()
     
     def is_previous_button_enabled(self):
         """Check if previous button is enabled"""
-        try:
-            return 'disabled' not in self.find_element(TestmozDemoLocators.PREV_BUTTON).get_attribute('class').lower()
-        except:
-            return False
+        css_class = self.probe_attribute(TestmozDemoLocators.PREV_BUTTON, 'class')
+        return css_class is not None and 'disabled' not in css_class.lower()
     
-    def answer_all_questions_randomly(self):
-        """Answer all questions with random selections"""
-        import random
+    def answer_current_question(self, strategy='random', rng=None):
+        """Pick an answer for the current question with one script call and click it
+        
+        strategy is 'random' (drawn from rng, the random module by default),
+        'first' or 'last'. Returns the question number with the options and
+        the chosen answer, or None when no question is shown.
+        """
+        if strategy not in ANSWER_STRATEGIES:
+            raise ValueError(f"Unknown answer strategy: {strategy}")
+        draw = (rng or random).random()
+        # Give a question that is still rendering the same grace as probe_text
+        deadline = time.perf_counter() + Config.PROBE_TIMEOUT
         while True:
-            question_info = self.get_question_number()
-            if question_info:
-                options = self.get_all_answer_options()
-                if options:
-                    random_answer = random.choice(options)
-                    self.select_answer(random_answer)
-                
-                # Check if it's the last question
-                if question_info['current'] >= question_info['total']:
-                    break
-                
-                # Click next
-                self.click_next_question()
-            else:
+            result = self.driver.execute_script(
+                ANSWER_QUESTION_SCRIPT, list(TestmozDemoLocators.QUESTION_COUNTER),
+                list(TestmozDemoLocators.ANSWER_OPTION), strategy, draw) or {}
+            if result.get('counter') or time.perf_counter() >= deadline:
                 break
+            time.sleep(0.05)
+        
+        question = parse_question_counter(result.get('counter'))
+        if question is None:
+            return None
+        options, index = result.get('options', []), result.get('index', -1)
+        if result.get('element') is not None:
+            self.wait_for(TestmozDemoLocators.ANSWER_OPTION).until(
+                EC.element_to_be_clickable(result['element'])).click()
+            self.document_may_change()
+        question['options'] = options
+        question['answer'] = options[index] if 0 <= index < len(options) else None
+        return question
+    
+    def answer_all_questions(self, strategy='random', seed=None):
+        """Answer every question from the current one to the last
+        
+        Each question takes one script call plus the click on Next. Pass a
+        seed to make random answers repeatable. Returns the answered questions;
+        raises RuntimeError when Next leaves the page on the same question.
+        """
+        rng = random.Random(seed) if seed is not None else None
+        answered = []
+        while True:
+            question = self.answer_current_question(strategy, rng)
+            if question is None:
+                break
+            answered.append(question)
+            if question['current'] >= question['total']:
+                break
+            if not self.click_next_question():
+                raise RuntimeError(f"Next had no effect on question {question['current']}")
+        return answered
+    
+    def answer_all_questions_randomly(self, seed=None):
+        """Answer all questions with random selections"""
+        return self.answer_all_questions('random', seed)
     
     def get_question_type(self):
         """Get type of current question (multiple choice, true/false, etc)"""
-        options_count = len(self.get_all_answer_options())
-        if options_count == 2:
-            option_texts = self.get_all_answer_options()
+        option_texts = self.get_all_answer_options()
+        if len(option_texts) == 2:
             if 'true' in option_texts[0].lower() and 'false' in option_texts[1].lower():
                 return 'true_false'
         return 'multiple_choice'
@@ -1,15 +1,19 @@
+from config.config import Config
 from framework.base_page import BasePage
 from pages.locators.testmoz_home_locators import TestmozHomeLocators
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
 
 
 class TestmozHomePage(BasePage):
+    __test__ = False  # Named like a test class, so keep pytest from collecting it
     
-    def __init__(self, driver):
-        super().__init__(driver)
+    def __init__(self, driver, cache_elements=None):
+        super().__init__(driver, cache_elements=cache_elements)
     
     def open_testmoz(self):
         """Open Testmoz homepage"""
-        self.open_url("https://testmoz.com/")
+        self.open_url(f"{Config.BASE_URL.rstrip('/')}/")
     
     def get_page_title(self):
         """Get page title"""
@@ -88,6 +92,24 @@ class TestmozHomePage(BasePage):
         """Check if Employers section is visible"""
         return self.is_element_visible(TestmozHomeLocators.EMPLOYERS_SECTION)
     
+    def get_who_uses_visibility(self, timeout=None):
+        """Visibility of the Teachers/Trainers/Employers sections, checked together"""
+        snapshot = self.snapshot({
+            'teachers': TestmozHomeLocators.TEACHERS_SECTION,
+            'trainers': TestmozHomeLocators.TRAINERS_SECTION,
+            'employers': TestmozHomeLocators.EMPLOYERS_SECTION,
+        }, timeout=timeout)
+        return {name: result.visible for name, result in snapshot.items()}
+    
+    def get_main_elements_visibility(self, timeout=None):
+        """Visibility of the main heading and call-to-action buttons, checked together"""
+        snapshot = self.snapshot({
+            'main_heading': TestmozHomeLocators.MAIN_HEADING,
+            'build_test_button': TestmozHomeLocators.BUILD_A_TEST_BUTTON,
+            'try_demo_button': TestmozHomeLocators.TRY_DEMO_BUTTON,
+        }, timeout=timeout)
+        return {name: result.visible for name, result in snapshot.items()}
+    
     def get_all_navigation_links(self):
         """Get all navigation links text"""
         nav_links = [
@@ -96,4 +118,13 @@ class TestmozHomePage(BasePage):
             TestmozHomeLocators.PRICING_LINK,
             TestmozHomeLocators.FAQS_LINK
         ]
-        return [self.get_text(link) for link in nav_links if self.is_element_present(link)]
+        # The bulk read doesn't wait, so let the navigation render first; any
+        # one link will do, the others may be missing
+        try:
+            self.wait_for(nav_links[0]).until(
+                EC.any_of(*(EC.presence_of_element_located(link) for link in nav_links)))
+        except TimeoutException:
+            return []
+        # One script call for all links; missing ones are skipped
+        results = self.bulk_read(nav_links)
+        return [results[tuple(link)].text for link in nav_links if results[tuple(link)].present]
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Locator benchmark - lookup latency of the original XPath locators against
+their compiled CSS/ID form, measured on the saved pages in tests/fixtures/pages
+"""
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+from config.config import Config
+from framework.driver_reaper import OWNER_ENV
+from framework.webdriver_manager import WebDriverManager
+from framework.locator_compiler import compile_locator, locator_attributes
+from pages.locators.testmoz_home_locators import TestmozHomeLocators
+from pages.locators.testmoz_demo_locators import TestmozDemoLocators
+
+
+FIXTURES_DIR = Path(__file__).parent / "tests" / "fixtures" / "pages"
+FIXTURES = {
+    "testmoz_home.html": TestmozHomeLocators,
+    "testmoz_demo_question.html": TestmozDemoLocators,
+    "testmoz_demo_results.html": TestmozDemoLocators,
+}
+
+# Time the lookup inside the page, without the WebDriver round trip
+ENGINE_SCRIPT = """
+var by = arguments[0], value = arguments[1], rounds = arguments[2];
+function find() {
+    if (by === 'xpath') {
+        return document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength;
+    }
+    if (by === 'id') { return document.querySelectorAll('#' + CSS.escape(value)).length; }
+    return document.querySelectorAll(value).length;
+}
+var count = find(), start = performance.now();
+for (var i = 0; i < rounds; i++) { find(); }
+return [(performance.now() - start) * 1000 / rounds, count];
+"""
+
+
+def measure(driver, locator, rounds):
+    """In-page microseconds per lookup, median find_elements milliseconds and match count"""
+    engine_us, count = driver.execute_script(ENGINE_SCRIPT, locator[0], locator[1], rounds)
+    round_trips = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        driver.find_elements(*locator)
+        round_trips.append((time.perf_counter() - started) * 1000)
+    return {'engine_us': round(engine_us, 2), 'find_ms': round(statistics.median(round_trips), 3), 'count': count}
+
+
+def run_benchmark(rounds=50, scale=1):
+    """Measure every translated locator on its fixture page, before and after"""
+    driver = WebDriverManager.create_driver()
+    results = []
+    try:
+        WebDriverManager.set_implicit_wait(driver, 0)
+        for fixture, locators in FIXTURES.items():
+            driver.get((FIXTURES_DIR / fixture).resolve().as_uri())
+            if scale > 1:
+                # Repeat the body to approximate a larger page
+                driver.execute_script("document.body.innerHTML = document.body.innerHTML.repeat(arguments[0])", scale)
+            for name, locator in locator_attributes(locators).items():
+                original = locators.ORIGINAL_LOCATORS.get(name, locator)
+                compiled = compile_locator(original)
+                if compiled.status != 'translated':
+                    continue
+                compiled = compiled.locator
+                before = measure(driver, original, rounds)
+                after = measure(driver, compiled, rounds)
+                results.append({'fixture': fixture, 'locator': name, 'original': list(original),
+                                'compiled': list(compiled), 'before': before, 'after': after})
+    finally:
+        WebDriverManager.quit_driver(driver)
+    return results
+
+
+def print_results(results):
+    """Table of before/after latencies and a total"""
+    print(f"{'fixture':<28} {'locator':<18} {'xpath us':>9} {'css us':>9} {'xpath ms':>9} {'css ms':>9}")
+    for row in results:
+        before, after = row['before'], row['after']
+        print(f"{row['fixture']:<28} {row['locator']:<18} {before['engine_us']:>9} {after['engine_us']:>9} "
+              f"{before['find_ms']:>9} {after['find_ms']:>9}")
+        if before['count'] != after['count']:
+            print(f"  WARNING: {row['locator']} matched {before['count']} elements before and {after['count']} after")
+    total_before = sum(row['before']['engine_us'] for row in results)
+    total_after = sum(row['after']['engine_us'] for row in results)
+    if total_after:
+        print(f"In-page lookup time: {total_before:.1f}us -> {total_after:.1f}us ({total_before / total_after:.2f}x)")
+
+
+def main():
+    """Main function to handle command line arguments"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare original and compiled locator latency")
+    parser.add_argument("--browser", choices=["chrome", "firefox", "edge"], default=Config.BROWSER,
+                        help="Browser to use")
+    parser.add_argument("--headed", action="store_true", help="Show the browser window")
+    parser.add_argument("--rounds", type=int, default=50, help="Lookups per locator")
+    parser.add_argument("--scale", type=int, default=1, help="Repeat each page body this many times")
+    parser.add_argument("--output", default=str(Path(Config.REPORTS_DIR) / "locator_benchmark.json"),
+                        help="Where to write the JSON results")
+
+    args = parser.parse_args()
+    Config.BROWSER = args.browser
+    Config.HEADLESS = not args.headed
+    # Failures recorded by an earlier run don't apply to this one
+    WebDriverManager.get_browser_health().reset()
+    # Tag the browser this run starts so a leftover can be reaped at the end
+    os.environ[OWNER_ENV] = f"{uuid.uuid4().hex}:locator-benchmark"
+
+    try:
+        results = run_benchmark(args.rounds, args.scale)
+    finally:
+        WebDriverManager.shutdown_reaper(os.environ[OWNER_ENV])
+    print_results(results)
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    mismatches = [row for row in results if row['before']['count'] != row['after']['count']]
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
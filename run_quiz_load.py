@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Quiz load runner - concurrent headless browsers taking the demo quiz
+Runs against a local stand-in quiz server unless --base-url is given
+"""
+import json
+import os
+import sys
+import uuid
+from pathlib import Path
+from config.config import Config
+from framework.driver_reaper import OWNER_ENV
+from framework.quiz_load import QuizLoadRunner
+from framework.quiz_server import QuizServer
+from framework.webdriver_manager import WebDriverManager
+
+
+def main():
+    """Main function to handle command line arguments"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Concurrent quiz load runner")
+    parser.add_argument("--drivers", type=int, default=4, help="Concurrent browsers")
+    parser.add_argument("--sessions", type=int, default=5, help="Quizzes per browser")
+    parser.add_argument("--seed", type=int, default=0, help="Base seed for the answers")
+    parser.add_argument("--strategy", choices=["random", "first", "last"], default="random",
+                        help="How answers are picked")
+    parser.add_argument("--browser", choices=["chrome", "firefox", "edge"], default=Config.BROWSER,
+                        help="Browser to use")
+    parser.add_argument("--base-url", help="Quiz site to load instead of the local stand-in server")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds the local server waits before each response")
+    parser.add_argument("--output", default=str(Path(Config.REPORTS_DIR) / "quiz_load.json"),
+                        help="Where to write the JSON summary")
+
+    args = parser.parse_args()
+    Config.BROWSER = args.browser
+    Config.HEADLESS = True
+    # Failures recorded by an earlier run don't apply to this one
+    WebDriverManager.get_browser_health().reset()
+    # Tag the browsers this run starts so leftovers can be reaped at the end
+    os.environ[OWNER_ENV] = f"{uuid.uuid4().hex}:quiz-load"
+
+    server = None
+    if args.base_url:
+        Config.BASE_URL = args.base_url
+    else:
+        server = QuizServer(latency=args.latency)
+        Config.BASE_URL = server.start()
+        print(f"Local quiz server at {Config.BASE_URL}")
+
+    try:
+        runner = QuizLoadRunner(WebDriverManager.create_driver, drivers=args.drivers, sessions=args.sessions,
+                                seed=args.seed, strategy=args.strategy, quitter=WebDriverManager.quit_driver)
+        summary = runner.run()
+    finally:
+        WebDriverManager.shutdown_reaper(os.environ[OWNER_ENV])
+        if server is not None:
+            server.stop()
+            print(f"Quiz server stats: {server.stats}")
+
+    for line in QuizLoadRunner.format_summary(summary):
+        print(line)
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+    print(f"Summary written to {args.output}")
+    sys.exit(1 if summary['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()
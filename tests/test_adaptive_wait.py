@@ -0,0 +1,126 @@
+"""
+Unit Tests for Adaptive Wait
+Tests learned polling schedules and the persisted latency stats
+"""
+import pytest
+import time
+from unittest.mock import Mock, patch
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from framework.adaptive_wait import (
+    AdaptiveWait, LocatorLatencyStats, MAX_INTERVAL, MAX_SAMPLES, MIN_INTERVAL, locator_key
+)
+from framework.base_page import BasePage
+from pages.locators.testmoz_demo_locators import TestmozDemoLocators
+from config.config import Config
+
+
+NEXT = TestmozDemoLocators.NEXT_BUTTON
+
+
+@pytest.fixture
+def stats(tmp_path):
+    """Stats backed by a temporary file"""
+    return LocatorLatencyStats(str(tmp_path / "wait_stats.json"))
+
+
+def appears_after(seconds):
+    """Condition that becomes true after a delay"""
+    started = time.perf_counter()
+
+    def condition(driver):
+        if time.perf_counter() - started < seconds:
+            raise NoSuchElementException("not yet")
+        return True
+    return condition
+
+
+def default_interval(elapsed):
+    """Interval for a locator without samples"""
+    return LocatorLatencyStats("unused.json").next_interval("id=unknown", elapsed)
+
+
+class TestLocatorLatencyStats:
+    """Unit tests for LocatorLatencyStats class"""
+
+    def test_key(self):
+        """Test keys combine strategy and value"""
+        assert locator_key((By.ID, "next")) == "id=next"
+
+    def test_default_schedule(self):
+        """Test brisk polling first, then backoff, without samples"""
+        assert default_interval(0.2) == 0.1
+        assert default_interval(2.0) == 0.5
+        assert default_interval(30.0) == MAX_INTERVAL
+
+    def test_learned_schedule(self, stats):
+        """Test skip-ahead, tight polling and backoff around the learned time"""
+        for seconds in [1.0, 1.0, 1.0, 1.2, 2.0]:
+            stats.record("id=next", seconds)
+
+        assert stats.expected("id=next") == (1.0, 2.0)
+        assert stats.next_interval("id=next", 0) == pytest.approx(0.7)
+        assert stats.next_interval("id=next", 1.5) == MIN_INTERVAL
+        assert stats.next_interval("id=next", 3.0) == 0.5
+
+    def test_persisted_between_runs(self, stats):
+        """Test samples from several processes are merged and reloaded"""
+        other = LocatorLatencyStats(stats.path)
+        stats.record("id=next", 0.4)
+        other.record("id=next", 0.6)
+        stats.save()
+        other.save()
+
+        reloaded = LocatorLatencyStats(stats.path)
+        assert sorted(reloaded._read()["id=next"]) == [0.4, 0.6]
+        reloaded.record("id=next", 0.5)
+        assert reloaded.expected("id=next") == (0.5, 0.6)
+
+    def test_samples_are_capped(self, stats):
+        """Test only the newest samples are kept"""
+        for index in range(MAX_SAMPLES + 10):
+            stats.record("id=next", float(index))
+        stats.save()
+        assert len(LocatorLatencyStats(stats.path)._read()["id=next"]) == MAX_SAMPLES
+
+
+class TestAdaptiveWait:
+    """Unit tests for AdaptiveWait class"""
+
+    def test_success_is_recorded(self, stats):
+        """Test the appearance time is learned"""
+        AdaptiveWait(Mock(), 2, NEXT, stats).until(appears_after(0.1))
+        assert stats.samples[locator_key(NEXT)][0] >= 0.1
+
+    def test_timeout_is_not_recorded(self, stats):
+        """Test missing elements don't skew the learned times"""
+        with pytest.raises(TimeoutException):
+            AdaptiveWait(Mock(), 0.3, NEXT, stats).until(appears_after(5), "never")
+        assert locator_key(NEXT) not in stats.samples
+
+    def test_learned_schedule_saves_round_trips(self, stats):
+        """Test fewer polls than a fixed 0.1s interval once the locator is known"""
+        for _ in range(5):
+            stats.record(locator_key(NEXT), 0.6)
+
+        learned = AdaptiveWait(Mock(), 3, NEXT, stats)
+        learned.until(appears_after(0.6))
+
+        fixed_polls = []
+        condition = appears_after(0.6)
+        WebDriverWait(Mock(), 3, poll_frequency=0.1).until(lambda driver: fixed_polls.append(1) or condition(driver))
+
+        assert learned.polls < len(fixed_polls)
+
+    def test_base_page_uses_adaptive_wait(self, stats):
+        """Test BasePage waits go through the learned schedule"""
+        driver = Mock()
+        with patch('framework.base_page.locator_latency', stats):
+            BasePage(driver).find_element(NEXT)
+        assert locator_key(NEXT) in stats.samples
+
+    def test_adaptive_waits_can_be_disabled(self):
+        """Test ADAPTIVE_WAITS=false falls back to WebDriverWait"""
+        with patch.object(Config, 'ADAPTIVE_WAITS', False):
+            assert isinstance(BasePage(Mock()).wait_for(NEXT), WebDriverWait)
@@ -0,0 +1,750 @@
+"""
+Unit Tests for BasePage
+Runs page helpers against mocked drivers, no browser needed
+"""
+import pytest
+import time
+from unittest.mock import Mock, patch
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.remote.webelement import WebElement
+from framework.base_page import BasePage
+from framework.adaptive_wait import LocatorLatencyStats
+from framework.element_cache import ElementCache
+from framework.webdriver_manager import WebDriverManager
+from config.config import Config
+
+
+COUNTER = (By.ID, "counter")
+
+
+class FakeElement:
+    """Element whose text or staleness can be changed by a test"""
+    def __init__(self, text=''):
+        self._text = text
+        self.stale = False
+
+    @property
+    def text(self):
+        if self.stale:
+            raise StaleElementReferenceException("stale")
+        return self._text
+
+    def is_enabled(self):
+        return True
+
+    def is_displayed(self):
+        return True
+
+
+def make_driver(element=None, url="https://testmoz.com/1"):
+    """Driver mock with one findable element and a quiet DOM"""
+    driver = Mock()
+    driver.current_url = url
+    driver.find_elements.return_value = [element] if element else []
+    driver.find_element.return_value = element
+    driver.execute_script.return_value = 1000
+    return driver
+
+
+@pytest.fixture(autouse=True)
+def short_waits(tmp_path):
+    """Keep failing waits short and mocked latencies out of the stats file"""
+    with patch.object(Config, 'EXPLICIT_WAIT', 1), patch.object(Config, 'PROBE_TIMEOUT', 0.1), \
+            patch('framework.base_page.locator_latency', LocatorLatencyStats(str(tmp_path / "wait_stats.json"))):
+        yield
+
+
+class TestConditionWaits:
+    """Unit tests for condition-based waits"""
+
+    def test_text_change(self):
+        """Test waiting for a counter to change"""
+        element = FakeElement("Question 1 of 5")
+        page = BasePage(make_driver(element))
+
+        def advance():
+            element._text = "Question 2 of 5"
+
+        assert page.wait_for_change(advance, watch=[COUNTER])
+
+    def test_stale_element(self):
+        """Test a replaced element counts as a change"""
+        element = FakeElement("Question 1 of 5")
+        page = BasePage(make_driver(element))
+
+        assert page.wait_for_change(lambda: setattr(element, 'stale', True), watch=[COUNTER])
+
+    def test_url_change(self):
+        """Test navigation counts as a change"""
+        element = FakeElement("Question 5 of 5")
+        driver = make_driver(element)
+        page = BasePage(driver)
+
+        assert page.wait_for_change(lambda: setattr(driver, 'current_url', "https://testmoz.com/results"),
+                                    watch=[COUNTER])
+
+    def test_no_change_times_out(self):
+        """Test an action without effect returns False after the timeout"""
+        page = BasePage(make_driver(FakeElement("Question 1 of 5")))
+
+        started = time.perf_counter()
+        assert not page.wait_for_change(lambda: None, watch=[COUNTER], timeout=0.3)
+        assert time.perf_counter() - started < 1
+
+    def test_no_change_is_logged(self, capsys):
+        """Test a click without effect says so instead of passing silently"""
+        page = BasePage(make_driver(FakeElement("Question 1 of 5")))
+
+        assert not page.wait_for_change(lambda: None, watch=[COUNTER], timeout=0.2)
+        assert "No visible change" in capsys.readouterr().out
+
+    def test_busy_dom_after_change_is_not_a_failure(self):
+        """Test a page that keeps mutating after the change only costs SETTLE_TIMEOUT"""
+        element = FakeElement("Question 1 of 5")
+        driver = make_driver(element)
+        driver.execute_script.return_value = 0
+        page = BasePage(driver)
+
+        started = time.perf_counter()
+        with patch.object(Config, 'SETTLE_TIMEOUT', 0.2):
+            assert page.wait_for_change(lambda: setattr(element, '_text', "Question 2 of 5"), watch=[COUNTER])
+        assert time.perf_counter() - started < 0.8
+
+    def test_change_detected_without_fixed_delay(self):
+        """Test the wait returns as soon as the change is visible"""
+        element = FakeElement("Question 1 of 5")
+        page = BasePage(make_driver(element))
+
+        started = time.perf_counter()
+        page.wait_for_change(lambda: setattr(element, '_text', "Question 2 of 5"), watch=[COUNTER])
+        assert time.perf_counter() - started < 0.5
+
+    def test_dom_stable_waits_for_quiet_period(self):
+        """Test polling continues while the DOM keeps mutating"""
+        driver = make_driver()
+        driver.execute_script.side_effect = [0, 50, 120, 400]
+        page = BasePage(driver)
+
+        page.wait_for_dom_stable(quiet_period=0.3)
+        assert driver.execute_script.call_count == 4
+
+    def test_dom_never_stable(self):
+        """Test a constantly mutating page times out"""
+        driver = make_driver()
+        driver.execute_script.return_value = 0
+        with pytest.raises(TimeoutException):
+            BasePage(driver).wait_for_dom_stable(timeout=0.3)
+
+    def test_click_and_wait(self):
+        """Test the click happens between the snapshot and the wait"""
+        element = FakeElement("Question 1 of 5")
+        button = Mock()
+        button.is_displayed.return_value = True
+        button.click.side_effect = lambda: setattr(element, '_text', "Question 2 of 5")
+        driver = make_driver(element)
+        driver.find_element.side_effect = lambda *locator: button if locator[1] == 'next' else element
+        page = BasePage(driver)
+
+        assert page.click_and_wait((By.ID, 'next'), watch=[COUNTER])
+        button.click.assert_called_once()
+
+
+class TestProbes:
+    """Unit tests for fast optional-element checks"""
+
+    def test_absent_element_returns_quickly(self):
+        """Test a missing element is reported within the probe budget"""
+        page = BasePage(make_driver())
+
+        started = time.perf_counter()
+        assert page.probe(COUNTER, budget=0.2) == []
+        assert time.perf_counter() - started < 0.5
+
+    def test_implicit_wait_is_restored(self):
+        """Test the implicit wait is zero while probing and restored after"""
+        driver = make_driver(FakeElement("x"))
+        with patch.object(Config, 'IMPLICIT_WAIT', 10):
+            BasePage(driver).probe(COUNTER)
+
+        assert [c.args[0] for c in driver.implicitly_wait.call_args_list] == [0, 10]
+
+    def test_probe_restores_tracked_wait_without_reading_timeouts(self):
+        """Test the wait recorded at configure time is restored with no GET timeouts round trip"""
+        driver = make_driver(FakeElement("x"))
+        type(driver).timeouts = property(Mock(side_effect=AssertionError("timeouts read")))
+        WebDriverManager.set_implicit_wait(driver, 3)
+
+        BasePage(driver).probe(COUNTER)
+
+        assert [c.args[0] for c in driver.implicitly_wait.call_args_list] == [3, 0, 3]
+
+    def test_late_element_is_found(self):
+        """Test polling continues until the budget runs out"""
+        element = FakeElement("Question 1 of 5")
+        driver = make_driver()
+        driver.find_elements.side_effect = [[], [], [element]]
+
+        assert BasePage(driver).probe_text(COUNTER, budget=1) == "Question 1 of 5"
+
+    def test_probe_helpers(self):
+        """Test present/visible/text/attribute helpers"""
+        element = Mock()
+        element.text = "Next"
+        element.is_displayed.return_value = True
+        element.get_attribute.return_value = "btn"
+        page = BasePage(make_driver(element))
+
+        assert page.probe_present(COUNTER)
+        assert page.probe_visible(COUNTER)
+        assert page.probe_text(COUNTER) == "Next"
+        assert page.probe_attribute(COUNTER, 'class') == "btn"
+
+    def test_invalid_locator_is_absent(self):
+        """Test a selector error is treated like a missing element"""
+        driver = make_driver()
+        driver.find_elements.side_effect = Exception("invalid selector")
+        page = BasePage(driver)
+
+        assert page.probe_text(COUNTER) is None
+        assert not page.probe_present(COUNTER)
+
+
+class TestElementCache:
+    """Unit tests for the opt-in element cache"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_totals(self):
+        """Keep cache counters out of the run summary"""
+        with patch.dict(ElementCache.totals):
+            yield
+
+    def test_disabled_by_default(self):
+        """Test every read looks the element up again without opting in"""
+        driver = make_driver(FakeElement("Title"))
+        page = BasePage(driver)
+
+        page.get_text(COUNTER)
+        page.get_text(COUNTER)
+
+        assert page.element_cache is None
+        assert driver.find_element.call_count == 2
+
+    def test_repeated_reads_hit_cache(self):
+        """Test visibility check, text and attribute share one lookup"""
+        element = Mock()
+        element.text = "Title"
+        element.is_displayed.return_value = True
+        driver = make_driver(element)
+        page = BasePage(driver, cache_elements=True)
+
+        page.get_text(COUNTER)
+        assert page.is_element_visible(COUNTER)
+        page.get_attribute(COUNTER, 'class')
+
+        assert driver.find_element.call_count == 1
+        assert page.element_cache.stats['hits'] == 2
+        assert page.element_cache.hit_rate() == pytest.approx(2 / 3)
+
+    def test_stale_element_is_looked_up_again(self):
+        """Test a stale cached element is replaced transparently"""
+        old, new = FakeElement("Question 1"), FakeElement("Question 2")
+        driver = make_driver(old)
+        page = BasePage(driver, cache_elements=True)
+        page.get_text(COUNTER)
+
+        old.stale = True
+        driver.find_element.return_value = new
+
+        assert page.get_text(COUNTER) == "Question 2"
+        assert page.element_cache.stats['stale'] == 1
+
+    @pytest.mark.parametrize("navigate", [
+        lambda page: page.open_url("https://testmoz.com/"),
+        lambda page: page.refresh_page(),
+        lambda page: page.go_back(),
+        lambda page: page.go_forward(),
+    ])
+    def test_navigation_invalidates(self, navigate):
+        """Test navigating drops cached elements"""
+        driver = make_driver(FakeElement("Title"))
+        page = BasePage(driver, cache_elements=True)
+        page.get_text(COUNTER)
+
+        navigate(page)
+        page.get_text(COUNTER)
+
+        assert driver.find_element.call_count == 2
+
+    def test_removed_element_is_not_present(self):
+        """Test presence of a cached element is checked against the page"""
+        element = FakeElement("Title")
+        driver = make_driver(element)
+        page = BasePage(driver, cache_elements=True)
+        page.get_text(COUNTER)
+
+        element.is_enabled = Mock(side_effect=StaleElementReferenceException("gone"))
+        driver.find_element.side_effect = Exception("no such element")
+
+        assert not page.is_element_present(COUNTER)
+
+    @pytest.mark.parametrize("new_document, lookups", [(True, 2), (False, 1)])
+    def test_click_checks_document(self, new_document, lookups):
+        """Test a click that loaded another document drops the cache, one that didn't keeps it"""
+        element = Mock(spec=WebElement)
+        element.text = "Title"
+        element.is_displayed.return_value = True
+        element.is_enabled.return_value = True
+        driver = make_driver(element)
+        driver.execute_script.return_value = "doc-1"
+        page = BasePage(driver, cache_elements=True)
+        page.get_text(COUNTER)
+
+        page.click_element(COUNTER)
+        if new_document:
+            driver.execute_script.return_value = "doc-2"
+        page.get_text(COUNTER)
+
+        assert driver.find_element.call_count == lookups
+
+    def test_frame_switch_refinds_stale_element(self):
+        """Test direct element uses go through the stale retry too"""
+        old, new = FakeElement("frame"), FakeElement("frame")
+        driver = make_driver(old)
+        page = BasePage(driver, cache_elements=True)
+        page.get_text(COUNTER)
+        driver.find_element.return_value = new
+
+        def switch(frame):
+            if frame is old:
+                raise StaleElementReferenceException("stale")
+        driver.switch_to.frame.side_effect = switch
+
+        page.switch_to_frame(COUNTER)
+        driver.switch_to.frame.assert_called_with(new)
+
+    def test_cached_presence_refind_skips_implicit_wait(self):
+        """Test the re-find after a stale cached element runs without the implicit wait"""
+        element = FakeElement("Title")
+        driver = make_driver(element)
+        WebDriverManager.set_implicit_wait(driver, 10)
+        page = BasePage(driver, cache_elements=True)
+        page.get_text(COUNTER)
+
+        element.stale = True
+        element.is_enabled = Mock(side_effect=StaleElementReferenceException("gone"))
+        waits = []
+        driver.implicitly_wait.side_effect = waits.append
+        driver.find_element.side_effect = lambda *locator: waits.append('find') or FakeElement("Title")
+
+        assert page.is_element_present(COUNTER)
+        assert waits == [0, 'find', 10]
+
+    def test_totals(self):
+        """Test counters are summed over page objects"""
+        for _ in range(2):
+            page = BasePage(make_driver(FakeElement("Title")), cache_elements=True)
+            page.get_text(COUNTER)
+            page.get_text(COUNTER)
+
+        assert ElementCache.totals['hits'] == 2
+        assert ElementCache.total_hit_rate() == 0.5
+
+
+def bulk_data(texts, visible=None, attributes=None, elements=None):
+    """execute_script result for one locator"""
+    return {'count': len(texts), 'texts': texts, 'visible': visible or [True] * len(texts),
+            'attributes': attributes or [{} for _ in texts], 'elements': elements or [], 'error': None}
+
+
+class TestBulkRead:
+    """Unit tests for single-call bulk reads"""
+
+    def test_one_script_call(self):
+        """Test all locators are resolved in a single execute_script"""
+        driver = make_driver()
+        driver.execute_script.return_value = [bulk_data(["Home"]), bulk_data([])]
+        page = BasePage(driver)
+
+        results = page.bulk_read({'home': (By.LINK_TEXT, "Home"), 'faq': (By.XPATH, "//a[@id='faq']")},
+                                 attributes=['href'])
+
+        driver.execute_script.assert_called_once()
+        _, queries, attributes, with_elements = driver.execute_script.call_args.args
+        assert queries == [['link text', 'Home'], ['xpath', "//a[@id='faq']"]]
+        assert attributes == ['href']
+        assert not with_elements
+        assert results['home'].text == "Home"
+        assert not results['faq'].present
+        driver.find_element.assert_not_called()
+
+    def test_result_accessors(self):
+        """Test text, visibility and attribute helpers"""
+        driver = make_driver()
+        driver.execute_script.return_value = [
+            bulk_data(["A", "B"], visible=[False, True], attributes=[{'class': 'x'}, {'class': 'selected'}])]
+
+        result = BasePage(driver).bulk_read([COUNTER])[COUNTER]
+
+        assert result.count == 2
+        assert result.is_visible
+        assert result.attribute('class', 1) == 'selected'
+        assert result.attribute('class', 5) is None
+
+    def test_selector_error_is_reported(self):
+        """Test a broken locator doesn't fail the other reads"""
+        driver = make_driver()
+        driver.execute_script.return_value = [
+            {'count': 0, 'texts': [], 'visible': [], 'attributes': [], 'elements': [], 'error': "bad xpath"},
+            bulk_data(["ok"])]
+
+        results = BasePage(driver).bulk_read([(By.XPATH, "//div[@class*='x']"), COUNTER])
+
+        assert results[(By.XPATH, "//div[@class*='x']")].error == "bad xpath"
+        assert results[COUNTER].text == "ok"
+
+
+class TestBulkPageObjects:
+    """Tests for page objects reading lists in one call"""
+
+    def test_navigation_links(self):
+        """Test navigation links are read with one call and missing ones skipped"""
+        from pages.testmoz_home_page import TestmozHomePage
+        driver = make_driver(Mock())
+        driver.execute_script.return_value = [bulk_data(["Home"]), bulk_data(["Features"]),
+                                              bulk_data([]), bulk_data(["FAQs"])]
+
+        assert TestmozHomePage(driver).get_all_navigation_links() == ["Home", "Features", "FAQs"]
+        assert driver.execute_script.call_count == 1
+
+    def test_navigation_links_wait_for_navigation(self):
+        """Test the bulk read only runs once a navigation link is present"""
+        from pages.testmoz_home_page import TestmozHomePage
+        driver = make_driver()
+        driver.find_element.side_effect = [NoSuchElementException()] * 4 + [Mock()]
+        driver.execute_script.return_value = [bulk_data(["Home"]), bulk_data([]), bulk_data([]), bulk_data([])]
+
+        assert TestmozHomePage(driver).get_all_navigation_links() == ["Home"]
+        assert driver.find_element.call_count == 5
+        assert driver.execute_script.call_count == 1
+
+    def test_navigation_without_home_link(self):
+        """Test a missing Home link is skipped instead of waited out"""
+        from pages.testmoz_home_page import TestmozHomePage
+        from pages.locators.testmoz_home_locators import TestmozHomeLocators
+        driver = make_driver()
+        home = tuple(TestmozHomeLocators.HOME_LINK)
+
+        def find_element(*locator):
+            if locator == home:
+                raise NoSuchElementException()
+            return Mock()
+        driver.find_element.side_effect = find_element
+        driver.execute_script.return_value = [bulk_data([]), bulk_data(["Features"]), bulk_data(["Pricing"]),
+                                              bulk_data(["FAQs"])]
+
+        started = time.perf_counter()
+        assert TestmozHomePage(driver).get_all_navigation_links() == ["Features", "Pricing", "FAQs"]
+        assert time.perf_counter() - started < 0.4
+
+    def test_page_without_navigation(self):
+        """Test a page with no navigation links returns an empty list"""
+        from pages.testmoz_home_page import TestmozHomePage
+        driver = make_driver()
+        driver.find_element.side_effect = NoSuchElementException()
+
+        assert TestmozHomePage(driver).get_all_navigation_links() == []
+        driver.execute_script.assert_not_called()
+
+    def test_answer_options_and_selection(self):
+        """Test answers are read and selected without per-label text reads"""
+        from pages.testmoz_demo_page import TestmozDemoPage
+        labels = [Mock(), Mock()]
+        driver = make_driver()
+        driver.execute_script.return_value = [bulk_data(["Paris", "Rome"], elements=labels)]
+        page = TestmozDemoPage(driver)
+
+        assert page.get_all_answer_options() == ["Paris", "Rome"]
+        assert page.select_answer("Rome")
+        labels[1].click.assert_called_once()
+        assert driver.execute_script.call_count == 2
+
+    def test_answer_selected(self):
+        """Test selection state comes from the bulk class attribute"""
+        from pages.testmoz_demo_page import TestmozDemoPage
+        driver = make_driver()
+        driver.execute_script.return_value = [bulk_data(["True", "False"],
+                                                        attributes=[{'class': 'Selected'}, {'class': ''}])]
+        page = TestmozDemoPage(driver)
+
+        assert page.is_answer_selected(0)
+        assert not page.is_answer_selected(1)
+        assert page.get_question_type() == 'true_false'
+
+
+class FakeQuiz:
+    """Stands in for the answer script on a quiz of several questions"""
+    def __init__(self, questions=3, options=("A", "B", "C", "D")):
+        self.questions = questions
+        self.options = list(options)
+        self.current = 1
+        self.draws = []
+        self.elements = [Mock(spec=WebElement, **{'is_displayed.return_value': True, 'is_enabled.return_value': True})
+                         for _ in self.options]
+
+    def execute_script(self, script, counter, option, strategy, draw):
+        self.draws.append(draw)
+        index = {'first': 0, 'last': len(self.options) - 1}.get(strategy, int(draw * len(self.options)))
+        return {'counter': f"Question {self.current} of {self.questions}", 'options': self.options, 'index': index,
+                'element': self.elements[index]}
+
+    def next_question(self):
+        self.current += 1
+        return True
+
+
+class TestQuizAnswering:
+    """Unit tests for one-call-per-question quiz answering"""
+
+    def make_page(self, quiz):
+        from pages.testmoz_demo_page import TestmozDemoPage
+        driver = make_driver()
+        driver.execute_script.side_effect = quiz.execute_script
+        page = TestmozDemoPage(driver)
+        page.click_next_question = Mock(side_effect=quiz.next_question)
+        return page, driver
+
+    def test_one_script_call_per_question(self):
+        """Test each question is read and answered with a single call"""
+        quiz = FakeQuiz(questions=3)
+        page, driver = self.make_page(quiz)
+
+        answered = page.answer_all_questions_randomly()
+
+        assert [question['current'] for question in answered] == [1, 2, 3]
+        assert driver.execute_script.call_count == 3
+        assert page.click_next_question.call_count == 2
+        driver.find_element.assert_not_called()
+        driver.find_elements.assert_not_called()
+
+    def test_chosen_option_is_clicked_natively(self):
+        """Test the script only picks the option and WebDriver clicks it"""
+        from pages.testmoz_demo_page import ANSWER_QUESTION_SCRIPT
+        quiz = FakeQuiz(questions=1)
+        page, _ = self.make_page(quiz)
+
+        page.answer_current_question('last')
+
+        assert '.click()' not in ANSWER_QUESTION_SCRIPT
+        quiz.elements[-1].click.assert_called_once()
+        assert not any(element.click.called for element in quiz.elements[:-1])
+
+    def test_stuck_next_stops_answering(self):
+        """Test a Next click without effect raises instead of answering the same question again"""
+        quiz = FakeQuiz(questions=3)
+        page, driver = self.make_page(quiz)
+        page.click_next_question = Mock(return_value=False)
+
+        with pytest.raises(RuntimeError, match="Next had no effect on question 1"):
+            page.answer_all_questions('first')
+        assert driver.execute_script.call_count == 1
+        assert page.click_next_question.call_count == 1
+
+    def test_seeded_answers_repeat(self):
+        """Test the same seed picks the same answers"""
+        runs = []
+        for _ in range(2):
+            page, _ = self.make_page(FakeQuiz(questions=5))
+            runs.append([question['answer'] for question in page.answer_all_questions_randomly(seed=42)])
+
+        assert runs[0] == runs[1]
+        assert all(answer in ("A", "B", "C", "D") for answer in runs[0])
+
+    @pytest.mark.parametrize("strategy,answer", [('first', "A"), ('last', "D")])
+    def test_fixed_strategies(self, strategy, answer):
+        """Test first/last strategies"""
+        page, _ = self.make_page(FakeQuiz(questions=2))
+        assert [question['answer'] for question in page.answer_all_questions(strategy)] == [answer, answer]
+
+    def test_unknown_strategy(self):
+        """Test an unknown strategy is rejected before touching the page"""
+        page, driver = self.make_page(FakeQuiz())
+        with pytest.raises(ValueError):
+            page.answer_current_question('best')
+        driver.execute_script.assert_not_called()
+
+    def test_no_question_shown(self):
+        """Test nothing is answered when there is no question counter"""
+        from pages.testmoz_demo_page import TestmozDemoPage
+        driver = make_driver()
+        driver.execute_script.return_value = {'counter': None, 'options': [], 'index': -1}
+
+        assert TestmozDemoPage(driver).answer_all_questions_randomly() == []
+
+    def test_script_parses_like_question_number(self):
+        """Test the script's counter check matches get_question_number"""
+        from pages.testmoz_demo_page import ANSWER_QUESTION_SCRIPT, parse_question_counter
+        assert r"/(\d+)\s+of\s+(\d+)/" in ANSWER_QUESTION_SCRIPT
+        assert parse_question_counter("Question 2 of 5") == {'current': 2, 'total': 5}
+        assert parse_question_counter("Results") is None
+
+
+def page_reading(title="Demo Test - Testmoz", heading="Testmoz Demo", counter=None, start=False,
+                 results=False, error=None):
+    """Bulk-read data for the demo page state locators"""
+    def found(text=None, visible=True):
+        if text is None and not visible:
+            return {'count': 0, 'texts': [], 'visible': []}
+        return {'count': 1, 'texts': [text or ''], 'visible': [visible]}
+    return [found(title, visible=False), found(heading), found(error, visible=error is not None),
+            found("Results", visible=results), found(counter, visible=counter is not None),
+            found("Start Test", visible=start)]
+
+
+class TestDemoPageState:
+    """Unit tests for detecting where the demo test is"""
+
+    def make_page(self, *readings):
+        from pages.testmoz_demo_page import TestmozDemoPage
+        driver = make_driver()
+        driver.execute_script.side_effect = list(readings)
+        return TestmozDemoPage(driver), driver
+
+    @pytest.mark.parametrize("reading,expected", [
+        (page_reading(start=True), 'start'),
+        (page_reading(counter="Question 2 of 5"), 'question'),
+        (page_reading(heading="Results", results=True), 'results'),
+        (page_reading(title="404 Not Found", heading="Page not found"), 'error'),
+        (page_reading(error="Something went wrong"), 'error'),
+        (page_reading(), 'unknown'),
+    ])
+    def test_detect_state(self, reading, expected):
+        """Test each page is classified from one script call"""
+        page, driver = self.make_page(reading)
+        assert page.detect_state() == expected
+        assert driver.execute_script.call_count == 1
+        driver.find_elements.assert_not_called()
+
+    def test_question_number(self):
+        """Test a question state carries k of n"""
+        page, _ = self.make_page(page_reading(counter="Question 2 of 5"))
+        state = page.detect_state()
+        assert (state.current, state.total) == (2, 5)
+        assert state.matches(('question', 'results'), current=2)
+        assert not state.matches('question', current=3)
+
+    def test_wait_for_transition(self):
+        """Test waiting polls until the named state shows up"""
+        page, driver = self.make_page(page_reading(counter="Question 1 of 5"), page_reading(),
+                                      page_reading(counter="Question 2 of 5"))
+        state = page.wait_for_state('question', current=2, timeout=1, poll_frequency=0.01)
+        assert state.current == 2
+        assert driver.execute_script.call_count == 3
+
+    def test_wait_single_deadline(self):
+        """Test a state that never comes fails once, at the deadline"""
+        from pages.testmoz_demo_page import TestmozDemoPage
+        driver = make_driver()
+        driver.execute_script.return_value = page_reading(counter="Question 5 of 5")
+        started = time.perf_counter()
+        with pytest.raises(TimeoutException, match="results"):
+            TestmozDemoPage(driver).wait_for_state('results', timeout=0.2, poll_frequency=0.05)
+        assert time.perf_counter() - started < 0.5
+
+    def test_error_page_fails_fast(self):
+        """Test an error page ends the wait instead of running out the timeout"""
+        page, _ = self.make_page(page_reading(title="502 Bad Gateway"))
+        with pytest.raises(RuntimeError, match="502 Bad Gateway"):
+            page.wait_for_state('results', timeout=30)
+
+    def test_wait_for_error(self):
+        """Test the error state can be awaited like any other"""
+        page, _ = self.make_page(page_reading(title="404 Not Found"))
+        assert page.wait_for_state('error', timeout=1) == 'error'
+
+    def test_unknown_state_name(self):
+        """Test a misspelled state is rejected before touching the page"""
+        page, driver = self.make_page()
+        with pytest.raises(ValueError):
+            page.wait_for_state('finished')
+        driver.execute_script.assert_not_called()
+
+
+class TestSnapshot:
+    """Unit tests for multi-locator snapshots"""
+
+    HEADING = (By.TAG_NAME, "h1")
+    BUTTON = (By.ID, "build")
+
+    def test_all_settled_in_one_round(self):
+        """Test visible elements settle with a single script call"""
+        driver = make_driver()
+        driver.execute_script.return_value = [bulk_data(["Title"]), bulk_data(["Build"])]
+
+        results = BasePage(driver).snapshot({'heading': self.HEADING, 'button': self.BUTTON})
+
+        assert driver.execute_script.call_count == 1
+        assert results['heading'].settled and results['heading'].text == "Title"
+        assert all(results.values())
+
+    def test_only_unsettled_are_polled_again(self):
+        """Test later rounds read just the locators still pending"""
+        driver = make_driver()
+        driver.execute_script.side_effect = [
+            [bulk_data(["Title"]), bulk_data([])],
+            [bulk_data([])],
+            [bulk_data(["Build"])],
+        ]
+
+        results = BasePage(driver).snapshot({'heading': self.HEADING, 'button': self.BUTTON})
+
+        assert [len(c.args[1]) for c in driver.execute_script.call_args_list] == [2, 1, 1]
+        assert results['button'].settled and results['button'].elapsed > results['heading'].elapsed
+
+    def test_shared_deadline(self):
+        """Test missing elements cost one wait budget in total, not one each"""
+        driver = make_driver()
+        driver.execute_script.side_effect = lambda script, queries, *args: [bulk_data([]) for _ in queries]
+        locators = {f"missing{i}": (By.ID, f"missing{i}") for i in range(5)}
+
+        started = time.perf_counter()
+        results = BasePage(driver).snapshot(locators, timeout=0.3)
+
+        assert time.perf_counter() - started < 0.6
+        assert not any(results.values())
+        assert list(results) == list(locators)
+
+    def test_expectations(self):
+        """Test per-locator expectations such as absent or hidden"""
+        driver = make_driver()
+        driver.execute_script.return_value = [bulk_data([]), bulk_data(["Spinner"], visible=[False])]
+
+        results = BasePage(driver).snapshot({
+            'error': (self.HEADING, 'absent'),
+            'spinner': (self.BUTTON, 'hidden'),
+        })
+
+        assert results['error'].settled and not results['error'].present
+        assert results['spinner'].settled and results['spinner'].present
+
+    def test_home_page_sections(self):
+        """Test Who-uses sections are checked together"""
+        from pages.testmoz_home_page import TestmozHomePage
+        driver = make_driver()
+        driver.execute_script.return_value = [bulk_data(["Teachers"]), bulk_data(["Trainers"]),
+                                              bulk_data(["Employers"])]
+
+        assert TestmozHomePage(driver).get_who_uses_visibility() == \
+            {'teachers': True, 'trainers': True, 'employers': True}
+        assert driver.execute_script.call_count == 1
+
+    def test_home_page_main_elements(self):
+        """Test the heading and call-to-action buttons are checked together"""
+        from pages.testmoz_home_page import TestmozHomePage
+        driver = make_driver()
+        driver.execute_script.return_value = [bulk_data(["Easily create tests"]), bulk_data(["Build a Test"]),
+                                              bulk_data(["Try a Demo Test"])]
+
+        assert TestmozHomePage(driver).get_main_elements_visibility() == \
+            {'main_heading': True, 'build_test_button': True, 'try_demo_button': True}
+        assert driver.execute_script.call_count == 1
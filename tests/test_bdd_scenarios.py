@@ -9,7 +9,8 @@ from framework.bdd_framework import (
 )
 from pages.testmoz_home_page import TestmozHomePage
 from pages.testmoz_demo_page import TestmozDemoPage
-import time
+from pages.locators.testmoz_home_locators import TestmozHomeLocators
+from pages.locators.testmoz_demo_locators import TestmozDemoLocators
 
 
 # Initialize BDD reporter
@@ -34,7 +35,7 @@ class TestBDDHomepageScenarios:
         page.open_testmoz()
         
         # When: Page loads
-        time.sleep(2)
+        page.wait_for_element_visible(TestmozHomeLocators.MAIN_HEADING)
         
         # Then: Page title should be visible
         title = page.get_page_title()
@@ -52,7 +53,7 @@ class TestBDDHomepageScenarios:
         """
         page = TestmozHomePage(driver)
         page.open_testmoz()
-        time.sleep(2)
+        page.wait_for_element_visible(TestmozHomeLocators.MAIN_HEADING)
         
         # Verify main heading visibility
         is_visible = page.is_main_heading_visible()
@@ -73,7 +74,7 @@ class TestBDDHomepageScenarios:
         """
         page = TestmozHomePage(driver)
         page.open_testmoz()
-        time.sleep(2)
+        page.wait_for_element_visible(TestmozHomeLocators.BUILD_A_TEST_BUTTON)
         
         is_visible = page.is_build_test_button_visible()
         assert is_visible, "'Build a Test' button is not visible"
@@ -90,7 +91,7 @@ class TestBDDHomepageScenarios:
         """
         page = TestmozHomePage(driver)
         page.open_testmoz()
-        time.sleep(2)
+        page.wait_for_element_visible(TestmozHomeLocators.TRY_DEMO_BUTTON)
         
         is_visible = page.is_try_demo_button_visible()
         assert is_visible, "'Try a Demo Test' button is not visible"
@@ -107,7 +108,7 @@ class TestBDDHomepageScenarios:
         """
         page = TestmozHomePage(driver)
         page.open_testmoz()
-        time.sleep(2)
+        page.wait_for_element_visible(TestmozHomeLocators.FEATURES_HEADING)
         
         page.scroll_to_features_section()
         
@@ -129,15 +130,11 @@ class TestBDDHomepageScenarios:
         page.open_testmoz()
         
         page.scroll_to_who_uses_section()
-        time.sleep(1)
         
-        # Verify sections are visible
-        teachers_visible = page.is_teachers_section_visible()
-        trainers_visible = page.is_trainers_section_visible()
-        employers_visible = page.is_employers_section_visible()
+        # Verify sections are visible (one shared wait for all three)
+        sections = page.get_who_uses_visibility()
         
-        assert teachers_visible or trainers_visible or employers_visible, \
-            "No 'Who Uses' sections are visible"
+        assert any(sections.values()), "No 'Who Uses' sections are visible"
         reporter.add_result("Scroll to Who Uses section", [], "PASSED")
     
     @pytest.mark.bdd
@@ -151,7 +148,7 @@ class TestBDDHomepageScenarios:
         """
         page = TestmozHomePage(driver)
         page.open_testmoz()
-        time.sleep(2)
+        page.wait_for_element_visible(TestmozHomeLocators.HOME_LINK)
         
         nav_links = page.get_all_navigation_links()
         assert len(nav_links) > 0, "No navigation links found"
@@ -168,7 +165,7 @@ class TestBDDHomepageScenarios:
         """
         page = TestmozHomePage(driver)
         page.open_testmoz()
-        time.sleep(2)
+        page.wait_for_element_visible(TestmozHomeLocators.SUBTITLE_TEXT)
         
         subtitle = page.get_subtitle_text()
         assert subtitle, "Subtitle text is empty"
@@ -191,7 +188,7 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_element_visible(TestmozDemoLocators.TEST_TITLE)
         
         title = page.get_test_title()
         assert title, "Test title is not displayed"
@@ -208,7 +205,7 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_element_visible(TestmozDemoLocators.QUESTION_TEXT)
         
         question_text = page.get_question_text()
         assert question_text, "Question text is not displayed"
@@ -225,7 +222,7 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_element_visible(TestmozDemoLocators.ANSWER_OPTION)
         
         options = page.get_all_answer_options()
         assert len(options) > 0, "No answer options found"
@@ -242,12 +239,11 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_element_visible(TestmozDemoLocators.ANSWER_OPTION)
         
         # Select first answer by index
         success = page.select_answer_by_index(0)
         assert success, "Failed to select answer"
-        time.sleep(1)
         
         reporter.add_result("User can select answer", [], "PASSED")
     
@@ -262,18 +258,16 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_state('question')
         
         # Get first question info
         question_info_1 = page.get_question_number()
         
         # Select an answer
         page.select_answer_by_index(0)
-        time.sleep(1)
         
         # Click next
-        page.click_next_question()
-        time.sleep(2)
+        assert page.click_next_question(), "Next click had no effect"
         
         # Get second question info
         question_info_2 = page.get_question_number()
@@ -297,7 +291,7 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_state('question')
         
         # Get initial question number
         question_info = page.get_question_number()
@@ -317,23 +311,19 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_state('question')
         
         question_info = page.get_question_number()
         if question_info and question_info['total'] >= 2:
             # Answer first question
             page.select_answer_by_index(0)
-            time.sleep(1)
-            page.click_next_question()
-            time.sleep(2)
+            assert page.click_next_question(), "Next click had no effect"
+            
+            # Verify we're on question 2
+            page.wait_for_state('question', current=2)
             
             # Answer second question
             page.select_answer_by_index(0)
-            time.sleep(1)
-            
-            # Verify we're on question 2
-            new_question_info = page.get_question_number()
-            assert new_question_info['current'] == 2, "Failed to navigate to question 2"
         
         reporter.add_result("Answer multiple questions", [], "PASSED")
     
@@ -348,7 +338,7 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_element_visible(TestmozDemoLocators.ANSWER_OPTION)
         
         question_type = page.get_question_type()
         assert question_type in ['true_false', 'multiple_choice'], \
@@ -367,7 +357,7 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_state('question')
         
         question_info = page.get_question_number()
         
@@ -389,18 +379,16 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_state('question')
         
         question_info = page.get_question_number()
         if question_info and question_info['total'] >= 1:
             # Answer just a couple of questions to test the flow
             for i in range(min(2, question_info['total'])):
                 page.select_answer_by_index(0)
-                time.sleep(0.5)
                 
                 if i < question_info['total'] - 1:
-                    page.click_next_question()
-                    time.sleep(1)
+                    assert page.click_next_question(), "Next click had no effect"
         
         reporter.add_result("Random test completion flow", [], "PASSED")
     
@@ -415,7 +403,7 @@ class TestBDDDemoTestScenarios:
         """
         page = TestmozDemoPage(driver)
         page.open_demo_test()
-        time.sleep(3)
+        page.wait_for_element_visible(TestmozDemoLocators.TEST_TITLE)
         
         title = page.get_test_title()
         assert title and len(title) > 0, "Test title is empty"
@@ -435,7 +423,7 @@ class TestBDDDemoTestScenarios:
         # Start on homepage
         home_page = TestmozHomePage(driver)
         home_page.open_testmoz()
-        time.sleep(2)
+        home_page.wait_for_element_visible(TestmozHomeLocators.MAIN_HEADING)
         
         # Verify homepage
         assert home_page.is_main_heading_visible(), "Homepage main heading not visible"
@@ -443,7 +431,7 @@ class TestBDDDemoTestScenarios:
         # Navigate to demo test
         demo_page = TestmozDemoPage(driver)
         demo_page.open_demo_test()
-        time.sleep(3)
+        demo_page.wait_for_element_visible(TestmozDemoLocators.TEST_TITLE)
         
         # Verify demo test
         title = demo_page.get_test_title()
@@ -0,0 +1,171 @@
+"""
+Unit Tests for Browser Health Record
+Tests run-wide tracking of failed browsers and fallback selection
+"""
+import pytest
+import multiprocessing
+from unittest.mock import Mock, patch
+from framework.browser_health import BrowserHealth
+from framework.file_lock import FileLock
+from framework.webdriver_manager import WebDriverManager
+from framework.driver_metrics import DriverMetrics
+from config.config import Config
+
+
+def record_failures(path, count):
+    """Record failures from a separate process"""
+    health = BrowserHealth(path)
+    for _ in range(count):
+        health.record_failure('chrome', Exception("crash"))
+
+
+@pytest.fixture
+def health(tmp_path):
+    """Create a health record in a temporary directory"""
+    record = BrowserHealth(str(tmp_path / "health.json"))
+    record.reset()
+    return record
+
+
+class TestBrowserHealth:
+    """Unit tests for BrowserHealth class"""
+
+    def test_new_run_has_no_failures(self, health):
+        """Test a reset record is empty"""
+        assert health.failed_browsers() == set()
+        assert health.summary_lines() == []
+
+    def test_record_failure(self, health):
+        """Test failed browser is remembered with its error"""
+        health.record_failure('chrome', Exception("chrome not reachable\nstacktrace"))
+
+        assert health.failed_browsers() == {'chrome'}
+        assert health.load()['failed']['chrome'] == {'count': 1, 'error': 'chrome not reachable'}
+
+    def test_record_fallback(self, health):
+        """Test fallback launches are counted"""
+        health.record_launch('chrome', 'firefox')
+        health.record_launch('chrome', 'firefox')
+        health.record_launch('firefox', 'firefox')
+
+        state = health.load()
+        assert state['fallbacks'] == {'chrome -> firefox': 2}
+        assert state['launched'] == {'firefox': 3}
+
+    def test_summary_lines(self, health):
+        """Test summary mentions failures and fallbacks"""
+        health.record_failure('chrome', Exception("boom"))
+        health.record_launch('chrome', 'firefox')
+
+        summary = "\n".join(health.summary_lines())
+        assert "chrome: failed to launch 1 time(s) - boom" in summary
+        assert "fallback chrome -> firefox: 1 driver(s)" in summary
+
+    def test_reset_clears_previous_run(self, health):
+        """Test reset starts a clean record"""
+        health.record_failure('chrome', Exception("boom"))
+        health.reset()
+        assert health.failed_browsers() == set()
+
+    def test_updates_from_parallel_processes(self, health):
+        """Test concurrent workers don't lose updates"""
+        processes = [multiprocessing.Process(target=record_failures, args=(health.path, 10)) for _ in range(3)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+
+        assert health.load()['failed']['chrome']['count'] == 30
+
+
+class TestFileLock:
+    """Unit tests for FileLock class"""
+
+    def test_lock_is_exclusive(self, tmp_path):
+        """Test a second lock times out while the first is held"""
+        path = str(tmp_path / "state.json")
+        with FileLock(path):
+            with pytest.raises(TimeoutError):
+                FileLock(path, timeout=0.05).acquire()
+
+    def test_stale_lock_is_broken(self, tmp_path):
+        """Test a lock left by a crashed process is removed"""
+        path = str(tmp_path / "state.json")
+        open(f"{path}.lock", 'w').close()
+        with FileLock(path, timeout=1, stale_after=0):
+            pass
+
+
+class TestFallbackSelection:
+    """Unit tests for browser selection in WebDriverManager.create_driver"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_health(self, health):
+        """Point WebDriverManager at a temporary health record"""
+        previous = WebDriverManager._browser_health
+        WebDriverManager._browser_health = health
+        with patch.object(WebDriverManager, 'invalidate_driver_cache'), \
+                patch.object(WebDriverManager, 'record_capabilities'), \
+                patch.object(Config, 'BROWSER', 'chrome'), \
+                patch('framework.webdriver_manager.driver_metrics', DriverMetrics()):
+            yield
+        WebDriverManager._browser_health = previous
+
+    def test_failed_browser_is_skipped(self, health):
+        """Test chrome is only tried once after it failed"""
+        chrome = Mock(side_effect=Exception("chrome crashed"))
+        firefox = Mock(side_effect=lambda profile, proxy_url=None: Mock())
+        with patch.dict('framework.webdriver_manager.BROWSER_LAUNCHERS', {'chrome': chrome, 'firefox': firefox}):
+            WebDriverManager.create_driver()
+            WebDriverManager.create_driver()
+
+        assert chrome.call_count == 1
+        assert firefox.call_count == 2
+        assert health.load()['fallbacks'] == {'chrome -> firefox': 2}
+
+    def test_all_failed_retries_whole_chain(self, health):
+        """Test the chain is walked again when every browser failed"""
+        health.record_failure('chrome', Exception("boom"))
+        health.record_failure('firefox', Exception("boom"))
+        chrome = Mock(side_effect=lambda profile, proxy_url=None: Mock())
+        with patch.dict('framework.webdriver_manager.BROWSER_LAUNCHERS', {'chrome': chrome}):
+            WebDriverManager.create_driver()
+
+        assert chrome.call_count == 1
+
+    def test_remote_errors_do_not_mark_browser_broken(self, health):
+        """Test a saturated grid raises without marking the browser failed for the run"""
+        dispatcher = Mock()
+        dispatcher.create_driver.side_effect = Exception("No remote WebDriver endpoint accepted a session")
+        with patch.object(Config, 'REMOTE_ENDPOINTS', ['http://grid:4444']), \
+                patch.object(WebDriverManager, 'get_dispatcher', return_value=dispatcher):
+            with pytest.raises(Exception, match="No remote WebDriver endpoint"):
+                WebDriverManager.create_driver()
+
+        assert dispatcher.create_driver.call_count == 1
+        assert health.failed_browsers() == set()
+
+    def test_driver_quit_when_configure_fails(self):
+        """Test a browser that launched but can't be configured is quit, not leaked"""
+        driver = Mock()
+        driver.set_page_load_timeout.side_effect = Exception("session gone")
+        chrome = Mock(return_value=driver)
+        with patch.dict('framework.webdriver_manager.BROWSER_LAUNCHERS', {'chrome': chrome}), \
+                patch.object(WebDriverManager, 'quit_driver') as quit_driver:
+            with pytest.raises(Exception, match="session gone"):
+                WebDriverManager.create_driver()
+
+        quit_driver.assert_called_once_with(driver)
+
+    def test_no_working_browser_raises(self):
+        """Test a clear error when nothing launches"""
+        failing = Mock(side_effect=Exception("boom"))
+        with patch.dict('framework.webdriver_manager.BROWSER_LAUNCHERS', {'chrome': failing, 'firefox': failing}):
+            with pytest.raises(Exception, match="No working browser found"):
+                WebDriverManager.create_driver()
+
+    def test_unsupported_browser(self):
+        """Test unknown browser names are rejected"""
+        with patch.object(Config, 'BROWSER', 'opera'):
+            with pytest.raises(ValueError):
+                WebDriverManager.create_driver()
@@ -0,0 +1,111 @@
+"""
+Unit Tests for Browser Performance Profiles
+Tests that profiles translate into Chrome/Firefox options and URL blocking
+"""
+import pytest
+from unittest.mock import Mock, patch
+from framework.webdriver_manager import WebDriverManager, FONT_URL_PATTERNS
+from framework.driver_metrics import DriverMetrics
+from config.config import Config
+
+
+@pytest.fixture(autouse=True)
+def no_driver_resolution():
+    """Skip driver binary lookup and keep timings out of the run summary"""
+    with patch.object(WebDriverManager, 'resolve_driver_path', return_value=None), \
+            patch('framework.webdriver_manager.driver_metrics', DriverMetrics()):
+        yield
+
+
+def launch(browser, profile_name):
+    """Launch a browser with mocked selenium and return the options it got"""
+    with patch(f'framework.webdriver_manager.webdriver.{browser}') as driver_class:
+        profile = Config.get_browser_profile(profile_name)
+        launcher = getattr(WebDriverManager, f'_create_{browser.lower()}_driver')
+        launcher(profile)
+    return driver_class.call_args.kwargs['options']
+
+
+class TestBrowserProfiles:
+    """Unit tests for profile configuration"""
+
+    def test_default_profile(self):
+        """Test the default keeps full page loads"""
+        assert Config.get_browser_profile()['page_load_strategy'] in ['normal', 'eager', 'none']
+
+    @pytest.mark.parametrize("name", ['fast', 'faithful', 'debug', 'FAST'])
+    def test_known_profiles(self, name):
+        """Test every documented profile resolves"""
+        profile = Config.get_browser_profile(name)
+        assert set(profile) == {'page_load_strategy', 'block_images', 'block_fonts', 'blocked_urls', 'browser_logs'}
+
+    def test_unknown_profile(self):
+        """Test a typo in the profile name fails loudly"""
+        with pytest.raises(ValueError):
+            Config.get_browser_profile('turbo')
+
+
+class TestChromeProfile:
+    """Unit tests for Chrome options per profile"""
+
+    def test_fast_profile(self):
+        """Test eager loading and image blocking"""
+        options = launch('Chrome', 'fast')
+
+        assert options.page_load_strategy == 'eager'
+        assert '--blink-settings=imagesEnabled=false' in options.arguments
+        assert options.experimental_options['prefs']['profile.managed_default_content_settings.images'] == 2
+
+    def test_faithful_profile(self):
+        """Test faithful profile leaves loading untouched"""
+        options = launch('Chrome', 'faithful')
+
+        assert options.page_load_strategy == 'normal'
+        assert '--blink-settings=imagesEnabled=false' not in options.arguments
+
+    def test_debug_profile_collects_logs(self):
+        """Test debug profile enables browser logs"""
+        options = launch('Chrome', 'debug')
+        assert 'goog:loggingPrefs' in options.to_capabilities()
+
+
+class TestFirefoxProfile:
+    """Unit tests for Firefox options per profile"""
+
+    def test_fast_profile(self):
+        """Test eager loading with image, font and tracker blocking"""
+        options = launch('Firefox', 'fast')
+
+        assert options.page_load_strategy == 'eager'
+        assert options.preferences['permissions.default.image'] == 2
+        assert options.preferences['gfx.downloadable_fonts.enabled'] is False
+        assert options.preferences['privacy.trackingprotection.enabled'] is True
+
+    def test_faithful_profile(self):
+        """Test faithful profile sets no blocking preferences"""
+        options = launch('Firefox', 'faithful')
+        assert 'permissions.default.image' not in options.preferences
+
+
+class TestUrlBlocking:
+    """Unit tests for DevTools URL blocking"""
+
+    def test_fast_profile_blocks_fonts_and_trackers(self):
+        """Test blocked URL list sent over CDP"""
+        driver = Mock()
+        WebDriverManager.apply_url_blocking(driver, Config.get_browser_profile('fast'))
+
+        driver.execute_cdp_cmd.assert_called_with('Network.setBlockedURLs', {
+            'urls': Config.TRACKER_BLOCKLIST + FONT_URL_PATTERNS
+        })
+
+    def test_faithful_profile_blocks_nothing(self):
+        """Test no CDP calls without patterns"""
+        driver = Mock()
+        WebDriverManager.apply_url_blocking(driver, Config.get_browser_profile('faithful'))
+        driver.execute_cdp_cmd.assert_not_called()
+
+    def test_firefox_driver_is_skipped(self):
+        """Test drivers without DevTools are left alone"""
+        driver = Mock(spec=['quit'])
+        WebDriverManager.apply_url_blocking(driver, Config.get_browser_profile('fast'))
@@ -0,0 +1,281 @@
+"""
+Unit Tests for Caching Proxy
+Tests forwarding, the shared disk cache, HAR capture and WebDriverManager wiring
+"""
+import json
+import pytest
+import socket
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, patch
+from framework.caching_proxy import CachingProxy, DiskCache, expires_at, is_static, har_name
+from framework.webdriver_manager import WebDriverManager
+from framework.driver_metrics import DriverMetrics
+from config.config import Config
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    """Origin with a page, a stylesheet, an uncacheable script and an echo endpoint"""
+    protocol_version = 'HTTP/1.1'
+    hits = {}
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        OriginHandler.hits[path] = OriginHandler.hits.get(path, 0) + 1
+        routes = {
+            '/': ('text/html', b'<link rel="stylesheet" href="/app.css">', {}),
+            '/app.css': ('text/css', b'body { color: red }', {}),
+            '/private.js': ('application/javascript', b'var secret = 1;', {'Cache-Control': 'private'}),
+            '/stale.css': ('text/css', b'a {}', {'Cache-Control': 'max-age=0'}),
+            '/fresh.css': ('text/css', b'b {}', {'Cache-Control': 'public, max-age=600'}),
+            '/lang.css': ('text/css', self.headers.get('Accept-Language', '').encode(), {'Vary': 'Accept-Language'}),
+        }
+        content_type, body, extra = routes.get(path, ('text/plain', b'missing', {}))
+        self.send_response(200 if path in routes else 404)
+        self.send_header('Content-Type', content_type)
+        for name, value in extra.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        self.send_response(201)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def origin():
+    """Running origin server, its base URL"""
+    OriginHandler.hits = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), OriginHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return DiskCache(str(tmp_path / "proxy"))
+
+
+@pytest.fixture(autouse=True)
+def no_env_proxies(monkeypatch):
+    for name in ('http_proxy', 'HTTP_PROXY', 'no_proxy', 'NO_PROXY'):
+        monkeypatch.delenv(name, raising=False)
+
+
+def through(proxy, url, data=None, headers=None):
+    """(status, body) of a request sent through the proxy"""
+    opener = urllib.request.build_opener(urllib.request.ProxyHandler({'http': proxy.url}))
+    try:
+        with opener.open(urllib.request.Request(url, data=data, headers=headers or {})) as response:
+            return response.status, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read()
+
+
+class TestCachingProxy:
+    """Unit tests for CachingProxy class"""
+
+    def test_forwards_requests(self, origin, cache):
+        """Test GET and POST reach the origin unchanged"""
+        with CachingProxy(cache) as proxy:
+            assert through(proxy, origin + "/") == (200, b'<link rel="stylesheet" href="/app.css">')
+            assert through(proxy, origin + "/echo", data=b"answer=2") == (201, b"answer=2")
+            assert through(proxy, origin + "/nope")[0] == 404
+
+    def test_static_assets_cached_across_sessions(self, origin, cache):
+        """Test a stylesheet is fetched once for every proxy sharing the cache"""
+        for _ in range(2):
+            with CachingProxy(cache) as proxy:
+                assert through(proxy, origin + "/app.css") == (200, b'body { color: red }')
+                through(proxy, origin + "/")
+        assert OriginHandler.hits['/app.css'] == 1
+        assert OriginHandler.hits['/'] == 2
+        assert cache.stats['stored'] == 1
+        assert proxy.stats['cached'] == 1
+
+    def test_private_not_cached(self, origin, cache):
+        """Test responses marked private are always fetched"""
+        with CachingProxy(cache) as proxy:
+            through(proxy, origin + "/private.js")
+            through(proxy, origin + "/private.js")
+        assert OriginHandler.hits['/private.js'] == 2
+
+    def test_expired_assets_refetched(self, origin, cache):
+        """Test max-age is honoured: a zero lifetime is refetched, a long one is reused"""
+        with CachingProxy(cache) as proxy:
+            for _ in range(2):
+                through(proxy, origin + "/stale.css")
+                through(proxy, origin + "/fresh.css")
+        assert OriginHandler.hits['/stale.css'] == 2
+        assert OriginHandler.hits['/fresh.css'] == 1
+
+    def test_vary_keeps_variants_apart(self, origin, cache):
+        """Test a response is only reused for requests with the same Vary header values"""
+        with CachingProxy(cache) as proxy:
+            assert through(proxy, origin + "/lang.css", headers={'Accept-Language': 'en'}) == (200, b'en')
+            assert through(proxy, origin + "/lang.css", headers={'Accept-Language': 'en'}) == (200, b'en')
+            assert through(proxy, origin + "/lang.css", headers={'Accept-Language': 'de'}) == (200, b'de')
+        assert OriginHandler.hits['/lang.css'] == 2
+
+    def test_har_written(self, origin, cache, tmp_path):
+        """Test every request becomes a HAR entry with timings"""
+        with CachingProxy(cache) as proxy:
+            through(proxy, origin + "/app.css?v=3")
+            through(proxy, origin + "/app.css?v=3")
+            path = proxy.write_har(str(tmp_path / "har" / "test.har"), "test_home")
+
+        har = json.loads(open(path).read())['log']
+        assert har['version'] == '1.2'
+        assert har['pages'][0]['title'] == 'test_home'
+        first, second = har['entries']
+        assert first['request']['url'] == origin + "/app.css?v=3"
+        assert first['request']['queryString'] == [{'name': 'v', 'value': '3'}]
+        assert first['response']['content'] == {'size': 19, 'mimeType': 'text/css'}
+        assert set(first['timings']) >= {'connect', 'send', 'wait', 'receive'}
+        assert '_fromCache' not in first
+        assert second['_fromCache'] == 'disk'
+        assert proxy.entries == []
+
+    def test_no_entries_no_har(self, cache, tmp_path):
+        """Test an idle session writes no file"""
+        with CachingProxy(cache) as proxy:
+            assert proxy.write_har(str(tmp_path / "empty.har")) is None
+
+    def test_unreachable_origin(self, cache):
+        """Test a dead upstream answers 502 and is logged"""
+        sock = socket.socket()
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+        sock.close()
+        with CachingProxy(cache, timeout=2) as proxy:
+            assert through(proxy, f"http://127.0.0.1:{port}/")[0] == 502
+        assert proxy.stats['errors'] == 1
+        assert proxy.entries[0]['response']['status'] == 502
+
+    def test_connect_tunnel(self, origin, cache):
+        """Test CONNECT tunnels bytes through and logs the tunnel"""
+        port = int(origin.rsplit(':', 1)[1])
+        with CachingProxy(cache, timeout=1) as proxy:
+            client = socket.create_connection(('127.0.0.1', int(proxy.url.rsplit(':', 1)[1])))
+            client.sendall(f"CONNECT 127.0.0.1:{port} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\n\r\n".encode())
+            assert b"200" in client.recv(1024)
+            client.sendall(b"GET /app.css HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+            data = b""
+            while not data.endswith(b"red }"):
+                data += client.recv(1024)
+            client.close()
+            deadline = time.perf_counter() + 2
+            while not proxy.entries and time.perf_counter() < deadline:
+                time.sleep(0.01)
+        assert proxy.stats['tunnels'] == 1
+        assert proxy.entries[0]['request']['method'] == 'CONNECT'
+        assert proxy.entries[0]['response']['bodySize'] == len(data)
+
+    def test_is_static(self):
+        """Test which responses count as static assets"""
+        assert is_static('GET', 'http://x/a.woff2', 200, [])
+        assert is_static('GET', 'http://x/logo', 200, [('Content-Type', 'image/png')])
+        assert not is_static('GET', 'http://x/', 200, [('Content-Type', 'text/html')])
+        assert not is_static('POST', 'http://x/a.css', 200, [])
+        assert not is_static('GET', 'http://x/a.css', 304, [])
+        assert not is_static('GET', 'http://x/a.css', 200, [('Cache-Control', 'no-store')])
+        assert not is_static('GET', 'http://x/a.css', 200, [('Cache-Control', 'no-cache')])
+        assert not is_static('GET', 'http://x/a.css', 200, [('Vary', '*')])
+
+    def test_expires_at(self):
+        """Test freshness lifetimes from Cache-Control, Age and Expires"""
+        date = 'Sat, 17 Oct 2026 10:00:00 GMT'
+        assert expires_at([('Cache-Control', 'max-age=60')], now=1000) == 1060
+        assert expires_at([('Cache-Control', 'max-age=60, s-maxage=10')], now=1000) == 1010
+        assert expires_at([('Cache-Control', 'max-age=60'), ('Age', '20')], now=1000) == 1040
+        assert expires_at([('Expires', 'Sat, 17 Oct 2026 10:05:00 GMT'), ('Date', date)], now=1000) == 1300
+        assert expires_at([('Expires', '0')], now=1000) == 1000
+        assert expires_at([('Content-Type', 'text/css')], now=1000) is None
+
+    def test_har_name(self):
+        """Test test ids become safe file names"""
+        assert har_name("tests/test_x.py::test_a[chrome-1]") == "tests_test_x.py_test_a_chrome-1.har"
+
+
+class TestWebDriverManagerProxy:
+    """Unit tests for routing browsers through the proxy"""
+
+    @pytest.fixture(autouse=True)
+    def isolated(self, cache, tmp_path):
+        with patch.object(WebDriverManager, 'resolve_driver_path', return_value=None), \
+                patch.object(WebDriverManager, 'record_capabilities'), \
+                patch.object(WebDriverManager, '_proxy_cache', cache), \
+                patch.object(WebDriverManager, '_proxies', {}), \
+                patch.object(Config, 'CACHING_PROXY', True), patch.object(Config, 'ASYNC_QUIT', False), \
+                patch.object(Config, 'HAR_DIR', str(tmp_path / "har")), \
+                patch('framework.webdriver_manager.driver_metrics', DriverMetrics()):
+            yield
+
+    def test_chrome_options(self):
+        """Test Chrome is pointed at the proxy, loopback included"""
+        options = WebDriverManager._chrome_options(Config.get_browser_profile(), "http://127.0.0.1:9000")
+        assert '--proxy-server=http://127.0.0.1:9000' in options.arguments
+        assert '--proxy-bypass-list=<-loopback>' in options.arguments
+        assert not any('proxy' in arg for arg in WebDriverManager._chrome_options(Config.get_browser_profile()).arguments)
+
+    def test_firefox_options(self):
+        """Test Firefox gets a manual proxy for HTTP and HTTPS"""
+        options = WebDriverManager._firefox_options(Config.get_browser_profile(), "http://127.0.0.1:9000")
+        assert options.preferences['network.proxy.type'] == 1
+        assert options.preferences['network.proxy.http_port'] == 9000
+        assert options.preferences['network.proxy.ssl'] == '127.0.0.1'
+        assert options.preferences['network.proxy.allow_hijacking_localhost'] is True
+
+    def test_driver_gets_own_proxy(self, origin, tmp_path):
+        """Test each driver has a proxy that saves HAR per test and stops on quit"""
+        with patch.object(Config, 'BROWSER', 'chrome'), \
+                patch('framework.webdriver_manager.webdriver.Chrome') as chrome:
+            chrome.side_effect = lambda **kwargs: Mock(session_id='abc')
+            first = WebDriverManager.create_driver()
+            second = WebDriverManager.create_driver()
+
+        proxy = WebDriverManager.get_proxy(first)
+        assert proxy is not None and proxy is not WebDriverManager.get_proxy(second)
+        assert f'--proxy-server={proxy.url}' in chrome.call_args_list[0].kwargs['options'].arguments
+
+        through(proxy, origin + "/")
+        assert WebDriverManager.save_har(first, "tests/test_x.py::test_a").endswith("tests_test_x.py_test_a.har")
+        through(proxy, origin + "/app.css")
+        WebDriverManager.quit_driver(first)
+        WebDriverManager.quit_driver(second)
+
+        assert WebDriverManager.get_proxy(first) is None
+        assert sorted(p.name for p in (tmp_path / "har").iterdir()) == [
+            "session_abc.har", "tests_test_x.py_test_a.har"]
+
+    def test_https_base_url_warns_once(self, capsys):
+        """Test an HTTPS site under test is flagged as not cacheable through the proxy"""
+        with patch.object(Config, 'BASE_URL', 'https://testmoz.com'), \
+                patch.object(WebDriverManager, '_https_proxy_warned', False):
+            for _ in range(2):
+                WebDriverManager.start_proxy().stop()
+        assert capsys.readouterr().out.count("BASE_URL https://testmoz.com is HTTPS") == 1
+
+    def test_off_by_default(self):
+        """Test no proxy is started without CACHING_PROXY"""
+        with patch.object(Config, 'CACHING_PROXY', False), patch.object(Config, 'BROWSER', 'chrome'), \
+                patch('framework.webdriver_manager.webdriver.Chrome') as chrome:
+            driver = WebDriverManager.create_driver()
+        assert WebDriverManager.get_proxy(driver) is None
+        assert not any('proxy' in arg for arg in chrome.call_args.kwargs['options'].arguments)
@@ -0,0 +1,236 @@
+"""
+Unit Tests for DOM Snapshots
+Tests compressed storage, diff chains, locator visibility and the failure hook
+"""
+import pytest
+import os
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from selenium.webdriver.common.by import By
+from framework.dom_snapshots import DomSnapshotStore, recent_locators, remember_locator, tokenize
+from framework.base_page import BasePage
+from config.config import Config
+import conftest
+
+
+def page(body, url="https://testmoz.com/demo"):
+    """Driver showing a page with the given body"""
+    driver = Mock()
+    driver.page_source = "<html><head><title>Demo</title></head><body>" + body + "</body></html>"
+    driver.current_url = url
+    driver.execute_script.return_value = []
+    return driver
+
+
+def padded(body):
+    """Body long enough that a small change is cheaper to store as a diff"""
+    return "".join(f"<p id='p{i}'>Paragraph {i}</p>" for i in range(50)) + body
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store writing into a temporary directory"""
+    return DomSnapshotStore(str(tmp_path / "dom"))
+
+
+class TestDomSnapshotStore:
+    """Unit tests for DomSnapshotStore class"""
+
+    def test_first_snapshot_is_full_and_compressed(self, store):
+        """Test the first snapshot of a test keeps the whole source, gzipped"""
+        driver = page("<h1>Question 1</h1>")
+        path = store.capture(driver, "tests/test_quiz.py::test_next", locators=[])
+
+        assert path.endswith(".json.gz")
+        with open(path, 'rb') as f:
+            assert f.read(2) == b'\x1f\x8b'
+        snapshot = DomSnapshotStore.load(path)
+        assert snapshot['source'] == driver.page_source
+        assert snapshot['url'] == "https://testmoz.com/demo"
+        assert 'base' not in snapshot
+        assert store.stats['full'] == 1
+
+    def test_second_snapshot_is_diff(self, store):
+        """Test a repeat of the same test stores only what changed"""
+        first = store.capture(page(padded("<h1>Question 1</h1>")), "t.py::test_next", locators=[])
+        second_driver = page(padded("<h1>Question 2</h1>"))
+        second = store.capture(second_driver, "t.py::test_next", locators=[])
+
+        snapshot = DomSnapshotStore.load(second)
+        assert snapshot['base'] == os.path.basename(first)
+        assert 'source' not in snapshot
+        assert DomSnapshotStore.reconstruct(second) == second_driver.page_source
+        assert store.stats == {'full': 1, 'diff': 1, 'bytes': store.stats['bytes']}
+
+    def test_chain_of_diffs_reconstructs(self, store):
+        """Test every snapshot in a chain rebuilds its own source"""
+        drivers = [page(padded(f"<h1>Question {n}</h1><p>{'x' * n}</p>")) for n in range(1, 5)]
+        paths = [store.capture(driver, "t.py::test_walk", locators=[]) for driver in drivers]
+
+        for path, driver in zip(paths, drivers):
+            assert DomSnapshotStore.reconstruct(path) == driver.page_source
+
+    def test_chain_length_capped(self, store):
+        """Test a full snapshot is stored after MAX_CHAIN diffs in a row"""
+        with patch('framework.dom_snapshots.MAX_CHAIN', 2):
+            paths = [store.capture(page(padded(f"<b>{n}</b>")), "t.py::test_x", locators=[]) for n in range(4)]
+
+        assert ['source' in DomSnapshotStore.load(path) for path in paths] == [True, False, False, True]
+
+    def test_huge_page_stored_full(self, store):
+        """Test pages over the token cap skip the diff"""
+        with patch('framework.dom_snapshots.MAX_DIFF_TOKENS', 20):
+            store.capture(page(padded("<b>a</b>")), "t.py::test_x", locators=[])
+            path = store.capture(page(padded("<b>b</b>")), "t.py::test_x", locators=[])
+
+        assert 'source' in DomSnapshotStore.load(path)
+
+    def test_other_tests_diff_against_previous(self, store):
+        """Test a different test's failure on a similar page is stored as a diff"""
+        first = store.capture(page(padded("<b>a</b>")), "t.py::test_one", locators=[])
+        driver = page(padded("<b>b</b>"))
+        path = store.capture(driver, "t.py::test_two[case]", locators=[])
+
+        snapshot = DomSnapshotStore.load(path)
+        assert snapshot['base'] == os.path.basename(first)
+        assert snapshot['test'] == "t.py::test_two[case]"
+        assert DomSnapshotStore.reconstruct(path) == driver.page_source
+
+    def test_unrelated_page_stored_full(self, store):
+        """Test a diff bigger than the page itself is not used"""
+        first, second = page(""), page("")
+        first.page_source = "<html><body><h1>Home</h1></body></html>"
+        second.page_source = "<svg><text>Completely different</text></svg>"
+        store.capture(first, "t.py::test_x", locators=[])
+        path = store.capture(second, "t.py::test_x", locators=[])
+
+        assert 'source' in DomSnapshotStore.load(path)
+
+    def test_locator_visibility_recorded(self, store):
+        """Test locator states come from one script call"""
+        driver = page("<button>Next</button>")
+        driver.execute_script.return_value = [
+            {'count': 1, 'visible': [True], 'error': None},
+            {'count': 2, 'visible': [False, False], 'error': None},
+        ]
+        path = store.capture(driver, "t.py::test_x", locators=[(By.ID, "next"), (By.CSS_SELECTOR, ".opt")])
+
+        assert DomSnapshotStore.load(path)['locators'] == {
+            'id=next': {'count': 1, 'visible': True, 'error': None},
+            'css selector=.opt': {'count': 2, 'visible': False, 'error': None},
+        }
+        driver.execute_script.assert_called_once()
+
+    def test_visibility_script_error_kept(self, store):
+        """Test a failing script still leaves the page source"""
+        driver = page("<p>x</p>")
+        driver.execute_script.side_effect = Exception("script timeout")
+        path = store.capture(driver, "t.py::test_x", locators=[(By.ID, "a")])
+
+        snapshot = DomSnapshotStore.load(path)
+        assert snapshot['locators'] == {'error': {'message': 'script timeout'}}
+        assert snapshot['source'] == driver.page_source
+
+    def test_dead_driver_skipped(self, store, tmp_path):
+        """Test nothing is written when the page can't be read"""
+        driver = Mock()
+        type(driver).page_source = property(lambda self: (_ for _ in ()).throw(Exception("no session")))
+
+        assert store.capture(driver, "t.py::test_x") is None
+        assert not os.path.exists(tmp_path / "dom")
+
+    def test_tokenize_splits_after_tags(self):
+        """Test one-line markup is split into tag-sized tokens"""
+        assert tokenize("<p>a</p><b>c</b>") == ["<p>", "a</p>", "<b>", "c</b>"]
+
+
+class TestRecentLocators:
+    """Unit tests for locator tracking"""
+
+    def test_wait_for_remembers_locator(self):
+        """Test waits note the locator for the driver they ran on"""
+        driver = Mock()
+        page_object = BasePage(driver)
+        page_object.wait_for((By.ID, "a"))
+        page_object.wait_for((By.ID, "b"))
+        page_object.wait_for((By.ID, "a"))
+
+        assert recent_locators(driver) == [(By.ID, "b"), (By.ID, "a")]
+        assert recent_locators(Mock()) == []
+
+    def test_recent_locators_bounded(self):
+        """Test only the latest locators are kept"""
+        driver = Mock()
+        for i in range(30):
+            remember_locator(driver, (By.ID, f"e{i}"))
+
+        locators = recent_locators(driver)
+        assert len(locators) == 10
+        assert locators[-1] == (By.ID, "e29")
+
+
+class TestFailureHook:
+    """Unit tests for the pytest_runtest_makereport hook"""
+
+    def run_hook(self, item, report):
+        hook = conftest.pytest_runtest_makereport(item, Mock())
+        next(hook)
+        with pytest.raises(StopIteration):
+            hook.send(Mock(get_result=Mock(return_value=report)))
+
+    def make_report(self, failed=True, when='call'):
+        return SimpleNamespace(failed=failed, when=when, user_properties=[])
+
+    def test_failed_test_captured(self, store):
+        """Test a failing call saves a snapshot and links it in the report"""
+        item = SimpleNamespace(nodeid="t.py::test_x", funcargs={'driver': page("<p>x</p>")})
+        report = self.make_report()
+        with patch.object(conftest, 'get_dom_snapshot_store', return_value=store):
+            self.run_hook(item, report)
+
+        assert report.user_properties[0][0] == 'dom_snapshot'
+        assert os.path.exists(report.user_properties[0][1])
+
+    def test_failures_of_a_run_are_chained(self, store):
+        """Test consecutive failing tests go through the hook into one diff chain"""
+        reports = []
+        for n, when in enumerate(['call', 'setup', 'call']):
+            driver = page(padded(f"<h1>Question {n}</h1>"))
+            item = SimpleNamespace(nodeid=f"t.py::test_{n}", funcargs={'driver': driver})
+            reports.append(self.make_report(when=when))
+            with patch.object(conftest, 'get_dom_snapshot_store', return_value=store):
+                self.run_hook(item, reports[-1])
+
+        paths = [report.user_properties[0][1] for report in reports]
+        assert 'source' in DomSnapshotStore.load(paths[0])
+        assert [DomSnapshotStore.load(path)['base'] for path in paths[1:]] == [os.path.basename(p) for p in paths[:-1]]
+        assert DomSnapshotStore.reconstruct(paths[-1]) == driver.page_source
+        assert store.stats['diff'] == 2
+
+    @pytest.mark.parametrize("failed,when", [(False, 'call'), (True, 'teardown')])
+    def test_passing_and_teardown_skipped(self, failed, when):
+        """Test passing tests never touch the driver"""
+        driver = Mock()
+        item = SimpleNamespace(nodeid="t.py::test_x", funcargs={'driver': driver})
+        with patch.object(conftest, 'get_dom_snapshot_store') as get_store:
+            self.run_hook(item, self.make_report(failed, when))
+
+        get_store.assert_not_called()
+        assert driver.mock_calls == []
+
+    def test_tests_without_driver_skipped(self):
+        """Test unit tests without a browser are ignored"""
+        item = SimpleNamespace(nodeid="t.py::test_x", funcargs={})
+        with patch.object(conftest, 'get_dom_snapshot_store') as get_store:
+            self.run_hook(item, self.make_report())
+
+        get_store.assert_not_called()
+
+    def test_disabled_by_config(self):
+        """Test DOM_SNAPSHOTS=false turns capture off"""
+        item = SimpleNamespace(nodeid="t.py::test_x", funcargs={'driver': Mock()})
+        with patch.object(Config, 'DOM_SNAPSHOTS', False), \
+                patch.object(conftest, 'get_dom_snapshot_store') as get_store:
+            self.run_hook(item, self.make_report())
+
+        get_store.assert_not_called()
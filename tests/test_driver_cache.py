@@ -0,0 +1,149 @@
+"""
+Unit Tests for Driver Resolution Cache
+Tests persistent caching of driver paths and capabilities
+"""
+import pytest
+import json
+import threading
+import time
+from unittest.mock import Mock, patch
+from framework.driver_cache import DriverResolutionCache
+from framework.webdriver_manager import WebDriverManager
+
+
+@pytest.fixture
+def driver_binary(tmp_path):
+    """Create a fake driver binary"""
+    binary = tmp_path / "chromedriver"
+    binary.write_text("")
+    return str(binary)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """Create a cache with a fixed browser version"""
+    with patch('framework.driver_cache.detect_browser_version', return_value="120.0"):
+        yield DriverResolutionCache(str(tmp_path / "cache" / "drivers.json"), ttl=60)
+
+
+class TestDriverResolutionCache:
+    """Unit tests for DriverResolutionCache class"""
+
+    def test_miss_on_empty_cache(self, cache):
+        """Test lookup in an empty cache"""
+        assert cache.get('chrome') is None
+
+    def test_put_and_get(self, cache, driver_binary):
+        """Test stored path is returned"""
+        cache.put('chrome', driver_binary)
+        assert cache.get('chrome')['driver_path'] == driver_binary
+
+    def test_persisted_between_instances(self, cache, driver_binary):
+        """Test another cache instance reads the same file"""
+        cache.put('chrome', driver_binary)
+        other = DriverResolutionCache(cache.path, ttl=60)
+        assert other.get('chrome')['driver_path'] == driver_binary
+
+    def test_key_contains_browser_version_and_os(self, cache):
+        """Test key includes browser, version and platform"""
+        key = cache.make_key('firefox', '119.0')
+        assert key.startswith('firefox|119.0|')
+
+    def test_browser_upgrade_misses(self, cache, driver_binary):
+        """Test a new browser version does not reuse the old driver"""
+        cache.put('chrome', driver_binary, browser_version='119.0')
+        assert cache.get('chrome', browser_version='120.0') is None
+
+    def test_concurrent_saves_from_threads(self, cache, driver_binary, capsys):
+        """Test threads of one process don't share a temporary file"""
+        def save():
+            for _ in range(20):
+                cache.put('chrome', driver_binary)
+        threads = [threading.Thread(target=save) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert "Could not write" not in capsys.readouterr().out
+        assert cache.get('chrome')['driver_path'] == driver_binary
+
+    def test_expired_entry(self, cache, driver_binary):
+        """Test entries older than the TTL are dropped"""
+        cache.put('chrome', driver_binary)
+        with patch('framework.driver_cache.time.time', return_value=time.time() + 120):
+            assert cache.get('chrome') is None
+
+    def test_missing_binary_invalidates(self, cache, tmp_path):
+        """Test an entry pointing to a deleted binary is dropped"""
+        cache.put('chrome', str(tmp_path / "deleted"))
+        assert cache.get('chrome') is None
+
+    def test_explicit_invalidation(self, cache, driver_binary):
+        """Test invalidating one browser and the whole cache"""
+        cache.put('chrome', driver_binary)
+        cache.put('firefox', driver_binary)
+
+        cache.invalidate('chrome')
+        assert cache.get('chrome') is None
+        assert cache.get('firefox') is not None
+
+        cache.invalidate()
+        assert cache.get('firefox') is None
+
+    def test_record_capabilities(self, cache, driver_binary):
+        """Test only known capability keys are stored"""
+        cache.put('chrome', driver_binary)
+        cache.record_capabilities('chrome', {'browserName': 'chrome', 'browserVersion': '120.0', 'goog:x': {}})
+
+        with open(cache.path) as f:
+            stored = list(json.load(f).values())[0]
+        assert stored['capabilities'] == {'browserName': 'chrome', 'browserVersion': '120.0'}
+
+    def test_zero_ttl_disables_cache(self, tmp_path, driver_binary):
+        """Test TTL of 0 turns caching off"""
+        cache = DriverResolutionCache(str(tmp_path / "drivers.json"), ttl=0)
+        cache.put('chrome', driver_binary)
+        assert cache.get('chrome') is None
+
+    def test_corrupt_file_is_ignored(self, cache, driver_binary):
+        """Test a broken cache file behaves like an empty one"""
+        cache.put('chrome', driver_binary)
+        with open(cache.path, 'w') as f:
+            f.write("{not json")
+        assert cache.get('chrome') is None
+
+
+class TestResolveDriverPath:
+    """Unit tests for WebDriverManager driver resolution"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_cache(self, cache):
+        """Point WebDriverManager at a temporary cache"""
+        previous = WebDriverManager._resolution_cache
+        WebDriverManager._resolution_cache = cache
+        yield
+        WebDriverManager._resolution_cache = previous
+
+    def test_path_lookup_is_cached(self, driver_binary):
+        """Test PATH lookup runs only once"""
+        with patch.object(WebDriverManager, 'find_driver_in_path', return_value=driver_binary) as which:
+            assert WebDriverManager.resolve_driver_path('chrome') == driver_binary
+            assert WebDriverManager.resolve_driver_path('chrome') == driver_binary
+        assert which.call_count == 1
+
+    def test_installer_used_when_not_in_path(self, driver_binary):
+        """Test webdriver-manager result is cached too"""
+        installer = Mock()
+        installer.return_value.install.return_value = driver_binary
+        with patch.object(WebDriverManager, 'find_driver_in_path', return_value=None), \
+                patch.dict('framework.webdriver_manager.DRIVER_INSTALLERS', {'firefox': installer}):
+            assert WebDriverManager.resolve_driver_path('firefox') == driver_binary
+            assert WebDriverManager.resolve_driver_path('firefox') == driver_binary
+        assert installer.return_value.install.call_count == 1
+
+    def test_unresolved_driver_is_not_cached(self, cache):
+        """Test a failed lookup is retried next time"""
+        with patch.object(WebDriverManager, 'find_driver_in_path', return_value=None):
+            assert WebDriverManager.resolve_driver_path('edge') is None
+        assert cache.get('edge') is None
@@ -0,0 +1,110 @@
+"""
+Unit Tests for Driver Metrics
+Tests phase timing collection, per-worker files and the roll-up summary
+"""
+import pytest
+import time
+from unittest.mock import Mock, patch
+from framework.driver_metrics import DriverMetrics, percentile
+from framework.webdriver_manager import WebDriverManager
+
+
+class TestPercentile:
+    """Unit tests for percentile helper"""
+
+    def test_empty(self):
+        """Test no values"""
+        assert percentile([], 50) == 0.0
+
+    def test_nearest_rank(self):
+        """Test nearest-rank selection"""
+        values = [float(v) for v in range(1, 21)]
+        assert percentile(values, 50) == 10.0
+        assert percentile(values, 95) == 19.0
+        assert percentile(values, 100) == 20.0
+
+    def test_single_value(self):
+        """Test a single sample"""
+        assert percentile([0.3], 95) == 0.3
+
+
+class TestDriverMetrics:
+    """Unit tests for DriverMetrics class"""
+
+    def test_record_and_phase(self):
+        """Test explicit records and timed blocks"""
+        metrics = DriverMetrics()
+        metrics.record('chrome', 'spawn', 0.5)
+        with metrics.phase('chrome', 'quit'):
+            time.sleep(0.01)
+
+        assert metrics.records[0] == {'browser': 'chrome', 'phase': 'spawn', 'seconds': 0.5}
+        assert metrics.records[1]['phase'] == 'quit'
+        assert metrics.records[1]['seconds'] >= 0.01
+
+    def test_phase_recorded_on_error(self):
+        """Test a failing block is still timed"""
+        metrics = DriverMetrics()
+        with pytest.raises(RuntimeError):
+            with metrics.phase('firefox', 'handshake'):
+                raise RuntimeError("boom")
+        assert len(metrics.records) == 1
+
+    def test_worker_files_are_rolled_up(self, tmp_path):
+        """Test timings from several workers are combined"""
+        for worker, seconds in [('gw0', 1.0), ('gw1', 3.0)]:
+            metrics = DriverMetrics()
+            metrics.record('chrome', 'spawn', seconds)
+            metrics.write(str(tmp_path), worker)
+
+        records = DriverMetrics.load_all(str(tmp_path))
+        summary = DriverMetrics.summarize(records)
+
+        assert summary['chrome']['spawn'] == {'count': 2, 'p50': 1.0, 'p95': 3.0, 'max': 3.0}
+
+    def test_summary_orders_phases(self):
+        """Test phases appear in lifecycle order"""
+        records = [{'browser': 'chrome', 'phase': p, 'seconds': 0.1} for p in ['quit', 'spawn', 'resolve']]
+        assert list(DriverMetrics.summarize(records)['chrome']) == ['resolve', 'spawn', 'quit']
+
+    def test_format_summary(self):
+        """Test table output"""
+        summary = DriverMetrics.summarize([{'browser': 'firefox', 'phase': 'spawn', 'seconds': 1.25}])
+        lines = DriverMetrics.format_summary(summary)
+
+        assert 'p95' in lines[0]
+        assert lines[1].split()[:3] == ['firefox', 'spawn', '1']
+
+
+class TestLocalDriverTiming:
+    """Unit tests for spawn/handshake split in WebDriverManager"""
+
+    def test_spawn_and_handshake_are_split(self):
+        """Test service start is timed separately from session creation"""
+        class FakeService:
+            def __init__(self, path):
+                self.path = path
+
+            def start(self):
+                time.sleep(0.05)
+
+        def fake_driver(service, options):
+            service.start()
+            time.sleep(0.02)
+            return Mock()
+
+        metrics = DriverMetrics()
+        with patch('framework.webdriver_manager.driver_metrics', metrics):
+            WebDriverManager._start_local_driver('chrome', fake_driver, '/bin/chromedriver', FakeService, Mock())
+
+        phases = {r['phase']: r['seconds'] for r in metrics.records}
+        assert phases['spawn'] >= 0.05
+        assert 0.02 <= phases['handshake'] < 0.05
+
+    def test_browser_name(self):
+        """Test capability names map to short browser names"""
+        driver = Mock()
+        driver.capabilities = {'browserName': 'MicrosoftEdge'}
+        assert WebDriverManager.get_browser_name(driver) == 'edge'
+        driver.capabilities = {'browserName': 'firefox'}
+        assert WebDriverManager.get_browser_name(driver) == 'firefox'
@@ -0,0 +1,243 @@
+"""
+Unit Tests for Driver Pool
+Tests lease/release semantics and state reset without a real browser
+"""
+import pytest
+import time
+from unittest.mock import MagicMock, Mock, call
+from framework.driver_pool import DriverPool
+from framework.webdriver_manager import WebDriverManager
+
+
+def make_driver(handles=None):
+    """Create a mock driver with the given window handles"""
+    driver = Mock()
+    driver.window_handles = handles or ["main"]
+    return driver
+
+
+class TestDriverPool:
+    """Unit tests for DriverPool class"""
+
+    def test_lease_creates_driver_when_empty(self):
+        """Test leasing from an empty pool uses the factory"""
+        driver = make_driver()
+        pool = DriverPool(lambda: driver)
+
+        assert pool.lease() is driver
+        assert pool.stats['created'] == 1
+        assert pool.leased == [driver]
+
+    def test_release_and_reuse(self):
+        """Test a released driver is handed out again"""
+        factory = Mock(side_effect=[make_driver(), make_driver()])
+        pool = DriverPool(factory)
+
+        first = pool.lease()
+        pool.release(first)
+        second = pool.lease()
+
+        assert second is first
+        assert factory.call_count == 1
+        assert pool.stats['reused'] == 1
+
+    def test_release_resets_state(self):
+        """Test release clears cookies and navigates to blank page"""
+        driver = make_driver(["main", "popup"])
+        pool = DriverPool(lambda: driver)
+
+        pool.release(pool.lease())
+
+        driver.close.assert_called_once()
+        driver.delete_all_cookies.assert_called_once()
+        driver.get.assert_called_with('about:blank')
+        assert pool.idle == [driver]
+
+    def test_release_discards_on_reset_failure(self):
+        """Test a driver that cannot be reset is quit"""
+        driver = make_driver()
+        driver.delete_all_cookies.side_effect = Exception("session deleted")
+        pool = DriverPool(lambda: driver)
+
+        pool.release(pool.lease())
+
+        driver.quit.assert_called_once()
+        assert pool.idle == []
+
+    def test_release_clears_cookies_for_every_origin(self):
+        """Test Chrome drops every origin's cookies over DevTools"""
+        driver = make_driver()
+        pool = DriverPool(lambda: driver)
+
+        pool.release(pool.lease())
+
+        driver.execute_cdp_cmd.assert_called_once_with('Network.clearBrowserCookies', {})
+        assert pool.idle == [driver]
+
+    def test_firefox_cookies_cleared_in_chrome_context(self):
+        """Test Firefox empties the cookie service from the privileged context"""
+        driver = Mock(spec=['window_handles', 'current_window_handle', 'switch_to', 'close', 'delete_all_cookies',
+                            'execute_script', 'get', 'implicitly_wait', 'quit', 'context', 'CONTEXT_CHROME'])
+        driver.window_handles = ["main"]
+        driver.CONTEXT_CHROME = 'chrome'
+        driver.context = MagicMock()
+        pool = DriverPool(lambda: driver)
+
+        pool.release(pool.lease())
+
+        driver.context.assert_called_once_with('chrome')
+        driver.execute_script.assert_any_call("Services.cookies.removeAll();")
+        assert pool.idle == [driver]
+
+    @pytest.mark.parametrize("browser, endpoint", [('chrome', 'goog'), ('MicrosoftEdge', 'ms')])
+    def test_remote_chromium_cookies_cleared_through_grid(self, browser, endpoint):
+        """Test a remote Chrome or Edge session clears cookies over the grid's CDP endpoint and is reused"""
+        driver = Mock(spec=['window_handles', 'current_window_handle', 'switch_to', 'close', 'delete_all_cookies',
+                            'execute_script', 'get', 'implicitly_wait', 'quit', 'execute', 'command_executor',
+                            'capabilities'])
+        driver.window_handles = ["main"]
+        driver.capabilities = {'browserName': browser}
+        driver.command_executor._commands = {}
+        pool = DriverPool(lambda: driver)
+
+        pool.release(pool.lease())
+
+        assert driver.command_executor._commands['executeCdpCommand'] == (
+            'POST', f"/session/$sessionId/{endpoint}/cdp/execute")
+        driver.execute.assert_called_once_with('executeCdpCommand',
+                                               {'cmd': 'Network.clearBrowserCookies', 'params': {}})
+        assert pool.idle == [driver]
+
+    def test_remote_firefox_cookies_cleared_in_chrome_context(self):
+        """Test a remote Firefox session switches context with raw commands and is reused"""
+        driver = Mock(spec=['window_handles', 'current_window_handle', 'switch_to', 'close', 'delete_all_cookies',
+                            'execute_script', 'get', 'implicitly_wait', 'quit', 'execute', 'command_executor',
+                            'capabilities'])
+        driver.window_handles = ["main"]
+        driver.capabilities = {'browserName': 'firefox'}
+        pool = DriverPool(lambda: driver)
+
+        pool.release(pool.lease())
+
+        assert driver.execute.call_args_list == [call('SET_CONTEXT', {'context': 'chrome'}),
+                                                 call('SET_CONTEXT', {'context': 'content'})]
+        driver.execute_script.assert_any_call("Services.cookies.removeAll();")
+        assert pool.idle == [driver]
+
+    def test_driver_without_full_cookie_clear_is_discarded(self):
+        """Test a browser that can only clear the current origin is not reused"""
+        driver = Mock(spec=['window_handles', 'current_window_handle', 'switch_to', 'close', 'delete_all_cookies',
+                            'execute_script', 'get', 'implicitly_wait', 'quit'])
+        driver.window_handles = ["main"]
+        pool = DriverPool(lambda: driver)
+
+        pool.release(pool.lease())
+
+        driver.quit.assert_called_once()
+        assert pool.idle == []
+
+    def test_release_over_capacity_quits_driver(self):
+        """Test drivers beyond max_idle are not kept"""
+        factory = Mock(side_effect=[make_driver(), make_driver()])
+        pool = DriverPool(factory, max_idle=1)
+
+        first = pool.lease()
+        second = pool.lease()
+        pool.release(first)
+        pool.release(second)
+
+        assert pool.idle == [first]
+        second.quit.assert_called_once()
+
+    def test_dead_driver_is_replaced(self):
+        """Test an idle driver whose session died is not leased"""
+        dead = make_driver()
+        fresh = make_driver()
+        pool = DriverPool(lambda: fresh)
+        pool.idle.append(dead)
+        type(dead).window_handles = property(Mock(side_effect=Exception("gone")))
+
+        assert pool.lease() is fresh
+        dead.quit.assert_called_once()
+
+    def test_close_quits_all(self):
+        """Test closing the pool quits idle and leased drivers"""
+        factory = Mock(side_effect=[make_driver(), make_driver()])
+        pool = DriverPool(factory, max_idle=2)
+
+        idle = pool.lease()
+        leased = pool.lease()
+        pool.release(idle)
+        pool.close()
+
+        idle.quit.assert_called_once()
+        leased.quit.assert_called_once()
+        assert pool.idle == [] and pool.leased == []
+
+
+class TestDriverPrewarm:
+    """Unit tests for background pre-warming"""
+
+    def test_prewarm_fills_idle_list(self):
+        """Test pre-warmed drivers are available for lease"""
+        pool = DriverPool(make_driver, max_idle=2)
+
+        for thread in pool.prewarm(2):
+            thread.join()
+
+        assert len(pool.idle) == 2
+        assert pool.pending == 0
+        assert pool.stats['prewarmed'] == 2
+
+    def test_lease_waits_for_pending_prewarm(self):
+        """Test lease takes the in-flight driver instead of spawning another"""
+        calls = []
+
+        def slow_factory():
+            time.sleep(0.1)
+            calls.append(1)
+            return make_driver()
+
+        pool = DriverPool(slow_factory)
+        pool.prewarm(1)
+        driver = pool.lease()
+
+        assert driver is not None
+        assert len(calls) == 1
+        assert pool.stats['reused'] == 1
+
+    def test_failed_prewarm_falls_back_to_spawn(self):
+        """Test lease spawns a driver when pre-warming failed"""
+        factory = Mock(side_effect=[Exception("no browser"), make_driver()])
+        pool = DriverPool(factory)
+
+        for thread in pool.prewarm(1):
+            thread.join()
+
+        assert pool.lease() is not None
+        assert factory.call_count == 2
+
+    def test_prewarm_after_close_quits_driver(self):
+        """Test a driver finishing after close is not kept"""
+        driver = make_driver()
+        pool = DriverPool(lambda: driver)
+        pool.close()
+
+        for thread in pool.prewarm(1):
+            thread.join()
+
+        driver.quit.assert_called_once()
+        assert pool.idle == []
+
+
+class TestWorkerIndex:
+    """Unit tests for xdist worker detection"""
+
+    @pytest.mark.parametrize("worker_id,expected", [("gw0", 0), ("gw3", 3), ("gw12", 12), ("master", 0)])
+    def test_worker_index(self, worker_id, expected):
+        """Test worker id parsing"""
+        assert WebDriverManager.get_worker_index(worker_id) == expected
+
+    def test_prewarm_disabled_by_default(self):
+        """Test no drivers are started for a zero count"""
+        assert WebDriverManager.prewarm_drivers(0) == []
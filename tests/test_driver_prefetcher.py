@@ -0,0 +1,135 @@
+"""
+Unit Tests for Driver Prefetcher
+Tests background spawning, queue bounds and hit/miss metrics
+"""
+import time
+from unittest.mock import Mock, patch
+from framework.driver_prefetcher import DriverPrefetcher
+from framework.webdriver_manager import WebDriverManager
+
+
+def make_driver():
+    """Create a mock driver with one window"""
+    driver = Mock()
+    driver.window_handles = ["main"]
+    return driver
+
+
+def wait_until(condition, timeout=2):
+    """Poll until condition is true"""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestDriverPrefetcher:
+    """Unit tests for DriverPrefetcher class"""
+
+    def test_queue_fills_to_depth(self):
+        """Test spawner stops at the configured depth"""
+        factory = Mock(side_effect=lambda: make_driver())
+        prefetcher = DriverPrefetcher(factory, depth=2).start()
+        try:
+            assert wait_until(lambda: prefetcher.ready == 2)
+            time.sleep(0.1)
+            assert factory.call_count == 2
+        finally:
+            prefetcher.stop()
+
+    def test_take_is_a_hit_and_queue_refills(self):
+        """Test taking a queued driver and the queue being topped up"""
+        factory = Mock(side_effect=lambda: make_driver())
+        prefetcher = DriverPrefetcher(factory, depth=1).start()
+        try:
+            assert wait_until(lambda: prefetcher.ready == 1)
+            assert prefetcher.take() is not None
+            assert prefetcher.stats['hits'] == 1
+            assert wait_until(lambda: prefetcher.ready == 1)
+            assert factory.call_count == 2
+        finally:
+            prefetcher.stop()
+
+    def test_take_on_empty_queue_is_a_miss(self):
+        """Test a take before anything is ready spawns synchronously"""
+        driver = make_driver()
+        prefetcher = DriverPrefetcher(lambda: driver, depth=1)
+
+        assert prefetcher.take() is driver
+        assert prefetcher.stats['misses'] == 1
+        assert prefetcher.hit_rate() == 0.0
+
+    def test_dead_queued_driver_is_skipped(self):
+        """Test a browser that died in the queue is replaced"""
+        dead = Mock()
+        type(dead).window_handles = property(Mock(side_effect=Exception("gone")))
+        fresh = make_driver()
+        prefetcher = DriverPrefetcher(lambda: fresh, depth=1)
+        prefetcher._queue.put_nowait(dead)
+
+        assert prefetcher.take() is fresh
+        assert prefetcher.stats['stale'] == 1
+        dead.quit.assert_called_once()
+
+    def test_stop_quits_queued_drivers(self):
+        """Test session end cleanup"""
+        drivers = []
+
+        def factory():
+            drivers.append(make_driver())
+            return drivers[-1]
+
+        prefetcher = DriverPrefetcher(factory, depth=2).start()
+        assert wait_until(lambda: prefetcher.ready == 2)
+        prefetcher.stop()
+
+        assert prefetcher.ready == 0
+        for driver in drivers:
+            driver.quit.assert_called_once()
+
+    def test_stop_uses_quitter(self):
+        """Test queued drivers go through the injected quitter"""
+        quitter = Mock()
+        prefetcher = DriverPrefetcher(lambda: make_driver(), depth=1, quitter=quitter).start()
+        assert wait_until(lambda: prefetcher.ready == 1)
+        prefetcher.stop()
+
+        quitter.assert_called_once()
+        quitter.call_args[0][0].quit.assert_not_called()
+
+    def test_spawn_failures_are_counted(self):
+        """Test failed spawns back off instead of spinning"""
+        factory = Mock(side_effect=Exception("no browser"))
+        prefetcher = DriverPrefetcher(factory, depth=1, retry_delay=10).start()
+        try:
+            assert wait_until(lambda: prefetcher.stats['spawn_failures'] == 1)
+            time.sleep(0.1)
+            assert factory.call_count == 1
+        finally:
+            prefetcher.stop()
+
+
+class TestFreshDriver:
+    """Unit tests for WebDriverManager fresh driver selection"""
+
+    def test_fresh_driver_without_prefetch(self):
+        """Test create_driver is used when prefetching is off"""
+        driver = make_driver()
+        with patch.object(WebDriverManager, 'create_driver', return_value=driver):
+            assert WebDriverManager.create_fresh_driver() is driver
+        assert WebDriverManager.get_prefetch_stats() is None
+
+    def test_fresh_driver_from_prefetch_queue(self):
+        """Test prefetched drivers are handed out and cleaned up"""
+        with patch.object(WebDriverManager, 'create_driver', side_effect=lambda: make_driver()):
+            prefetcher = WebDriverManager.start_prefetch(1)
+            try:
+                assert wait_until(lambda: prefetcher.ready == 1)
+                assert WebDriverManager.create_fresh_driver() is not None
+                assert WebDriverManager.get_prefetch_stats()['hits'] == 1
+                assert prefetcher.quitter == WebDriverManager.quit_driver
+            finally:
+                WebDriverManager.stop_prefetch()
+        assert WebDriverManager.get_prefetch_stats() is None
@@ -0,0 +1,224 @@
+"""
+Unit Tests for Driver Reaper
+Uses short-lived local processes in place of drivers and browsers
+"""
+import pytest
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from unittest.mock import Mock, patch
+from framework.driver_reaper import DriverReaper, OWNER_ENV, find_owned_processes, get_children, kill_process_tree
+from framework.driver_pool import DriverPool
+from framework.driver_metrics import DriverMetrics
+from framework.webdriver_manager import WebDriverManager
+from config.config import Config
+
+
+needs_proc = pytest.mark.skipif(not os.path.isdir('/proc'), reason="process scan needs /proc")
+
+
+def spawn_tree():
+    """Start a shell with a sleeping child, like a driver with its browser"""
+    process = subprocess.Popen(['sh', '-c', 'sleep 30 & wait'])
+    deadline = time.time() + 5
+    while not get_children(process.pid) and time.time() < deadline:
+        time.sleep(0.02)
+    return process
+
+
+def fake_driver(pid=None, quit_delay=0.0, hang=False):
+    """Driver mock whose quit takes a while or never returns"""
+    driver = Mock()
+    driver.service.process.pid = pid
+    released = threading.Event()
+
+    def quit():
+        if hang:
+            released.wait(30)
+        time.sleep(quit_delay)
+
+    driver.quit.side_effect = quit
+    driver.released = released
+    return driver
+
+
+def is_gone(pid):
+    """Check a process has exited (zombies count as gone)"""
+    try:
+        with open(f'/proc/{pid}/stat', 'r') as f:
+            return f.read().rsplit(')', 1)[1].split()[0] == 'Z'
+    except OSError:
+        return True
+
+
+class TestDriverReaper:
+    """Unit tests for DriverReaper class"""
+
+    def test_quit_does_not_block(self):
+        """Test the caller returns before the quit finishes"""
+        timings = []
+        reaper = DriverReaper(on_quit=lambda browser, seconds: timings.append((browser, seconds)))
+        driver = fake_driver(quit_delay=0.3)
+
+        started = time.perf_counter()
+        reaper.quit_async(driver, 'firefox')
+        assert time.perf_counter() - started < 0.1
+
+        reaper.flush()
+        assert reaper.stats['quit'] == 1
+        assert timings[0][0] == 'firefox'
+        assert timings[0][1] >= 0.3
+
+    def test_quits_run_in_parallel(self):
+        """Test a batch of quits overlaps instead of queueing one by one"""
+        reaper = DriverReaper(workers=4)
+        started = time.perf_counter()
+        for _ in range(4):
+            reaper.quit_async(fake_driver(quit_delay=0.2))
+        reaper.flush()
+        assert time.perf_counter() - started < 0.6
+
+    def test_failing_quit_is_counted(self):
+        """Test an exception in quit doesn't escape the pool"""
+        reaper = DriverReaper()
+        driver = Mock()
+        driver.quit.side_effect = Exception("session deleted")
+
+        reaper.quit_async(driver).result(timeout=5)
+        assert reaper.stats['quit'] == 1
+
+    @needs_proc
+    def test_hanging_quit_kills_process_tree(self):
+        """Test the driver and its children are killed after the deadline"""
+        process = spawn_tree()
+        child = get_children(process.pid)[0]
+        reaper = DriverReaper(quit_timeout=0.2)
+        driver = fake_driver(pid=process.pid, hang=True)
+
+        reaper.quit_async(driver).result(timeout=5)
+        driver.released.set()
+
+        assert process.wait(timeout=5) is not None
+        assert is_gone(child)
+        assert reaper.stats['killed'] == 1
+
+    @needs_proc
+    def test_reap_registered_drivers(self):
+        """Test drivers never quit are killed at the end"""
+        process = spawn_tree()
+        reaper = DriverReaper()
+        reaper.register(fake_driver(pid=process.pid))
+        reaper.register(Mock(spec=['quit']))  # remote drivers have no local process
+
+        assert reaper.reap() == 1
+        assert process.wait(timeout=5) is not None
+
+    @needs_proc
+    def test_quit_driver_is_forgotten(self):
+        """Test a cleanly quit driver is not reaped again"""
+        reaper = DriverReaper()
+        driver = fake_driver(pid=os.getpid())
+        reaper.register(driver)
+        reaper.quit_async(driver).result(timeout=5)
+
+        assert reaper.service_pids == {}
+
+    @needs_proc
+    def test_reused_pid_is_not_killed(self):
+        """Test a registered PID now held by another process survives the sweep"""
+        process = spawn_tree()
+        reaper = DriverReaper()
+        reaper.register(fake_driver(pid=process.pid))
+        try:
+            # Same PID, different start time: the driver exited and the PID was recycled
+            with patch('framework.driver_reaper.process_start_time', return_value=-1):
+                assert reaper.reap() == 0
+            assert process.poll() is None
+        finally:
+            kill_process_tree(process.pid)
+            process.wait(timeout=5)
+
+
+@needs_proc
+class TestOrphanScan:
+    """Tests for finding leftover processes by owner marker"""
+
+    @pytest.fixture
+    def fake_chromedriver(self, tmp_path):
+        """Copy of sleep named like a driver binary"""
+        binary = tmp_path / "chromedriver"
+        shutil.copy(shutil.which('sleep'), binary)
+        return str(binary)
+
+    def test_owned_processes_are_found(self, fake_chromedriver):
+        """Test only processes carrying our marker match"""
+        ours = subprocess.Popen([fake_chromedriver, '30'], env=dict(os.environ, **{OWNER_ENV: 'run1:gw0'}))
+        theirs = subprocess.Popen([fake_chromedriver, '30'], env=dict(os.environ, **{OWNER_ENV: 'run2:gw0'}))
+        try:
+            time.sleep(0.1)
+            assert find_owned_processes('run1:') == [ours.pid]
+            assert find_owned_processes('run1:gw1') == []
+
+            DriverReaper().reap('run1:')
+            assert ours.wait(timeout=5) is not None
+            assert theirs.poll() is None
+        finally:
+            kill_process_tree(theirs.pid)
+            theirs.wait(timeout=5)
+
+    def test_other_process_names_are_ignored(self):
+        """Test pytest workers sharing the marker are never matched"""
+        process = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)'],
+                                   env=dict(os.environ, **{OWNER_ENV: 'run3:gw0'}))
+        try:
+            time.sleep(0.1)
+            assert find_owned_processes('run3:') == []
+        finally:
+            process.kill()
+            process.wait(timeout=5)
+
+
+class TestManagedTeardown:
+    """Tests for teardown through WebDriverManager and DriverPool"""
+
+    @pytest.fixture(autouse=True)
+    def isolated_reaper(self):
+        """Use a private reaper and metrics"""
+        metrics = DriverMetrics()
+        with patch.object(WebDriverManager, '_reaper', None), \
+                patch('framework.webdriver_manager.driver_metrics', metrics):
+            yield metrics
+
+    def test_quit_driver_records_timing(self, isolated_reaper):
+        """Test background quits still report the quit phase"""
+        driver = fake_driver(quit_delay=0.05)
+        driver.capabilities = {'browserName': 'chrome'}
+
+        WebDriverManager.quit_driver(driver)
+        WebDriverManager.flush_quits()
+
+        assert isolated_reaper.records[0]['browser'] == 'chrome'
+        assert isolated_reaper.records[0]['phase'] == 'quit'
+
+    def test_sync_quit(self, isolated_reaper):
+        """Test ASYNC_QUIT=false quits in the caller"""
+        driver = fake_driver()
+        with patch.object(Config, 'ASYNC_QUIT', False):
+            WebDriverManager.quit_driver(driver)
+        driver.quit.assert_called_once()
+        assert WebDriverManager._reaper is None
+
+    def test_pool_uses_quitter(self):
+        """Test pooled drivers are quit through the pool's quitter"""
+        quitter = Mock()
+        pool = DriverPool(Mock(), max_idle=1, quitter=quitter)
+        driver = Mock()
+
+        pool.discard(driver)
+        pool.close()
+
+        quitter.assert_called_once_with(driver)
+        driver.quit.assert_not_called()
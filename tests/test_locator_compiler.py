@@ -0,0 +1,139 @@
+"""
+Unit Tests for Locator Compiler
+Tests validation, XPath to CSS/ID translation and the locator class decorator
+"""
+import pytest
+from unittest.mock import patch
+from selenium.webdriver.common.by import By
+from framework.locator_compiler import compile_locator, compile_locators, optimize_locators, report_lines
+from pages.locators.testmoz_home_locators import TestmozHomeLocators
+from pages.locators.testmoz_demo_locators import TestmozDemoLocators
+from config.config import Config
+
+
+class TestTranslation:
+    """Unit tests for XPath to CSS translation"""
+
+    @pytest.mark.parametrize("xpath,expected", [
+        ("//h1", (By.CSS_SELECTOR, "h1")),
+        ("//ul/li", (By.CSS_SELECTOR, "ul > li")),
+        ("//div//span", (By.CSS_SELECTOR, "div span")),
+        ("//input[@type='radio']", (By.CSS_SELECTOR, "input[type='radio']")),
+        ("//div[contains(@class, 'question')]", (By.CSS_SELECTOR, "div[class*='question']")),
+        ("//a[starts-with(@href, 'http')]", (By.CSS_SELECTOR, "a[href^='http']")),
+        ("//input[@name='q' and @disabled]", (By.CSS_SELECTOR, "input[name='q'][disabled]")),
+        ("//*[@data-id='7']/span", (By.CSS_SELECTOR, "[data-id='7'] > span")),
+        ("//*[@id='main']", (By.ID, "main")),
+        ("//input[@value=\"it's\"]", (By.CSS_SELECTOR, "input[value=\"it's\"]")),
+    ])
+    def test_structural_xpath_translated(self, xpath, expected):
+        """Test tags, attributes and child/descendant steps become CSS"""
+        compiled = compile_locator((By.XPATH, xpath))
+        assert compiled.status == 'translated'
+        assert compiled.locator == expected
+        assert compiled.original == (By.XPATH, xpath)
+
+    @pytest.mark.parametrize("xpath", [
+        "//button[contains(text(), 'Next')]",
+        "//a[normalize-space()='Home']",
+        "//a[contains(., 'Home')]",
+        "//li[2]",
+        "//li[last()]",
+        "//div[@a or @b]",
+        "//div/following-sibling::p",
+        "/html/body",
+        "(//a)[1]",
+    ])
+    def test_untranslatable_xpath_kept(self, xpath):
+        """Test text matches, positions and axes stay XPath"""
+        compiled = compile_locator((By.XPATH, xpath))
+        assert compiled.status == 'kept'
+        assert compiled.locator == (By.XPATH, xpath)
+        assert compiled.issues
+
+    def test_css_operator_in_xpath_invalid(self):
+        """Test @class*= is flagged with the CSS it was meant to be"""
+        compiled = compile_locator((By.XPATH, "//div[@class*='progress-bar']"))
+        assert compiled.status == 'invalid'
+        assert not compiled.valid
+        assert compiled.locator == (By.XPATH, "//div[@class*='progress-bar']")
+        assert compiled.suggestion == (By.CSS_SELECTOR, "div[class*='progress-bar']")
+        assert "never matches" in compiled.issues[0]
+
+    @pytest.mark.parametrize("locator,issue", [
+        ((By.XPATH, "//div[@class='x'"), "unbalanced brackets"),
+        ((By.CSS_SELECTOR, "a[href='x]"), "unterminated string"),
+        (("jquery", "#main"), "unknown strategy 'jquery'"),
+        ((By.ID, ""), "empty selector"),
+        ((By.ID,), "expected a (strategy, value) pair"),
+    ])
+    def test_malformed_locators_invalid(self, locator, issue):
+        """Test broken tuples and selectors are rejected"""
+        compiled = compile_locator(locator)
+        assert compiled.status == 'invalid'
+        assert compiled.issues == [issue]
+
+    def test_fast_strategies_untouched(self):
+        """Test CSS, ID and link text pass through"""
+        for locator in [(By.ID, "x"), (By.CSS_SELECTOR, ".a"), (By.LINK_TEXT, "Home")]:
+            compiled = compile_locator(locator)
+            assert compiled.status == 'ok'
+            assert compiled.locator == locator
+
+    def test_broad_locators_flagged(self):
+        """Test locators without predicates are marked broad"""
+        assert compile_locator((By.XPATH, "//label")).broad
+        assert compile_locator((By.XPATH, "//ul/li")).broad
+        assert compile_locator((By.TAG_NAME, "h1")).broad
+        assert not compile_locator((By.XPATH, "//input[@type='text']")).broad
+
+
+class TestLocatorClasses:
+    """Unit tests for the locator class decorator and the Testmoz locators"""
+
+    def test_decorator_replaces_translated(self):
+        """Test translated locators are swapped and originals kept"""
+        with patch.object(Config, 'OPTIMIZE_LOCATORS', True):
+            @optimize_locators
+            class Locators:
+                TITLE = (By.XPATH, "//h1")
+                NEXT = (By.XPATH, "//button[contains(text(), 'Next')]")
+                HOME = (By.LINK_TEXT, "Home")
+
+        assert Locators.TITLE == (By.CSS_SELECTOR, "h1")
+        assert Locators.NEXT == (By.XPATH, "//button[contains(text(), 'Next')]")
+        assert Locators.HOME == (By.LINK_TEXT, "Home")
+        assert Locators.ORIGINAL_LOCATORS == {'TITLE': (By.XPATH, "//h1")}
+
+    def test_decorator_disabled(self):
+        """Test OPTIMIZE_LOCATORS=false leaves the class as written"""
+        with patch.object(Config, 'OPTIMIZE_LOCATORS', False):
+            @optimize_locators
+            class Locators:
+                TITLE = (By.XPATH, "//h1")
+
+        assert Locators.TITLE == (By.XPATH, "//h1")
+        assert Locators.ORIGINAL_LOCATORS == {}
+
+    @pytest.mark.parametrize("locators", [TestmozHomeLocators, TestmozDemoLocators])
+    def test_testmoz_locators_valid(self, locators):
+        """Test no Testmoz locator is malformed or can never match"""
+        invalid = {name: compiled.issues for name, compiled in compile_locators(locators).items()
+                   if not compiled.valid}
+        assert invalid == {}
+
+    def test_testmoz_locators_compiled(self):
+        """Test structural demo locators are already CSS at import"""
+        if not Config.OPTIMIZE_LOCATORS:
+            pytest.skip("OPTIMIZE_LOCATORS is off")
+        assert TestmozDemoLocators.ANSWER_OPTION == (By.CSS_SELECTOR, "label")
+        assert TestmozDemoLocators.ORIGINAL_LOCATORS['ANSWER_OPTION'] == (By.XPATH, "//label")
+        assert TestmozHomeLocators.FEATURES_LIST == (By.CSS_SELECTOR, "ul > li")
+
+    def test_report_shows_original_and_translation(self):
+        """Test report lines describe each locator from its source form"""
+        lines = report_lines(TestmozDemoLocators)
+        answer = next(line for line in lines if '.ANSWER_OPTION:' in line)
+        assert answer.startswith('translated')
+        assert "//label -> css selector: label" in answer
+        assert "broad" in answer
@@ -0,0 +1,169 @@
+"""
+Unit Tests for Locator Profiler
+Tests recording, merging worker profiles, ranking and BasePage instrumentation
+"""
+import pytest
+from unittest.mock import Mock, patch
+from selenium.webdriver.common.by import By
+from framework.base_page import BasePage
+from framework.locator_profiler import LocatorProfiler
+from framework.adaptive_wait import LocatorLatencyStats
+from config.config import Config
+
+
+FEATURES = (By.CSS_SELECTOR, "ul > li")
+NEXT = (By.XPATH, "//button[contains(text(), 'Next')]")
+SCORE = (By.CSS_SELECTOR, "span.score")
+
+
+@pytest.fixture
+def profiler():
+    """Fresh profiler patched into BasePage with profiling on"""
+    profiler = LocatorProfiler()
+    with patch.object(Config, 'PROFILE_LOCATORS', True), patch.object(Config, 'EXPLICIT_WAIT', 1), \
+            patch.object(Config, 'PROBE_TIMEOUT', 0.05), patch('framework.base_page.locator_profiler', profiler):
+        yield profiler
+
+
+@pytest.fixture(autouse=True)
+def isolated_wait_stats(tmp_path):
+    """Keep mocked latencies out of the shared wait stats file"""
+    with patch('framework.base_page.locator_latency', LocatorLatencyStats(str(tmp_path / "wait_stats.json"))):
+        yield
+
+
+class QuizPage(BasePage):
+    """Page object whose method names show up as callers"""
+    def click_next(self):
+        self.find_element(NEXT).click()
+
+    def get_features(self):
+        return self.find_elements(FEATURES)
+
+    def get_score(self):
+        return self.probe_text(SCORE)
+
+
+def make_driver(elements):
+    """Driver whose find_elements returns the given elements"""
+    driver = Mock()
+    driver.find_elements.return_value = elements
+    driver.find_element.side_effect = lambda *locator: elements[0] if elements else None
+    return driver
+
+
+class TestLocatorProfiler:
+    """Unit tests for LocatorProfiler class"""
+
+    def test_record_aggregates(self):
+        """Test lookups of one locator add up"""
+        profiler = LocatorProfiler()
+        profiler.record(NEXT, 0.2, 1, caller='QuizPage.click_next')
+        profiler.record(NEXT, 0.4, 1, caller='QuizPage.click_next')
+        profiler.record(NEXT, 1.0, 0, timed_out=True, caller='QuizPage.finish')
+
+        entry = profiler.entries["xpath=//button[contains(text(), 'Next')]"]
+        assert entry['lookups'] == 3
+        assert entry['timeouts'] == 1
+        assert entry['total_seconds'] == 1.6
+        assert entry['samples'] == [0.2, 0.4]
+        assert entry['callers'] == {'QuizPage.click_next': 2, 'QuizPage.finish': 1}
+
+    def test_workers_merged(self, tmp_path):
+        """Test profiles from several workers combine"""
+        for worker, seconds in (('gw0', 0.1), ('gw1', 0.3)):
+            profiler = LocatorProfiler()
+            profiler.record(FEATURES, seconds, 150 if worker == 'gw1' else 120, caller=worker)
+            profiler.write(str(tmp_path), worker)
+
+        entry = LocatorProfiler.load_all(str(tmp_path))["css selector=ul > li"]
+        assert entry['lookups'] == 2
+        assert entry['max_matches'] == 150
+        assert entry['total_matches'] == 270
+        assert entry['callers'] == {'gw0': 1, 'gw1': 1}
+
+    def test_rank(self):
+        """Test the report ranks slow, broad and never-found locators"""
+        profiler = LocatorProfiler()
+        profiler.record(NEXT, 2.0, 1, caller='QuizPage.click_next')
+        profiler.record(FEATURES, 0.1, 300, caller='HomePage.get_features')
+        profiler.record(SCORE, 0.5, 0, timed_out=True, caller='QuizPage.get_score')
+        profiler.record(SCORE, 0.5, 0, timed_out=True, caller='QuizPage.get_score')
+
+        report = LocatorProfiler.rank(profiler.entries, broad_matches=100)
+        assert [row['locator'] for row in report['slowest']] == [
+            "xpath=//button[contains(text(), 'Next')]", "css selector=ul > li"]
+        assert [row['locator'] for row in report['broad']] == ["css selector=ul > li"]
+        assert report['never_found'][0]['locator'] == "css selector=span.score"
+        assert report['never_found'][0]['timeouts'] == 2
+        assert report['never_found'][0]['callers'] == ['QuizPage.get_score']
+
+    def test_format_and_write_report(self, tmp_path):
+        """Test the summary lines and JSON report"""
+        profiler = LocatorProfiler()
+        profiler.record(FEATURES, 0.1, 300, caller='HomePage.get_features')
+        report = LocatorProfiler.rank(profiler.entries)
+
+        lines = LocatorProfiler.format_report(report)
+        assert any("ul > li" in line and "HomePage.get_features" in line for line in lines)
+        path = tmp_path / "reports" / "profile.json"
+        LocatorProfiler.write_report(report, str(path))
+        assert path.exists()
+
+
+class TestBasePageProfiling:
+    """Unit tests for lookups recorded by BasePage"""
+
+    def test_off_by_default_records_nothing(self):
+        """Test nothing is recorded without PROFILE_LOCATORS"""
+        profiler = LocatorProfiler()
+        with patch.object(Config, 'PROFILE_LOCATORS', False), patch('framework.base_page.locator_profiler', profiler):
+            QuizPage(make_driver([Mock()])).get_features()
+
+        assert profiler.entries == {}
+
+    def test_caller_and_matches_recorded(self, profiler):
+        """Test a wait records the page-object method and the match count"""
+        driver = make_driver([Mock(), Mock()])
+        QuizPage(driver).click_next()
+
+        entry = profiler.entries["xpath=//button[contains(text(), 'Next')]"]
+        assert entry['callers'] == {'QuizPage.click_next': 1}
+        assert entry['max_matches'] == 2
+        assert entry['timeouts'] == 0
+
+    def test_timeout_recorded(self, profiler):
+        """Test a wait that gives up counts as a timeout"""
+        page = QuizPage(make_driver([]))
+        assert not page.is_element_present(NEXT)
+
+        entry = profiler.entries["xpath=//button[contains(text(), 'Next')]"]
+        assert entry['timeouts'] == 1
+        assert entry['samples'] == []
+
+    def test_empty_probe_is_timeout(self, profiler):
+        """Test a probe that found nothing counts as a timeout"""
+        assert QuizPage(make_driver([])).get_score() is None
+
+        entry = profiler.entries["css selector=span.score"]
+        assert entry['timeouts'] == 1
+        assert entry['callers'] == {'QuizPage.get_score': 1}
+
+    def test_find_elements_empty_not_timeout(self, profiler):
+        """Test find_elements doesn't wait, so no matches is not a timeout"""
+        assert QuizPage(make_driver([])).get_features() == []
+
+        entry = profiler.entries["css selector=ul > li"]
+        assert entry['timeouts'] == 0
+        assert entry['max_matches'] == 0
+
+    def test_bulk_read_records_each_locator(self, profiler):
+        """Test one script call records every locator it read"""
+        driver = Mock()
+        driver.execute_script.return_value = [{'count': 250}, {'count': 1}]
+        BasePage(driver).bulk_read({'features': FEATURES, 'next': NEXT})
+
+        assert profiler.entries["css selector=ul > li"]['max_matches'] == 250
+        assert profiler.entries["xpath=//button[contains(text(), 'Next')]"]['lookups'] == 1
+        assert profiler.entries["css selector=ul > li"]['callers'] == {
+            'test_locator_profiler.py::test_bulk_read_records_each_locator': 1}
@@ -0,0 +1,181 @@
+"""
+Unit Tests for Page Replay
+Tests asset discovery, the versioned fixture store, recording and the replay server
+"""
+import os
+import pytest
+import time
+import urllib.error
+import urllib.request
+from unittest.mock import patch
+from framework.page_replay import (FixtureStore, PageRecorder, ReplayServer, find_assets, load_visits,
+                                   note_visit, page_object_urls, write_visits)
+from framework.quiz_server import QuizServer
+from config.config import Config
+
+
+HOME = """<html><head>
+<link rel="stylesheet" href="/css/app.css">
+<link rel="icon" href="/favicon.png">
+<link rel="canonical" href="https://testmoz.com/">
+<script src="https://cdn.example.com/lib.js"></script>
+</head><body style="background: url('/img/bg.png')">
+<a href="/pricing">Pricing</a>
+<img src="data:image/png;base64,AAAA">
+<img src="logo.svg#icon">
+<a href="https://testmoz.com/101555">Demo</a>
+</body></html>"""
+
+SITE = {
+    "https://testmoz.com/": (200, "text/html; charset=utf-8", HOME.encode()),
+    "https://testmoz.com/css/app.css": (200, "text/css", b"@font-face { src: url(../fonts/a.woff2) }"),
+    "https://testmoz.com/favicon.png": (200, "image/png", b"\x89PNG"),
+    "https://testmoz.com/img/bg.png": (200, "image/png", b"\x89PNG"),
+    "https://testmoz.com/logo.svg": (200, "image/svg+xml", b"<svg/>"),
+    "https://testmoz.com/fonts/a.woff2": (200, "font/woff2", b"wOF2"),
+    "https://cdn.example.com/lib.js": (200, "application/javascript", b"fetch('https://testmoz.com/api')"),
+    "https://testmoz.com/101555": (404, "text/html", b"<h1>Not Found</h1>"),
+}
+
+
+def fake_fetch(url):
+    return SITE[url]
+
+
+def get(url):
+    """(status, content type, body) of a GET"""
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.headers['Content-Type'], response.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers['Content-Type'], e.read().decode()
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FixtureStore(str(tmp_path / "recordings"))
+
+
+@pytest.fixture
+def recorded(store):
+    """The fake site recorded as version v1"""
+    PageRecorder(store, "https://testmoz.com", fetcher=fake_fetch).record(
+        ["https://testmoz.com/", "https://testmoz.com/101555"], version="v1")
+    return store
+
+
+class TestFindAssets:
+    """Unit tests for asset discovery"""
+
+    def test_page_assets(self):
+        """Test scripts, styles, icons and images are found, links and data URLs are not"""
+        assert find_assets(HOME, "https://testmoz.com/") == [
+            "https://testmoz.com/css/app.css", "https://testmoz.com/favicon.png",
+            "https://cdn.example.com/lib.js", "https://testmoz.com/logo.svg", "https://testmoz.com/img/bg.png"]
+
+    def test_css_assets(self):
+        """Test stylesheet urls resolve against the stylesheet"""
+        css = "@import 'theme.css'; .a { background: url(\"../img/x.png\") }"
+        assert find_assets(css, "https://testmoz.com/css/app.css", "text/css") == [
+            "https://testmoz.com/css/theme.css", "https://testmoz.com/img/x.png"]
+
+
+class TestRecording:
+    """Unit tests for PageRecorder and FixtureStore"""
+
+    def test_records_pages_and_assets(self, recorded):
+        """Test pages, their assets and nested stylesheet assets are recorded"""
+        manifest = recorded.load("v1")
+        assert set(manifest['entries']) == set(SITE)
+        assert manifest['entries']["https://testmoz.com/101555"]['status'] == 404
+        assert manifest['base_url'] == "https://testmoz.com"
+
+    def test_bodies_shared_between_versions(self, recorded):
+        """Test identical bodies are stored once across versions"""
+        PageRecorder(recorded, "https://testmoz.com", fetcher=fake_fetch).record(version="v2")
+        assert len(os.listdir(os.path.join(recorded.root, "bodies"))) == len({body for _, _, body in SITE.values()})
+
+    def test_latest_version(self, recorded):
+        """Test 'latest' resolves to the most recent recording"""
+        with patch('framework.page_replay.datetime') as clock:
+            clock.now.return_value.isoformat.return_value = "2999-01-01T00:00:00"
+            PageRecorder(recorded, "https://testmoz.com", fetcher=fake_fetch).record(version="v2")
+        assert recorded.versions() == ["v1", "v2"]
+        assert recorded.resolve("latest") == "v2"
+        with pytest.raises(FileNotFoundError):
+            recorded.resolve("v3")
+
+    def test_default_urls_are_page_object_urls(self, store):
+        """Test recording without URLs takes the page objects' pages"""
+        fetched = []
+        PageRecorder(store, "https://testmoz.com/", fetcher=lambda url: fetched.append(url) or (200, "text/html", b"")
+                     ).record(version="v1")
+        assert fetched == page_object_urls("https://testmoz.com") == [
+            "https://testmoz.com/", f"https://testmoz.com{Config.DEMO_TEST_PATH}"]
+
+    def test_unreachable_url_skipped(self, store):
+        """Test a page that can't be fetched is left out"""
+        def fetcher(url):
+            raise OSError("offline")
+        assert PageRecorder(store, fetcher=fetcher).record(["https://testmoz.com/"], "v1")['entries'] == {}
+
+    def test_record_live_server(self, store):
+        """Test recording over HTTP and replaying gives back the same page"""
+        with QuizServer() as live:
+            PageRecorder(store, live.url).record(version="v1")
+        with ReplayServer(store, "v1") as replay:
+            status, _, html = get(replay.url + Config.DEMO_TEST_PATH)
+        assert status == 200
+        assert "Start Test" in html
+
+    def test_visits_merged(self, tmp_path):
+        """Test visited URLs from every worker are combined"""
+        with patch('framework.page_replay._visited', []):
+            note_visit("https://testmoz.com/")
+            note_visit("https://testmoz.com/")
+            write_visits(str(tmp_path), "gw0")
+        with patch('framework.page_replay._visited', ["https://testmoz.com/", "https://testmoz.com/101555"]):
+            write_visits(str(tmp_path), "gw1")
+        assert load_visits(str(tmp_path)) == ["https://testmoz.com/", "https://testmoz.com/101555"]
+
+
+class TestReplayServer:
+    """Unit tests for ReplayServer class"""
+
+    def test_serves_recording(self, recorded):
+        """Test recorded statuses, types and bodies are served"""
+        with ReplayServer(recorded, "v1") as replay:
+            status, content_type, html = get(replay.url + "/")
+            assert (status, content_type) == (200, "text/html; charset=utf-8")
+            assert get(replay.url + "/101555")[0] == 404
+            assert get(replay.url + "/css/app.css")[2].startswith("@font-face")
+        assert replay.stats == {'requests': 3, 'hits': 3, 'misses': 0}
+
+    def test_origins_rewritten(self, recorded):
+        """Test links to the recorded site and other origins point at the replay server"""
+        with ReplayServer(recorded, "v1") as replay:
+            html = get(replay.url + "/")[2]
+            assert f'href="{replay.url}/"' in html
+            assert f'src="{replay.url}/__origin/cdn.example.com/lib.js"' in html
+            status, _, script = get(replay.url + "/__origin/cdn.example.com/lib.js")
+            assert status == 200
+            assert script == f"fetch('{replay.url}/api')"
+
+    def test_miss_is_404(self, recorded):
+        """Test requests that weren't recorded are counted"""
+        with ReplayServer(recorded) as replay:
+            assert get(replay.url + "/pricing")[0] == 404
+        assert replay.stats['misses'] == 1
+        assert replay.missed == ["/pricing"]
+
+    def test_latency(self, recorded):
+        """Test every response waits for the configured latency"""
+        with ReplayServer(recorded, latency=0.1) as replay:
+            started = time.perf_counter()
+            get(replay.url + "/")
+            assert time.perf_counter() - started >= 0.1
+
+    def test_missing_recording(self, store):
+        """Test replaying without recordings fails clearly"""
+        with pytest.raises(FileNotFoundError, match="No recordings"):
+            ReplayServer(store)
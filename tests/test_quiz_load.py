@@ -0,0 +1,292 @@
+"""
+Unit Tests for Quiz Load Runner
+Tests seeding, per-step timings, error capture and the summary
+"""
+import pytest
+import re
+import requests
+from unittest.mock import Mock, patch
+from urllib.parse import urljoin
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.webdriver.remote.webelement import WebElement
+from framework.quiz_load import QuizLoadRunner, session_seed
+from framework.quiz_server import QuizServer, DEMO_QUESTIONS, DEMO_TEST_PATH
+from framework.static_backend import StaticDocument, StaticDriver
+from pages.testmoz_demo_page import ANSWER_QUESTION_SCRIPT, TestmozDemoPage as DemoPage
+from config.config import Config
+
+
+def make_driver():
+    """Mock browser the pool can reset"""
+    driver = Mock()
+    driver.window_handles = ['main']
+    return driver
+
+
+def fake_session(runner, driver, seed, steps):
+    """Stand-in for a quiz run that records fixed step timings"""
+    steps.extend([('open', 0.2), ('start', 0.1), ('answer', 0.05), ('next', 0.1), ('answer', 0.05),
+                  ('submit', 0.1), ('results', 0.02)])
+    runner.seen.append(seed)
+    return 100
+
+
+class FormElement(WebElement):
+    """Element of a FormBrowser page; goes stale once the browser leaves the page"""
+    def __init__(self, browser, node):
+        super().__init__(browser, str(id(node)))
+        self.node = node
+
+    def _current(self):
+        if self.node.document is not self._parent.document:
+            raise StaleElementReferenceException("Element is not attached to the page document")
+        return self.node
+
+    @property
+    def attrs(self):
+        return self._current().attrs
+
+    @property
+    def tag_name(self):
+        return self._current().tag_name
+
+    @property
+    def text(self):
+        return self._current().text
+
+    def is_displayed(self):
+        return self._current().is_displayed()
+
+    def is_enabled(self):
+        return self._current().is_enabled()
+
+    def get_attribute(self, name):
+        return self._current().get_attribute(name)
+
+    def click(self):
+        """Labels check their radio button, buttons submit their form"""
+        node = self._current()
+        if node.tag_name == 'label':
+            radio = node.find_element('xpath', ".//input[@type='radio']")
+            for other in node.document.find_elements('xpath', f"//input[@name='{radio.attrs['name']}']"):
+                other.attrs.pop('checked', None)
+            radio.attrs['checked'] = ''
+        elif node.tag_name == 'button':
+            form = next(parent for parent in node.ancestors() if parent.tag_name == 'form')
+            data = {radio.attrs['name']: radio.attrs['value']
+                    for radio in form.find_elements('xpath', ".//input[@type='radio']") if 'checked' in radio.attrs}
+            if 'name' in node.attrs:
+                data[node.attrs['name']] = node.attrs['value']
+            self._parent.submit(urljoin(node.document.url, form.attrs['action']), data)
+
+
+class _FormSwitchTo:
+    def window(self, handle):
+        pass
+
+    def default_content(self):
+        pass
+
+
+class FormBrowser(StaticDriver):
+    """Browser stand-in that follows the quiz server's forms over HTTP with its own cookies"""
+    is_static = False
+
+    def __init__(self):
+        super().__init__(session=requests.Session())
+        self.switch_to = _FormSwitchTo()
+        self.visits = []
+
+    def _load(self, url):
+        if url == 'about:blank':
+            return StaticDocument(url, '')
+        return self._navigate('GET', url)
+
+    def _navigate(self, method, url, data=None):
+        response = self.session.request(method, url, data=data, timeout=5)
+        self.visits.append((method, url.split(DEMO_TEST_PATH, 1)[-1] or '/'))
+        return StaticDocument(response.url, response.text, response.status_code)
+
+    def submit(self, url, data):
+        self.document = self._navigate('POST', url, data)
+
+    def find_element(self, by='id', value=None):
+        return FormElement(self, super().find_element(by, value))
+
+    def find_elements(self, by='id', value=None):
+        return [FormElement(self, node) for node in super().find_elements(by, value)]
+
+    def execute_script(self, script, *args):
+        if script == ANSWER_QUESTION_SCRIPT:
+            return self._answer(*args)
+        return super().execute_script(script, *args)
+
+    def _answer(self, counter_locator, option_locator, strategy, r):
+        """What the answer script returns, worked out from the parsed page"""
+        counters = self.find_elements(*counter_locator)
+        counter = counters[0].text if counters else None
+        if not counter or not re.search(r'(\d+)\s+of\s+(\d+)', counter):
+            return {'counter': counter, 'options': [], 'index': -1, 'element': None}
+        options = self.find_elements(*option_locator)
+        index = {'first': 0, 'last': len(options) - 1}.get(strategy, min(len(options) - 1, int(r * len(options))))
+        return {'counter': counter, 'options': [option.text for option in options], 'index': index,
+                'element': options[index]}
+
+    def execute_cdp_cmd(self, command, params):
+        if command == 'Network.clearBrowserCookies':
+            self.session.cookies.clear()
+
+    def delete_all_cookies(self):
+        self.session.cookies.clear()
+
+
+@pytest.fixture
+def quiz_server():
+    """Live quiz server the demo page objects are pointed at"""
+    with QuizServer() as server, patch.object(Config, 'BASE_URL', server.url), \
+            patch.object(Config, 'DEMO_TEST_PATH', DEMO_TEST_PATH):
+        yield server
+
+
+class TestQuizLoadRunner:
+    """Unit tests for QuizLoadRunner class"""
+
+    def test_session_seed_deterministic(self):
+        """Test seeds are stable and distinct per worker and session"""
+        assert session_seed(7, 1, 2) == session_seed(7, 1, 2)
+        seeds = {session_seed(7, worker, session) for worker in range(4) for session in range(10)}
+        assert len(seeds) == 40
+        assert session_seed(7, 0, 0) != session_seed(8, 0, 0)
+
+    def test_run_summarizes_steps(self):
+        """Test every session is recorded and steps are summarized in order"""
+        factory = Mock(side_effect=make_driver)
+        runner = QuizLoadRunner(factory, drivers=3, sessions=2, seed=5)
+        runner.seen = []
+        with patch.object(QuizLoadRunner, 'run_session', fake_session):
+            summary = runner.run()
+
+        assert summary['completed'] == 6
+        assert summary['failed'] == 0
+        assert sorted(runner.seen) == sorted(session_seed(5, w, s) for w in range(3) for s in range(2))
+        assert list(summary['steps']) == ['lease', 'open', 'start', 'answer', 'next', 'submit', 'results']
+        assert summary['steps']['answer']['count'] == 12
+        assert summary['steps']['open']['p95'] == 0.2
+        assert summary['session']['p50'] == pytest.approx(0.62)
+        assert summary['sessions_per_minute'] > 0
+        assert factory.call_count <= 3
+
+    def test_drivers_closed(self):
+        """Test pooled drivers are quit when the run ends"""
+        drivers = []
+        factory = Mock(side_effect=lambda: drivers.append(make_driver()) or drivers[-1])
+        runner = QuizLoadRunner(factory, drivers=2, sessions=1)
+        runner.seen = []
+        with patch.object(QuizLoadRunner, 'run_session', fake_session):
+            runner.run()
+
+        assert drivers
+        for driver in drivers:
+            driver.quit.assert_called_once()
+
+    def test_drivers_closed_through_quitter(self):
+        """Test the given quitter ends every pooled driver instead of a bare quit()"""
+        drivers = []
+        factory = Mock(side_effect=lambda: drivers.append(make_driver()) or drivers[-1])
+        quitter = Mock()
+        runner = QuizLoadRunner(factory, drivers=2, sessions=1, quitter=quitter)
+        runner.seen = []
+        with patch.object(QuizLoadRunner, 'run_session', fake_session):
+            runner.run()
+
+        assert sorted(map(id, (c.args[0] for c in quitter.call_args_list))) == sorted(map(id, drivers))
+        for driver in drivers:
+            driver.quit.assert_not_called()
+
+    def test_failed_session_recorded(self):
+        """Test a failing session keeps its seed and last completed step"""
+        def failing(runner, driver, seed, steps):
+            steps.append(('open', 0.3))
+            raise RuntimeError("No question on the page")
+
+        runner = QuizLoadRunner(Mock(side_effect=make_driver), drivers=1, sessions=2, seed=3)
+        with patch.object(QuizLoadRunner, 'run_session', failing):
+            summary = runner.run()
+
+        assert summary['completed'] == 0
+        assert summary['failed'] == 2
+        assert summary['errors'][0] == {'worker': 0, 'session': 0, 'seed': session_seed(3, 0, 0),
+                                        'after': 'open', 'error': 'No question on the page'}
+        assert summary['session']['p50'] == 0.0
+
+    def test_lease_failure_stops_worker(self):
+        """Test a worker without a browser records one error and stops"""
+        runner = QuizLoadRunner(Mock(side_effect=RuntimeError("no browser")), drivers=1, sessions=3)
+        summary = runner.run()
+
+        assert summary['failed'] == 1
+        assert summary['errors'][0]['after'] is None
+
+    def test_run_session_steps(self):
+        """Test a quiz run times each page step"""
+        page = Mock()
+        page.answer_current_question.side_effect = [{'current': 1, 'total': 2}, {'current': 2, 'total': 2}]
+        page.get_results_score.return_value = 50
+        with patch('framework.quiz_load.TestmozDemoPage', return_value=page):
+            steps = []
+            assert QuizLoadRunner(Mock()).run_session(Mock(), 1, steps) == 50
+
+        assert [step for step, _ in steps] == ['open', 'start', 'answer', 'next', 'answer', 'submit', 'results']
+
+    def test_next_without_effect_fails_the_session(self):
+        """Test a Next click that leaves the question in place is an error, not a pass"""
+        page = Mock()
+        page.answer_current_question.return_value = {'current': 1, 'total': 2}
+        page.click_next_question.return_value = False
+        with patch('framework.quiz_load.TestmozDemoPage', return_value=page):
+            steps = []
+            with pytest.raises(RuntimeError, match="Next did not leave question 1"):
+                QuizLoadRunner(Mock()).run_session(Mock(), 1, steps)
+
+        assert [step for step, _ in steps] == ['open', 'start', 'answer', 'next']
+
+    def test_format_summary(self):
+        """Test the summary table lists each step"""
+        runner = QuizLoadRunner(Mock(side_effect=make_driver), drivers=1, sessions=1)
+        runner.seen = []
+        with patch.object(QuizLoadRunner, 'run_session', fake_session):
+            lines = QuizLoadRunner.format_summary(runner.run())
+
+        assert "1 sessions on 1 drivers" in lines[0]
+        assert any(line.startswith('submit') for line in lines)
+
+
+class TestQuizSessionOnServer:
+    """Whole quiz sessions against a running QuizServer"""
+
+    def test_session_walks_every_state(self, quiz_server):
+        """Test one session goes start, question 1..n, results and is scored by the server"""
+        browser = FormBrowser()
+        steps = []
+        score = QuizLoadRunner(FormBrowser, strategy='first').run_session(browser, 1, steps)
+
+        total = len(DEMO_QUESTIONS)
+        assert browser.visits == ([('GET', '/'), ('POST', '/start')]
+                                  + [('POST', f'/q/{number}') for number in range(1, total + 1)])
+        assert browser.current_url.endswith(f"{DEMO_TEST_PATH}/results")
+        assert DemoPage(browser).detect_state() == 'results'
+        assert [step for step, _ in steps] == (['open', 'start'] + ['answer', 'next'] * (total - 1)
+                                              + ['answer', 'submit', 'results'])
+        answers = list(quiz_server.sessions.values())[0]
+        assert answers == {number: 0 for number in range(1, total + 1)}
+        assert score == quiz_server.score(list(quiz_server.sessions)[0])[0]
+        assert quiz_server.stats['started'] == quiz_server.stats['submitted'] == 1
+
+    def test_concurrent_sessions_complete(self, quiz_server):
+        """Test the runner completes every session with separate server-side quizzes"""
+        summary = QuizLoadRunner(FormBrowser, drivers=2, sessions=2, seed=4).run()
+
+        assert summary['completed'] == 4
+        assert summary['failed'] == 0
+        assert quiz_server.stats['started'] == quiz_server.stats['submitted'] == 4
+        assert all(len(answers) == len(DEMO_QUESTIONS) for answers in quiz_server.sessions.values())
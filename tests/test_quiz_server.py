@@ -0,0 +1,98 @@
+"""
+Unit Tests for Quiz Server
+Tests the stand-in demo test routes, sessions, scoring and latency
+"""
+import pytest
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+from framework.quiz_server import QuizServer, DEMO_QUESTIONS, DEMO_TEST_PATH
+
+
+@pytest.fixture
+def server():
+    """Running quiz server"""
+    with QuizServer() as server:
+        yield server
+
+
+def make_opener():
+    """URL opener that keeps the session cookie"""
+    return urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()))
+
+
+def post(opener, url, **form):
+    with opener.open(url, data=urllib.parse.urlencode(form).encode()) as response:
+        return response.geturl(), response.read().decode()
+
+
+class TestQuizServer:
+    """Unit tests for QuizServer class"""
+
+    def test_start_page(self, server):
+        """Test the demo path serves the start page"""
+        with urllib.request.urlopen(server.url + DEMO_TEST_PATH) as response:
+            html = response.read().decode()
+        assert response.status == 200
+        assert "Start Test" in html
+        assert f"{len(DEMO_QUESTIONS)} questions" in html
+
+    def test_start_redirects_to_first_question(self, server):
+        """Test starting the test opens question 1 with a new session"""
+        url, html = post(make_opener(), server.url + DEMO_TEST_PATH + "/start")
+        assert url.endswith(f"{DEMO_TEST_PATH}/q/1")
+        assert f"Question 1 of {len(DEMO_QUESTIONS)}" in html
+        assert html.count('class="answer"') == len(DEMO_QUESTIONS[0][1])
+        assert "Previous" not in html
+        assert server.stats['started'] == 1
+        assert len(server.sessions) == 1
+
+    def test_answers_scored(self, server):
+        """Test a full run is scored per session"""
+        opener = make_opener()
+        post(opener, server.url + DEMO_TEST_PATH + "/start")
+        last = len(DEMO_QUESTIONS)
+        for number, (_, _, correct) in enumerate(DEMO_QUESTIONS, 1):
+            answer = correct if number != 1 else correct + 1
+            url, html = post(opener, f"{server.url}{DEMO_TEST_PATH}/q/{number}", answer=answer,
+                             go='submit' if number == last else 'next')
+        assert url.endswith(f"{DEMO_TEST_PATH}/results")
+        assert '<span class="score">80%</span>' in html
+        assert html.count('class="answer incorrect"') == 1
+        assert server.stats['submitted'] == 1
+
+    def test_previous_keeps_answer(self, server):
+        """Test going back shows the answer already chosen"""
+        opener = make_opener()
+        post(opener, server.url + DEMO_TEST_PATH + "/start")
+        post(opener, f"{server.url}{DEMO_TEST_PATH}/q/1", answer=3, go='next')
+        url, html = post(opener, f"{server.url}{DEMO_TEST_PATH}/q/2", go='previous')
+        assert url.endswith("/q/1")
+        assert 'value="3" checked' in html
+
+    def test_sessions_independent(self, server):
+        """Test concurrent browsers don't share answers"""
+        first, second = make_opener(), make_opener()
+        post(first, server.url + DEMO_TEST_PATH + "/start")
+        post(second, server.url + DEMO_TEST_PATH + "/start")
+        post(first, f"{server.url}{DEMO_TEST_PATH}/q/1", answer=DEMO_QUESTIONS[0][2], go='next')
+
+        scores = sorted(server.score(session)[0] for session in server.sessions)
+        assert scores == [0, 20]
+
+    def test_unknown_path_404(self, server):
+        """Test unknown pages and question numbers are not found"""
+        for path in ("/nope", f"{DEMO_TEST_PATH}/q/99"):
+            with pytest.raises(urllib.error.HTTPError) as error:
+                urllib.request.urlopen(server.url + path)
+            assert error.value.code == 404
+
+    def test_latency(self):
+        """Test every response waits for the configured latency"""
+        with QuizServer(latency=0.1) as server:
+            started = time.perf_counter()
+            urllib.request.urlopen(server.url + DEMO_TEST_PATH).read()
+            assert time.perf_counter() - started >= 0.1
+            assert server.stats['requests'] == 1
@@ -0,0 +1,186 @@
+"""
+Unit Tests for Remote Dispatcher
+Runs against fake WebDriver endpoints started on localhost
+"""
+import pytest
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from framework.remote_dispatcher import RemoteDispatcher, RemoteEndpoint
+from framework.webdriver_manager import WebDriverManager
+from framework.driver_metrics import DriverMetrics
+from config.config import Config
+
+
+class FakeWebDriverServer:
+    """Minimal W3C WebDriver endpoint with a fixed number of session slots"""
+    def __init__(self, slots=1):
+        self.slots = slots
+        self.sessions = set()
+        self.rejected = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, value):
+                body = json.dumps({'value': value}).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == '/status':
+                    busy = list(server.sessions)
+                    slots = [{'session': busy[i] if i < len(busy) else None} for i in range(server.slots)]
+                    self._reply(200, {'ready': True, 'nodes': [{'slots': slots}]})
+                else:
+                    self._reply(200, None)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.path == '/session':
+                    if len(server.sessions) >= server.slots:
+                        server.rejected += 1
+                        self._reply(500, {'error': 'session not created', 'message': 'no free slots',
+                                          'stacktrace': ''})
+                        return
+                    session_id = uuid.uuid4().hex
+                    server.sessions.add(session_id)
+                    self._reply(200, {'sessionId': session_id, 'capabilities': {'browserName': 'chrome'}})
+                else:
+                    self._reply(200, None)
+
+            def do_DELETE(self):
+                server.sessions.discard(self.path.rsplit('/', 1)[-1])
+                self._reply(200, None)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def servers():
+    """Start two fake endpoints with two slots each"""
+    started = [FakeWebDriverServer(slots=2), FakeWebDriverServer(slots=2)]
+    yield started
+    for server in started:
+        server.stop()
+
+
+class TestRemoteEndpoint:
+    """Unit tests for RemoteEndpoint class"""
+
+    def test_load(self):
+        """Test load accounts for sessions seen in /status"""
+        endpoint = RemoteEndpoint("http://localhost:4444", max_sessions=4)
+        endpoint.active = 1
+        endpoint.remote_sessions = 2
+        assert endpoint.load == 0.5
+
+    def test_full_endpoint_is_unavailable(self):
+        """Test an endpoint without free slots is skipped"""
+        endpoint = RemoteEndpoint("http://localhost:4444", max_sessions=1)
+        endpoint.active = 1
+        assert not endpoint.is_available()
+
+
+class TestRemoteDispatcher:
+    """Tests for RemoteDispatcher against local endpoints"""
+
+    def test_sessions_spread_across_endpoints(self, servers):
+        """Test sessions go to the least loaded endpoint"""
+        dispatcher = RemoteDispatcher([s.url for s in servers])
+
+        drivers = [dispatcher.create_driver(ChromeOptions()) for _ in range(4)]
+
+        assert [len(s.sessions) for s in servers] == [2, 2]
+        for driver in drivers:
+            driver.quit()
+        assert [len(s.sessions) for s in servers] == [0, 0]
+        assert all(e.active == 0 for e in dispatcher.endpoints)
+
+    def test_capacity_read_from_status(self, servers):
+        """Test /status slot count becomes the endpoint capacity"""
+        dispatcher = RemoteDispatcher([servers[0].url], max_sessions=1)
+        dispatcher.refresh_status(dispatcher.endpoints[0])
+        assert dispatcher.endpoints[0].max_sessions == 2
+
+    def test_saturated_endpoint_retries_elsewhere(self, servers):
+        """Test a session rejected for lack of slots is retried on another endpoint"""
+        servers[0].sessions.update({'external-1', 'external-2'})
+        dispatcher = RemoteDispatcher([s.url for s in servers], status_ttl=60)
+        # Pretend the first endpoint looks idle so it gets picked and rejects the session
+        for endpoint in dispatcher.endpoints:
+            endpoint.last_status = float('inf')
+            endpoint.max_sessions = 2
+
+        driver = dispatcher.create_driver(ChromeOptions())
+
+        assert servers[0].rejected == 1
+        assert len(servers[1].sessions) == 1
+        assert dispatcher.endpoints[0].stats['saturated'] == 1
+        driver.quit()
+
+    def test_unreachable_endpoint_is_skipped(self, servers):
+        """Test a dead endpoint is marked unhealthy"""
+        dispatcher = RemoteDispatcher(["http://127.0.0.1:1", servers[0].url])
+
+        driver = dispatcher.create_driver(ChromeOptions())
+
+        assert driver.remote_endpoint == servers[0].url
+        assert not dispatcher.endpoints[0].healthy
+        driver.quit()
+
+    def test_all_saturated_times_out(self, servers):
+        """Test a clear error when no endpoint frees up in time"""
+        dispatcher = RemoteDispatcher([servers[0].url], acquire_timeout=0.5)
+        drivers = [dispatcher.create_driver(ChromeOptions()) for _ in range(2)]
+
+        with pytest.raises(Exception, match="No remote WebDriver endpoint"):
+            dispatcher.create_driver(ChromeOptions())
+        for driver in drivers:
+            driver.quit()
+
+    def test_quit_twice_releases_once(self, servers):
+        """Test repeated quit doesn't corrupt the load counter"""
+        dispatcher = RemoteDispatcher([servers[0].url])
+        first = dispatcher.create_driver(ChromeOptions())
+        dispatcher.create_driver(ChromeOptions())
+
+        first.quit()
+        first.quit()
+
+        assert dispatcher.endpoints[0].active == 1
+
+
+class TestRemoteCreateDriver:
+    """Tests for WebDriverManager with REMOTE_ENDPOINTS"""
+
+    def test_create_driver_uses_dispatcher(self, servers, tmp_path):
+        """Test create_driver starts remote sessions when endpoints are configured"""
+        previous = WebDriverManager._dispatcher
+        WebDriverManager._dispatcher = None
+        try:
+            with patch.object(Config, 'REMOTE_ENDPOINTS', [s.url for s in servers]), \
+                    patch.object(Config, 'BROWSER', 'chrome'), \
+                    patch.object(Config, 'BROWSER_HEALTH_FILE', str(tmp_path / "health.json")), \
+                    patch.object(WebDriverManager, '_browser_health', None), \
+                    patch.object(WebDriverManager, 'record_capabilities'), \
+                    patch('framework.webdriver_manager.driver_metrics', DriverMetrics()):
+                driver = WebDriverManager.create_driver()
+                assert driver.remote_endpoint in [s.url for s in servers]
+                driver.quit()
+        finally:
+            WebDriverManager._dispatcher = previous
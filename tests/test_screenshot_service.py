@@ -0,0 +1,138 @@
+"""
+Unit Tests for Screenshot Service
+Tests background writing, deduplication, naming and the size cap
+"""
+import pytest
+import os
+import threading
+from unittest.mock import Mock, patch
+from framework.screenshot_service import ScreenshotService
+from framework.base_page import BasePage
+
+
+def fake_png(seed=0, size=64):
+    """Bytes standing in for a PNG frame"""
+    return b'\x89PNG\r\n\x1a\n' + bytes([seed % 256]) * size
+
+
+@pytest.fixture
+def service(tmp_path):
+    """Service writing into a temporary directory"""
+    service = ScreenshotService(str(tmp_path / "shots"))
+    yield service
+    service.shutdown()
+
+
+class TestScreenshotService:
+    """Unit tests for ScreenshotService class"""
+
+    def test_capture_writes_in_background(self, service):
+        """Test the caller returns before the file is written"""
+        release = threading.Event()
+        original = service._process
+        service._process = lambda png, path: release.wait(5) and original(png, path)
+        driver = Mock()
+        driver.get_screenshot_as_png.return_value = fake_png()
+
+        future = service.capture(driver, "home")
+        assert not future.done()
+
+        release.set()
+        path = future.result(timeout=5)
+        with open(path, 'rb') as f:
+            assert f.read() == fake_png()
+
+    def test_identical_frames_are_stored_once(self, service):
+        """Test a repeated frame points at the first file"""
+        driver = Mock()
+        driver.get_screenshot_as_png.return_value = fake_png()
+
+        first = service.capture(driver, "a").result(timeout=5)
+        second = service.capture(driver, "b").result(timeout=5)
+
+        assert first == second
+        assert len(os.listdir(service.directory)) == 1
+        assert service.stats['deduplicated'] == 1
+
+    def test_names_never_collide(self, service):
+        """Test captures in the same instant get different names"""
+        names = {service.make_filename("failed_test.png") for _ in range(100)}
+        assert len(names) == 100
+        assert all(name.startswith("failed_test_") and name.endswith(".png") for name in names)
+
+    def test_unsafe_names_are_cleaned(self, service):
+        """Test test ids with path characters make valid file names"""
+        name = service.make_filename("tests/test_x.py::test[param 1]")
+        assert '/' not in name and ' ' not in name
+
+    def test_element_capture(self, service):
+        """Test element screenshots use the element's own bytes"""
+        element = Mock()
+        element.screenshot_as_png = fake_png(7)
+        driver = Mock()
+
+        path = service.capture(driver, "button", element=element).result(timeout=5)
+
+        driver.get_screenshot_as_png.assert_not_called()
+        with open(path, 'rb') as f:
+            assert f.read() == fake_png(7)
+
+    def test_size_cap(self, tmp_path):
+        """Test frames over the run's budget are dropped"""
+        service = ScreenshotService(str(tmp_path / "shots"), max_total_bytes=200,
+                                    usage_file=str(tmp_path / "usage.json"))
+        service.reset_usage()
+        driver = Mock()
+        paths = []
+        for seed in range(4):
+            driver.get_screenshot_as_png.return_value = fake_png(seed)
+            paths.append(service.capture(driver, "shot").result(timeout=5))
+        service.shutdown()
+
+        assert paths[2:] == [None, None]
+        assert service.stats['dropped'] == 2
+
+    def test_size_cap_shared_between_processes(self, tmp_path):
+        """Test two services sharing a usage file share one budget"""
+        usage = str(tmp_path / "usage.json")
+        first = ScreenshotService(str(tmp_path / "a"), max_total_bytes=100, usage_file=usage)
+        second = ScreenshotService(str(tmp_path / "b"), max_total_bytes=100, usage_file=usage)
+        driver = Mock()
+
+        driver.get_screenshot_as_png.return_value = fake_png(1)
+        assert first.capture(driver).result(timeout=5)
+        driver.get_screenshot_as_png.return_value = fake_png(2)
+        assert second.capture(driver).result(timeout=5) is None
+        first.shutdown()
+        second.shutdown()
+
+    def test_downscale_without_pillow(self, service):
+        """Test a missing Pillow keeps the original bytes"""
+        service.max_width = 100
+        with patch('framework.screenshot_service.Image', None):
+            assert service._downscale(fake_png()) == fake_png()
+
+
+class TestBasePageScreenshot:
+    """Tests for BasePage.take_screenshot"""
+
+    def test_take_screenshot_uses_service(self, service):
+        """Test the page hands the capture to the service"""
+        driver = Mock()
+        driver.get_screenshot_as_png.return_value = fake_png(3)
+
+        with patch('framework.base_page.get_screenshot_service', return_value=service):
+            path = BasePage(driver).take_screenshot("home.png")
+
+        assert os.path.exists(path)
+        assert os.path.basename(path).startswith("home_")
+
+    def test_take_screenshot_async_returns_future(self, service):
+        """Test the async variant leaves the write to the background worker"""
+        driver = Mock()
+        driver.get_screenshot_as_png.return_value = fake_png(4)
+
+        with patch('framework.base_page.get_screenshot_service', return_value=service):
+            future = BasePage(driver).take_screenshot_async("home.png")
+
+        assert os.path.exists(future.result(timeout=5))
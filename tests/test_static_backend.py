@@ -0,0 +1,310 @@
+"""
+Unit Tests for Static Backend
+Tests page objects on fetched HTML, the XPath/CSS/link-text engines and the no-browser errors
+"""
+import importlib
+import os
+import pkgutil
+import pytest
+import time
+from unittest.mock import Mock
+from selenium.common.exceptions import InvalidSelectorException, NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from framework.static_backend import StaticBackendError, StaticDocument, StaticDriver, XPath, select
+from framework.quiz_server import QuizServer, DEMO_TEST_PATH
+from pages.testmoz_home_page import TestmozHomePage
+from pages.testmoz_demo_page import TestmozDemoPage
+from pages.locators.testmoz_home_locators import TestmozHomeLocators
+from config.config import Config
+import pages.locators
+
+
+PAGES = os.path.join(os.path.dirname(__file__), 'fixtures', 'pages')
+HOME_URL = f"{Config.BASE_URL.rstrip('/')}/"
+
+
+def saved_page(name):
+    with open(os.path.join(PAGES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def document(body):
+    return StaticDocument('https://testmoz.com/page', f"<html><head><title>T</title></head><body>{body}</body></html>")
+
+
+def tags(nodes):
+    return [node.tag_name for node in nodes]
+
+
+def project_locators():
+    """(name, compiled, original) for every locator class in pages/locators"""
+    found = []
+    for module_info in pkgutil.iter_modules(pages.locators.__path__):
+        module = importlib.import_module(f"pages.locators.{module_info.name}")
+        for class_name, cls in vars(module).items():
+            if not isinstance(cls, type) or cls.__module__ != module.__name__:
+                continue
+            originals = getattr(cls, 'ORIGINAL_LOCATORS', {})
+            for name, locator in vars(cls).items():
+                if name.isupper() and isinstance(locator, tuple):
+                    found.append((f"{class_name}.{name}", locator, originals.get(name, locator)))
+    return found
+
+
+PROJECT_LOCATORS = project_locators()
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    StaticDriver.clear_cache()
+    yield
+    StaticDriver.clear_cache()
+
+
+@pytest.fixture
+def home(static_driver):
+    """Home page object on the saved Testmoz homepage"""
+    StaticDriver.load_html(HOME_URL, saved_page('testmoz_home.html'))
+    page = TestmozHomePage(static_driver)
+    page.open_testmoz()
+    return page
+
+
+class TestStaticPageObjects:
+    """Page objects running on StaticDriver"""
+
+    def test_home_page_reads(self, home):
+        """Test the home page object reads titles, headings and lists without a browser"""
+        assert home.get_page_title() == "Testmoz - The Test Generator"
+        assert home.get_main_heading_text() == "Easily create tests and quizzes online"
+        assert home.get_subtitle_text() == "Distribute your tests online and get instant results"
+        assert home.get_features_count() == 14
+        assert home.get_all_navigation_links() == ['Home', 'Features', 'Pricing', 'FAQs']
+        assert home.get_attribute(TestmozHomeLocators.TRY_DEMO_BUTTON, 'href') == "https://testmoz.com/demo"
+
+    def test_original_xpath_locators_match_compiled(self, home):
+        """Test the XPath form of each compiled locator finds the same elements"""
+        for name, original in TestmozHomeLocators.ORIGINAL_LOCATORS.items():
+            compiled = getattr(TestmozHomeLocators, name)
+            assert home.driver.find_elements(*original) == home.driver.find_elements(*compiled), name
+
+    def test_visibility_checks(self, home):
+        """Test visibility, snapshots and presence on the parsed page"""
+        assert home.is_main_heading_visible()
+        assert home.is_try_demo_button_visible()
+        assert home.get_who_uses_visibility() == {'teachers': True, 'trainers': True, 'employers': True}
+        assert home.is_element_present(TestmozHomeLocators.WATCH_DEMO_BUTTON)
+        assert not home.is_element_present((By.LINK_TEXT, "Missing"))
+
+    def test_missing_elements_do_not_wait(self, home):
+        """Test failed lookups return at once instead of waiting out the timeouts"""
+        started = time.perf_counter()
+        assert not home.is_element_present((By.ID, "missing"))
+        assert not home.is_element_visible((By.ID, "missing"))
+        assert home.probe_text((By.ID, "missing")) is None
+        with pytest.raises(TimeoutException):
+            home.wait_for_element_visible((By.ID, "missing"), timeout=10)
+        assert time.perf_counter() - started < 0.5
+
+    def test_demo_page_state(self, static_driver):
+        """Test the demo page detects its state from the parsed page"""
+        StaticDriver.load_html('https://testmoz.com/q/2', saved_page('testmoz_demo_question.html'))
+        page = TestmozDemoPage(static_driver)
+        page.open_url('https://testmoz.com/q/2')
+        assert page.wait_for_state('question', current=2).total == 5
+        with pytest.raises(TimeoutException):
+            page.wait_for_state('results', timeout=10)
+
+    def test_interactions_raise(self, home):
+        """Test clicks, typing, scripts and screenshots say a browser is needed"""
+        with pytest.raises(StaticBackendError, match="needs a browser"):
+            home.click_try_demo()
+        with pytest.raises(StaticBackendError):
+            home.send_keys(TestmozHomeLocators.MAIN_HEADING, "text")
+        with pytest.raises(StaticBackendError):
+            home.hover_element(TestmozHomeLocators.MAIN_HEADING)
+        with pytest.raises(StaticBackendError):
+            home.driver.execute_script("return 1")
+        with pytest.raises(StaticBackendError):
+            home.driver.save_screenshot("page.png")
+
+    def test_pages_are_fetched_on_every_load(self):
+        """Test get() and refresh() fetch the page again instead of serving a stale copy"""
+        with QuizServer() as server:
+            url = server.url + DEMO_TEST_PATH
+            first, second = StaticDriver(), StaticDriver()
+            first.get(url)
+            second.get(url)
+            before = first.document
+            first.refresh()
+            assert server.stats['requests'] == 3
+            assert first.document is not before
+        page = TestmozDemoPage(second)
+        assert page.detect_state() == 'start'
+        assert first.title == "Demo Test - Testmoz"
+
+    def test_session_is_used_for_fetching(self):
+        """Test a given requests session does the fetching"""
+        response = Mock(url='https://testmoz.com/', text='<h1>Hi</h1>', status_code=200)
+        session = Mock()
+        session.get.return_value = response
+        driver = StaticDriver(session=session)
+        driver.get('https://testmoz.com/')
+        assert driver.find_element(By.TAG_NAME, 'h1').text == 'Hi'
+        assert session.get.call_args[0][0] == 'https://testmoz.com/'
+
+
+class TestStaticElements:
+    """Element text, attributes and visibility"""
+
+    def test_text_is_rendered_text(self):
+        """Test text collapses whitespace, breaks at blocks and skips hidden content"""
+        doc = document("<div id='d'>  Hello\n  <b>big</b>   world<p>Next</p><span hidden>secret</span>"
+                       "<script>var x;</script><span style='display: none'>gone</span></div>")
+        assert doc.find_element(By.ID, 'd').text == "Hello big world\nNext"
+        assert "secret" in doc.find_element(By.ID, 'd').text_content
+
+    def test_visibility(self):
+        """Test hidden attributes, inline styles and hidden ancestors"""
+        doc = document("<div style='visibility:hidden'><a id='a'>x</a></div><input id='i' type='hidden'>"
+                       "<a id='b'>y</a>")
+        assert not doc.find_element(By.ID, 'a').is_displayed()
+        assert not doc.find_element(By.ID, 'i').is_displayed()
+        assert doc.find_element(By.ID, 'b').is_displayed()
+        assert doc.find_element(By.ID, 'a').text == ''
+
+    def test_implied_end_tags(self):
+        """Test unclosed list items and paragraphs close the way browsers close them"""
+        doc = document("<ul><li>One<li>Two</ul><p>First<p>Second<div>Block</div>")
+        assert [li.text for li in doc.find_elements(By.TAG_NAME, 'li')] == ['One', 'Two']
+        assert [p.text for p in doc.find_elements(By.TAG_NAME, 'p')] == ['First', 'Second']
+        assert doc.find_element(By.TAG_NAME, 'div').parent.tag_name == 'body'
+
+    def test_missing_element_raises(self):
+        """Test find_element raises NoSuchElementException like WebDriver"""
+        with pytest.raises(NoSuchElementException):
+            document("<p>x</p>").find_element(By.CSS_SELECTOR, 'div')
+
+
+class TestLocatorEngines:
+    """XPath and CSS subsets"""
+
+    @pytest.fixture
+    def doc(self):
+        return StaticDocument('https://testmoz.com/', saved_page('testmoz_home.html'))
+
+    @pytest.mark.parametrize("expression, expected", [
+        ("//section[@class='hero']/a[2]", ['Try a Demo Test']),
+        ("//ul[@class='feature-list']/li[position() < 3]", ['Automatic grading', 'Question pools and randomization']),
+        ("(//li)[last()]", ['Contact']),
+        ("//h2[normalize-space()='Teachers']/../p", ['Quizzes, homework and exams without the paperwork.']),
+        ("//nav/a[starts-with(@href, '/f') or text()='Pricing']", ['Features', 'Pricing', 'FAQs']),
+        ("//h1[contains(text(), 'Who uses')]/following-sibling::div[1]/h2", ['Teachers']),
+        ("//li[a = 'Privacy']", ['Privacy']),
+        ("//a[not(@class)][@href != '/']", ['Features', 'Pricing', 'FAQs', 'Terms', 'Privacy', 'Contact']),
+        ("//ul[@class='feature-list']/li[position() div 2 = 1]", ['Question pools and randomization']),
+        ("//ul[@class='feature-list']/li[position() = 2 * 2 - 1]", ['Partial credit']),
+        ("//ul[@class='feature-list']/li[position() mod 2 = 0][last()]", ['Export to Excel']),
+        ("//section[@class='hero']/h1/following::a[last()]", ['Contact']),
+        ("//h2[1] | //footer//a[1]", ['Distribute your tests online and get instant results', '1 Adjust a few settings',
+                                      '2 Add your questions', '3 Distribute the URL', 'Teachers', 'Trainers',
+                                      'Employers', 'Terms', 'Privacy', 'Contact']),
+    ])
+    def test_xpath(self, doc, expression, expected):
+        """Test XPath expressions select the expected elements in document order"""
+        assert [element.text for element in doc.find_elements(By.XPATH, expression)] == expected
+
+    def test_xpath_values(self, doc):
+        """Test XPath expressions that return numbers, strings and attributes"""
+        assert XPath("count(//ul[@class='report-list']/li)").evaluate(doc) == 3
+        assert XPath("string(//title)").evaluate(doc) == "Testmoz - The Test Generator"
+        assert [node.value for node in XPath("//footer//a/@href").evaluate(doc)] == ['/terms', '/privacy', '/contact']
+        with pytest.raises(InvalidSelectorException):
+            doc.find_elements(By.XPATH, "//a/@href")
+        with pytest.raises(InvalidSelectorException):
+            doc.find_elements(By.XPATH, "//a[")
+
+    @pytest.mark.parametrize("selector, expected", [
+        ("section.hero > a.button:nth-child(4)", ['Try a Demo Test']),
+        ("nav a[href^='/f']", ['Features', 'FAQs']),
+        ("a[class~=primary]", ['Build a Test']),
+        (".hero h1 + h2", ['Distribute your tests online and get instant results']),
+        ("section.who-uses h1 ~ div h2", ['Teachers', 'Trainers', 'Employers']),
+        ("ul.report-list li:first-child, footer li:last-child a", ['Score distribution', 'Contact']),
+        ("*[href$='acy']", ['Privacy']),
+        ("nav a:not([href^='/f'])", ['Home', 'Pricing', 'Login/Sign Up']),
+        ("ul.report-list li:nth-child(2n)", ['Per-question statistics']),
+        ("footer li:has(a[href='/terms'])", ['Terms']),
+        ("a:hover, input:checked", []),
+    ])
+    def test_css(self, doc, selector, expected):
+        """Test CSS selectors select the expected elements"""
+        assert [element.text for element in select(doc, selector)] == expected
+
+    @pytest.mark.parametrize("by, value", [
+        (By.CSS_SELECTOR, "p::before"),
+        (By.CSS_SELECTOR, "a["),
+        (By.XPATH, "//a["),
+        (By.XPATH, "//a[ends-with(@href, 'acy')]"),
+    ])
+    def test_invalid_selectors_raise(self, doc, by, value):
+        """Test invalid or unsupported selectors are rejected instead of matching nothing"""
+        with pytest.raises(InvalidSelectorException):
+            doc.find_elements(by, value)
+
+    def test_link_text(self, doc):
+        """Test link text matches rendered text exactly and partial link text by substring"""
+        assert tags(doc.find_elements(By.LINK_TEXT, "Login/Sign Up")) == ['a']
+        assert [a.text for a in doc.find_elements(By.PARTIAL_LINK_TEXT, "Demo")] == ['Try a Demo Test', 'Watch a Demo']
+        assert doc.find_elements(By.LINK_TEXT, "Demo") == []
+
+    def test_scoped_lookups(self, doc):
+        """Test lookups from an element only search beneath it"""
+        footer = doc.find_element(By.TAG_NAME, 'footer')
+        assert len(footer.find_elements(By.TAG_NAME, 'li')) == 3
+        assert [a.text for a in footer.find_elements(By.XPATH, "(.//a)[position() > 1]")] == ['Privacy', 'Contact']
+
+
+class TestBulkRead:
+    """bulk_read answered without JavaScript"""
+
+    def test_bulk_read(self, home):
+        """Test bulk_read returns counts, texts, visibility and attributes"""
+        results = home.bulk_read({
+            'links': (By.CSS_SELECTOR, "nav a"),
+            'missing': (By.ID, "missing"),
+            'bad': (By.CSS_SELECTOR, "a["),
+        }, attributes=('href',))
+        assert results['links'].count == 5
+        assert results['links'].texts[0] == 'Home'
+        assert results['links'].attributes[1] == {'href': '/features'}
+        assert not results['missing'].present
+        assert results['bad'].error
+
+
+class TestProjectLocators:
+    """Every locator in pages/locators evaluated by the static engines"""
+
+    @pytest.fixture(scope='class')
+    def documents(self):
+        """Saved Testmoz pages and every QuizServer page"""
+        documents = [StaticDocument('https://testmoz.com/', saved_page(name))
+                     for name in ('testmoz_home.html', 'testmoz_demo_question.html', 'testmoz_demo_results.html')]
+        with QuizServer() as server:
+            last = len(server.questions)
+            pages = [server.start_page(), server.question_page(1, 0), server.question_page(last, None),
+                     server.results_page('')]
+        return documents + [StaticDocument(server.url + DEMO_TEST_PATH, html) for html in pages]
+
+    def test_locators_found(self):
+        """Test the locator modules were discovered"""
+        names = [name for name, _, _ in PROJECT_LOCATORS]
+        assert 'TestmozHomeLocators.HOME_LINK' in names
+        assert 'TestmozDemoLocators.ANSWER_OPTION' in names
+
+    @pytest.mark.parametrize("name, compiled, original", PROJECT_LOCATORS, ids=[n for n, _, _ in PROJECT_LOCATORS])
+    def test_locator_is_supported(self, documents, name, compiled, original):
+        """Test the locator and its uncompiled form evaluate and agree on every page"""
+        for doc in documents:
+            assert doc.find_elements(*compiled) == doc.find_elements(*original), f"{name} on {doc.url}"
+